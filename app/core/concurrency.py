@@ -0,0 +1,94 @@
+# app/core/concurrency.py
+"""Bounded executor for blocking database work.
+
+SQLAlchemy sessions in this app are synchronous. Services dispatch their
+blocking bodies onto a dedicated, bounded thread pool so a long report
+execution never stalls the event loop (and with it ``/health`` and every
+other in-flight request). The pool size caps how many DW/config operations
+run at once; excess work queues instead of spawning unbounded threads.
+
+A second, separate pool runs the partial queries of one report execution in
+parallel (see ``app.shared.parallel_query``). It is separate so an execution
+waiting on its partial queries can never starve them of workers.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, TypeVar
+
+DB_EXECUTOR_MAX_WORKERS = int(os.getenv("DB_EXECUTOR_MAX_WORKERS", "8"))
+DW_PARALLEL_WORKERS = int(os.getenv("DW_PARALLEL_WORKERS", "1"))  # 1 = partial queries disabled
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_parallel_executor: Optional[ThreadPoolExecutor] = None
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get the shared database executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DB_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="db-worker"
+        )
+    return _executor
+
+def shutdown_db_executor(wait: bool = True):
+    """Shut down the database executor (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+
+def get_parallel_executor() -> ThreadPoolExecutor:
+    """Get the shared executor for parallel partial queries, creating it on first use"""
+    global _parallel_executor
+    if _parallel_executor is None:
+        _parallel_executor = ThreadPoolExecutor(
+            max_workers=max(DW_PARALLEL_WORKERS, 1),
+            thread_name_prefix="dw-parallel"
+        )
+    return _parallel_executor
+
+def shutdown_parallel_executor(wait: bool = True):
+    """Shut down the parallel query executor (called on application shutdown)"""
+    global _parallel_executor
+    if _parallel_executor is not None:
+        _parallel_executor.shutdown(wait=wait)
+        _parallel_executor = None
+
+async def run_in_db_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the database executor and await its result.
+
+    The caller's context variables are copied into the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_db_executor(), call)
+
+def db_bound(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """Decorator turning a blocking service method into a coroutine run on the database executor"""
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await run_in_db_executor(func, *args, **kwargs)
+    return wrapper
+
+async def iterate_in_db_executor(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """Drive a blocking iterator (e.g. a streaming cursor) from the database executor"""
+    sentinel = object()
+    try:
+        while True:
+            item = await run_in_db_executor(next, iterator, sentinel)
+            if item is sentinel:
+                break
+            yield item
+    finally:
+        # Close on the executor too, so generator cleanup (cursor close, logging) stays off the loop
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await run_in_db_executor(close)
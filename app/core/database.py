@@ -1,10 +1,16 @@
 # app/core/database.py - Updated with cycle migration
 """Database configuration with cycle_code moved to execution logs"""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
-from typing import Generator
+from sqlalchemy.pool import QueuePool
+from typing import Dict, Generator, List, Sequence
 import os
+import time
+from app.core.concurrency import DB_EXECUTOR_MAX_WORKERS, DW_PARALLEL_WORKERS
+from app.core.instrumentation import install_statement_hooks
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
 
 # Create declarative bases
 DWBase = declarative_base()
@@ -14,15 +20,80 @@ ConfigBase = declarative_base()
 DW_DATABASE_PATH = os.getenv("DW_DATABASE_PATH", "./data_warehouse.db")
 CONFIG_DATABASE_PATH = os.getenv("CONFIG_DATABASE_PATH", "./config.db")
 
+# SQLite connection profile, applied to every new connection. WAL and
+# synchronous=NORMAL speed up commits (execution logs, loads) and keep them from
+# blocking readers; report query throughput is CPU-bound and barely changes
+# (see benchmarks/sqlite_concurrency.py)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # Negative = KiB (64MB)
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+DW_QUERY_ONLY = os.getenv("DW_QUERY_ONLY", "true").lower() in ("1", "true", "yes")
+DW_ENSURE_INDEXES_ON_STARTUP = os.getenv("DW_ENSURE_INDEXES_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+def get_sqlite_pragmas(query_only: bool = False) -> Dict[str, str]:
+    """Get the PRAGMA settings for the configured SQLite connection profile"""
+    pragmas = {
+        "journal_mode": SQLITE_JOURNAL_MODE,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "cache_size": str(SQLITE_CACHE_SIZE),
+        "mmap_size": str(SQLITE_MMAP_SIZE),
+        "temp_store": SQLITE_TEMP_STORE,
+        "busy_timeout": str(SQLITE_BUSY_TIMEOUT_MS),
+    }
+    if query_only:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, str]) -> Engine:
+    """Apply PRAGMA settings to every connection the engine opens"""
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    
+    return engine
+
+# Count statements for execution profiles on every engine
+install_statement_hooks()
+
+def timed_pool_class(database: str):
+    """Get a QueuePool subclass recording connection checkout wait for a database"""
+    class TimedQueuePool(QueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, database)
+    
+    return TimedQueuePool
+
 # Create engines
-def create_dw_engine():
-    return create_engine(f"sqlite:///{DW_DATABASE_PATH}", echo=False)
+def create_dw_engine(query_only: bool = DW_QUERY_ONLY):
+    """Create the data warehouse engine; read-only (query_only) unless used for loading data"""
+    # Room for every executor thread plus every parallel partial query to hold a connection
+    engine = create_engine(
+        f"sqlite:///{DW_DATABASE_PATH}", echo=False,
+        poolclass=timed_pool_class("dw" if query_only else "dw_write"),
+        pool_size=5,
+        max_overflow=max(10, DB_EXECUTOR_MAX_WORKERS + DW_PARALLEL_WORKERS - 5)
+    )
+    return apply_sqlite_pragmas(engine, get_sqlite_pragmas(query_only=query_only))
 
 def create_config_engine():
-    return create_engine(f"sqlite:///{CONFIG_DATABASE_PATH}", echo=False)
+    engine = create_engine(f"sqlite:///{CONFIG_DATABASE_PATH}", echo=False, poolclass=timed_pool_class("config"))
+    return apply_sqlite_pragmas(engine, get_sqlite_pragmas())
 
 # Session makers
 DWSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=create_dw_engine())
+DWWriteSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=create_dw_engine(query_only=False))
 ConfigSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=create_config_engine())
 
 def get_dw_session() -> Generator[Session, None, None]:
@@ -33,6 +104,14 @@ def get_dw_session() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def get_dw_write_session() -> Generator[Session, None, None]:
+    """Get writable data warehouse database session (loading and derived tables)"""
+    db = DWWriteSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 def get_config_session() -> Generator[Session, None, None]:
     """Get config database session"""
     db = ConfigSessionLocal()
@@ -41,29 +120,120 @@ def get_config_session() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def ensure_indexes(metadata, engine) -> List[str]:
+    """Create declared indexes that are missing on tables which already exist.
+    
+    Returns the names of the indexes created. Planner statistics are refreshed
+    afterwards so SQLite can pick the new indexes up immediately.
+    """
+    inspector = inspect(engine)
+    created = []
+    
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    
+    if created:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    
+    return created
+
+def add_missing_columns(metadata, engine) -> List[str]:
+    """Add declared nullable columns that are missing on tables which already exist.
+    
+    ``create_all`` never alters existing tables, so columns added to a model
+    later are applied here with ``ALTER TABLE ... ADD COLUMN``. Returns the
+    added columns as ``table.column``.
+    """
+    inspector = inspect(engine)
+    added = []
+    
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}')
+            added.append(f"{table.name}.{column.name}")
+    
+    return added
+
+def drop_removed_columns(engine, removed: Dict[str, Sequence[str]]) -> List[str]:
+    """Drop columns a model no longer declares from tables which already exist.
+    
+    Removed NOT NULL columns without a server default would otherwise reject
+    every insert. Requires SQLite 3.35+ for ``ALTER TABLE ... DROP COLUMN``.
+    Returns the dropped columns as ``table.column``.
+    """
+    inspector = inspect(engine)
+    dropped = []
+    
+    for table_name, column_names in removed.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        for column_name in column_names:
+            if column_name not in existing:
+                continue
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f'ALTER TABLE "{table_name}" DROP COLUMN "{column_name}"')
+            dropped.append(f"{table_name}.{column_name}")
+    
+    return dropped
+
 async def create_dw_tables():
     """Create data warehouse database tables"""
     # Import models to register them with the base
     from app.features.datawarehouse.models import Deal, Tranche, TrancheBal
     
-    engine = create_dw_engine()
+    engine = create_dw_engine(query_only=False)
     DWBase.metadata.create_all(bind=engine)
+    
+    # Existing warehouse files predate newer declared indexes; large files can
+    # disable this and run `python manage.py create-indexes` out of band instead
+    if DW_ENSURE_INDEXES_ON_STARTUP:
+        created = ensure_indexes(DWBase.metadata, engine)
+        if created:
+            print(f"Created missing data warehouse indexes: {', '.join(created)}")
+
+# Columns removed from config models, dropped from existing databases on startup
+REMOVED_CONFIG_COLUMNS = {
+    "report_jobs": ("cycles_completed", "progress"),
+}
 
 async def create_config_tables():
     """Create config database tables"""
     # Import models to register them with the base - ORDER MATTERS for relationships
     from app.features.calculations.models import Calculation
     from app.features.reports.models import Report, ReportDeal, ReportTranche, ReportCalculation, ReportExecutionLog
+    from app.features.jobs.models import ReportJob
     
     engine = create_config_engine()
     ConfigBase.metadata.create_all(bind=engine)
+    added = add_missing_columns(ConfigBase.metadata, engine)
+    if added:
+        print(f"Added missing config database columns: {', '.join(added)}")
+    dropped = drop_removed_columns(engine, REMOVED_CONFIG_COLUMNS)
+    if dropped:
+        print(f"Dropped removed config database columns: {', '.join(dropped)}")
+    ensure_indexes(ConfigBase.metadata, engine)
 
 async def seed_sample_data():
     """Seed sample data into data warehouse (unchanged)"""
     from app.features.datawarehouse.models import Deal, Tranche, TrancheBal
     import random
     
-    db = DWSessionLocal()
+    db = DWWriteSessionLocal()
     try:
         # Check if data already exists
         existing_deals = db.query(Deal).count()
@@ -198,6 +368,50 @@ async def seed_sample_data():
     finally:
         db.close()
 
+async def register_loaded_cycles():
+    """Add warehouse cycles missing from the cycle registry"""
+    from app.features.datawarehouse.cycles import sync_cycle_registry
+    
+    db = DWWriteSessionLocal()
+    try:
+        registered = sync_cycle_registry(db)
+        if registered:
+            print(f"Registered {len(registered)} loaded cycles")
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+
+async def build_missing_rollups():
+    """Build deal rollups for warehouse cycles that lack them"""
+    from app.features.calculations.models import Calculation
+    from app.features.datawarehouse.rollups import (
+        DW_ROLLUPS_ENABLED, get_missing_rollup_cycles, get_weighted_pairs, refresh_rollups
+    )
+    
+    if not DW_ROLLUPS_ENABLED:
+        return
+    
+    db = DWWriteSessionLocal()
+    config_db = ConfigSessionLocal()
+    try:
+        weighted_pairs = get_weighted_pairs(
+            config_db.query(Calculation).filter(Calculation.is_active == True).all()
+        )
+        missing = get_missing_rollup_cycles(db, weighted_pairs)
+        if not missing:
+            return
+        
+        result = refresh_rollups(db, missing, weighted_pairs)
+        print(f"Built {result['rollup_rows']} deal rollup rows for {len(missing)} cycles")
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+        config_db.close()
+
 async def seed_default_calculations():
     """Seed default calculations in new ORM-based format"""
     from app.features.calculations.models import Calculation, AggregationFunction, SourceModel, GroupLevel
@@ -4,7 +4,7 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from typing import Generator
-from .database import get_dw_session, get_config_session
+from .database import get_dw_session, get_dw_write_session, get_config_session
 from app.shared.query_engine import QueryEngine
 
 # Database session dependencies
@@ -12,6 +12,10 @@ def get_dw_db() -> Generator[Session, None, None]:
     """Get data warehouse database session"""
     yield from get_dw_session()
 
+def get_dw_write_db() -> Generator[Session, None, None]:
+    """Get writable data warehouse database session"""
+    yield from get_dw_write_session()
+
 def get_config_db() -> Generator[Session, None, None]:
     """Get config database session"""
     yield from get_config_session()
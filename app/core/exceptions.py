@@ -27,4 +27,12 @@ class DataWarehouseError(ReportingSystemException):
 
 class ConfigurationError(ReportingSystemException):
     """Raised when configuration operations fail"""
-    pass
\ No newline at end of file
+    pass
+
+class JobNotFoundError(ReportingSystemException):
+    """Raised when a report job or its result is not found"""
+    pass
+
+class JobStateError(ReportingSystemException):
+    """Raised when a report job is not in a state that allows the operation"""
+    pass
@@ -0,0 +1,128 @@
+# app/core/instrumentation.py
+"""Per-request timing and SQL statement instrumentation.
+
+A profile is activated for the duration of one report execution through a
+context variable, so it follows the work onto the database executor thread.
+Services mark phases with ``phase(name)``; SQLAlchemy cursor events count the
+statements issued (on any engine) and the time spent in them while a profile
+is active. Both are no-ops outside a profile.
+"""
+
+import time
+from threading import Lock
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, TypeVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+T = TypeVar("T")
+
+_current_profile: ContextVar[Optional["ExecutionProfile"]] = ContextVar("execution_profile", default=None)
+
+class ExecutionProfile:
+    """Phase timings and statement counts collected for one execution"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.statement_count = 0
+        self.sql_time_ms = 0.0
+        # Parallel partial queries record into the same profile from several threads
+        self._lock = Lock()
+
+    def add_phase(self, name: str, elapsed_ms: float):
+        """Add elapsed milliseconds to a phase (repeated phases accumulate)"""
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed_ms
+
+    def add_statement(self, elapsed_ms: float):
+        """Count one executed statement and its time"""
+        with self._lock:
+            self.statement_count += 1
+            self.sql_time_ms += elapsed_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phases": {name: round(elapsed, 3) for name, elapsed in self.phases.items()},
+            "statement_count": self.statement_count,
+            "sql_time_ms": round(self.sql_time_ms, 3),
+        }
+
+def get_current_profile() -> Optional[ExecutionProfile]:
+    """Get the profile active in this context, if any"""
+    return _current_profile.get()
+
+@contextmanager
+def profile_execution() -> Iterator[ExecutionProfile]:
+    """Activate a new profile for the enclosed block"""
+    with activate_profile(ExecutionProfile()) as profile:
+        yield profile
+
+@contextmanager
+def activate_profile(profile: ExecutionProfile) -> Iterator[ExecutionProfile]:
+    """Activate an existing profile for the enclosed block"""
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+def iter_profiled(iterator: Iterator[T], profile: ExecutionProfile) -> Iterator[T]:
+    """Advance an iterator with a profile active during each step.
+    
+    Streams are driven one step at a time from fresh contexts (see
+    ``iterate_in_db_executor``), so a profile activated inside a generator
+    would not survive its first yield. The iterator is closed when the
+    stream is, so an abandoned stream releases its cursor.
+    """
+    sentinel = object()
+    try:
+        while True:
+            with activate_profile(profile):
+                item = next(iterator, sentinel)
+            if item is sentinel:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            with activate_profile(profile):
+                close()
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as a named phase of the active profile"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, (time.perf_counter() - started) * 1000)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get("profile_query_start")
+    profile.add_statement((time.perf_counter() - starts.pop()) * 1000 if starts else 0.0)
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    starts = context.connection.info.get("profile_query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+def install_statement_hooks():
+    """Register the cursor execution hooks on every engine (idempotent)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
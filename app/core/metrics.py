@@ -0,0 +1,298 @@
+# app/core/metrics.py
+"""In-process metrics registry exposed in the Prometheus text format.
+
+Counters, gauges and histograms are kept in memory per label set and rendered
+on each ``/metrics`` scrape; counters and gauges can also be read at scrape
+time from a callback (cache totals, pool state). ``MetricsMiddleware`` times every HTTP request
+by its route template, including the time spent streaming the body.
+"""
+
+import bisect
+import os
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Seconds; spans cached hits through multi-cycle executions
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ROW_COUNT_BUCKETS = (0, 10, 100, 1000, 10000, 100000, 1000000)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"  # charset is appended by the response
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """Base class for a named metric family with fixed label names"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._lock = Lock()
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(label) for label in labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+class Counter(Metric):
+    """Monotonically increasing value, or a running total read from a callback at scrape time"""
+
+    type_name = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None
+    ):
+        super().__init__(name, description, label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def inc(self, *labels: str, amount: float = 1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_samples(self):
+        if self._callback is not None:
+            values = sorted(self._callback().items())
+        else:
+            with self._lock:
+                values = sorted(self._values.items()) or ([((), 0)] if not self.label_names else [])
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+class Gauge(Metric):
+    """Value that goes up and down, or is read from a callback at scrape time"""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None
+    ):
+        super().__init__(name, description, label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, *labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labels: str, amount: float = 1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def _render_samples(self):
+        if self._callback is not None:
+            values = sorted(self._callback().items())
+        else:
+            with self._lock:
+                values = sorted(self._values.items()) or ([((), 0)] if not self.label_names else [])
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_samples(self):
+        with self._lock:
+            values = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(float(bound))))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = (), callback=None) -> Counter:
+        return self.register(Counter(name, description, label_names, callback))
+
+    def gauge(self, name: str, description: str, label_names: Sequence[str] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, description, label_names, callback))
+
+    def histogram(self, name: str, description: str, label_names: Sequence[str] = (), buckets=DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, label_names, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry and the application's metrics
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, including body streaming",
+    ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+REPORT_EXECUTION_DURATION = registry.histogram(
+    "report_execution_duration_seconds", "Report execution duration per template",
+    ("report_id", "success")
+)
+REPORT_EXECUTION_ROWS = registry.histogram(
+    "report_execution_rows", "Rows returned per report execution per template",
+    ("report_id",), buckets=ROW_COUNT_BUCKETS
+)
+REPORT_EXECUTIONS_IN_FLIGHT = registry.gauge(
+    "report_executions_in_flight", "Report executions currently running"
+)
+REPORT_EXECUTIONS_COALESCED = registry.counter(
+    "report_executions_coalesced_total", "Report executions served by an identical execution already in flight"
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection",
+    ("database",), buckets=POOL_WAIT_BUCKETS
+)
+
+@contextmanager
+def track_in_flight(gauge: Gauge = REPORT_EXECUTIONS_IN_FLIGHT):
+    """Count the enclosed block as in flight on a gauge"""
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+def register_cache_metrics(caches: Dict[str, Callable[[], Dict[str, float]]]):
+    """Expose hit/miss totals and hit ratios of caches, read from their stats() at scrape time"""
+    def read(field: str):
+        return lambda: {(name,): stats()[field] for name, stats in caches.items()}
+
+    registry.counter("cache_hits_total", "Cache hits since startup", ("cache",), read("hits"))
+    registry.counter("cache_misses_total", "Cache misses since startup", ("cache",), read("misses"))
+    registry.gauge("cache_hit_ratio", "Cache hits over lookups since startup", ("cache",), read("hit_ratio"))
+    registry.gauge("cache_entries", "Entries currently cached", ("cache",), read("size"))
+
+def register_pool_metrics(pools: Dict[str, Callable[[], object]]):
+    """Expose checked-out and idle connections of engine pools at scrape time"""
+    def read(method: str):
+        return lambda: {(name,): getattr(get_pool(), method)() for name, get_pool in pools.items()}
+
+    registry.gauge("db_pool_checked_out", "Pooled connections currently checked out", ("database",), read("checkedout"))
+    registry.gauge("db_pool_idle", "Pooled connections currently idle", ("database",), read("checkedin"))
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request by method, route template and status"""
+
+    def __init__(self, app, exclude_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # Route templates keep label cardinality bounded (no raw ids in paths)
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status)
+            )
@@ -49,9 +49,8 @@ class Calculation(Base):
     updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     created_by: Mapped[str] = mapped_column(String(100), nullable=True)
 
-    def get_sqlalchemy_function(self):
-        """Get the appropriate SQLAlchemy function for this calculation"""
-        from sqlalchemy import func
+    def get_source_model_class(self):
+        """Get the data warehouse model this calculation reads from"""
         from app.features.datawarehouse.models import Deal, Tranche, TrancheBal
         
         # Map source model to actual SQLAlchemy model
@@ -61,7 +60,17 @@ class Calculation(Base):
             SourceModel.TRANCHE_BAL: TrancheBal
         }
         
-        source_model_class = model_map[self.source_model]
+        return model_map[self.source_model]
+
+    def get_source_column(self):
+        """Get the table column behind source_field"""
+        return self.get_source_model_class().__table__.c[self.source_field]
+
+    def get_sqlalchemy_function(self):
+        """Get the appropriate SQLAlchemy function for this calculation"""
+        from sqlalchemy import func
+        
+        source_model_class = self.get_source_model_class()
         field = getattr(source_model_class, self.source_field)
         
         # Map aggregation function to SQLAlchemy func
@@ -84,6 +93,18 @@ class Calculation(Base):
         else:
             raise ValueError(f"Unsupported aggregation function: {self.aggregation_function}")
 
+    def get_version_key(self) -> tuple:
+        """Get a hashable key identifying this calculation definition for caching"""
+        return (
+            self.id,
+            self.updated_at,
+            self.name,
+            self.aggregation_function,
+            self.source_model,
+            self.source_field,
+            self.weight_field
+        )
+
     def get_required_models(self):
         """Get the models required for this calculation"""
         from app.features.datawarehouse.models import Deal, Tranche, TrancheBal
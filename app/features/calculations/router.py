@@ -216,7 +216,8 @@ async def preview_calculation_sql(
     aggregation_level: str = Query("deal", description="Aggregation level: 'deal' or 'tranche'"),
     sample_deals: str = Query("101,102,103", description="Comma-separated sample deal numbers"),
     sample_tranches: str = Query("A,B", description="Comma-separated sample tranche IDs"),
-    sample_cycle: int = Query(202404, description="Sample cycle code")
+    sample_cycle: int = Query(202404, description="Sample cycle code"),
+    explain: bool = Query(False, description="Include SQLite's EXPLAIN QUERY PLAN for the preview statement")
 ):
     """Preview SQL using unified query engine"""
     try:
@@ -225,7 +226,7 @@ async def preview_calculation_sql(
         tranche_list = [t.strip() for t in sample_tranches.split(',') if t.strip()]
         
         return await service.preview_calculation_sql(
-            calc_id, aggregation_level, deal_list, tranche_list, sample_cycle
+            calc_id, aggregation_level, deal_list, tranche_list, sample_cycle, explain
         )
     except CalculationNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -2,37 +2,45 @@
 """Refactored calculation service using unified query engine"""
 
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from app.core.concurrency import db_bound
 from app.core.exceptions import CalculationNotFoundError, CalculationAlreadyExistsError, InvalidCalculationError
-from app.shared.query_engine import QueryEngine
+from app.shared.result_cache import result_cache
 from .dao import CalculationDAO
 from .models import Calculation, AggregationFunction, SourceModel, GroupLevel
 from .schemas import CalculationCreateRequest, CalculationResponse
 
+if TYPE_CHECKING:
+    # Imported for typing only: query_engine imports this package's models
+    from app.shared.query_engine import QueryEngine
+
 class CalculationService:
     """Streamlined calculation service using unified query engine"""
     
-    def __init__(self, config_db: Session, query_engine: QueryEngine = None):
+    def __init__(self, config_db: Session, query_engine: "QueryEngine" = None):
         self.config_db = config_db
         self.query_engine = query_engine
         self.dao = CalculationDAO(config_db)
     
-    async def get_available_calculations(self, group_level: Optional[str] = None) -> List[CalculationResponse]:
+    @db_bound
+    def get_available_calculations(self, group_level: Optional[str] = None) -> List[CalculationResponse]:
         """Get list of available calculations, optionally filtered by group level"""
         group_level_enum = GroupLevel(group_level) if group_level else None
         calculations = self.dao.get_all_calculations(group_level_enum)
         
         return [CalculationResponse.model_validate(calc) for calc in calculations]
     
-    async def preview_calculation_sql(
+    @db_bound
+    def preview_calculation_sql(
         self,
         calc_id: int,
         aggregation_level: str = "deal",
         sample_deals: List[int] = None,
         sample_tranches: List[str] = None,
-        sample_cycle: int = None
+        sample_cycle: int = None,
+        explain: bool = False
     ) -> Dict[str, Any]:
-        """Generate SQL preview using unified query engine"""
+        """Generate SQL preview using unified query engine, optionally with SQLite's query plan"""
         if not self.query_engine:
             raise ValueError("Query engine required for SQL preview operations")
         
@@ -45,10 +53,12 @@ class CalculationService:
             aggregation_level=calculation.group_level,
             sample_deals=sample_deals,
             sample_tranches=sample_tranches,
-            sample_cycle=sample_cycle
+            sample_cycle=sample_cycle,
+            explain=explain
         )
 
-    async def create_calculation(self, request: CalculationCreateRequest, user_id: str = "api_user") -> CalculationResponse:
+    @db_bound
+    def create_calculation(self, request: CalculationCreateRequest, user_id: str = "api_user") -> CalculationResponse:
         """Create a new calculation"""
         # Check if calculation name already exists
         existing = self.dao.get_by_name(request.name)
@@ -74,7 +84,8 @@ class CalculationService:
         calculation = self.dao.create(calculation)
         return CalculationResponse.model_validate(calculation)
     
-    async def update_calculation(self, calc_id: int, request: CalculationCreateRequest) -> CalculationResponse:
+    @db_bound
+    def update_calculation(self, calc_id: int, request: CalculationCreateRequest) -> CalculationResponse:
         """Update an existing calculation"""
         calculation = self.dao.get_by_id(calc_id)
         if not calculation:
@@ -93,13 +104,19 @@ class CalculationService:
         calculation.weight_field = request.weight_field
         
         calculation = self.dao.update(calculation)
+        
+        # Cached report results computed with the old definition are now stale
+        result_cache.invalidate_calculation(calc_id)
+        
         return CalculationResponse.model_validate(calculation)
     
-    async def delete_calculation(self, calc_id: int) -> dict:
+    @db_bound
+    def delete_calculation(self, calc_id: int) -> dict:
         """Delete a calculation (soft delete)"""
         calculation = self.dao.get_by_id(calc_id)
         if not calculation:
             raise CalculationNotFoundError(f"Calculation with ID {calc_id} not found")
         
         self.dao.soft_delete(calculation)
+        result_cache.invalidate_calculation(calc_id)
         return {"message": f"Calculation '{calculation.name}' deleted successfully"}
\ No newline at end of file
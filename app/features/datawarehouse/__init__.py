@@ -1,8 +1,11 @@
 # app/features/datawarehouse/__init__.py
 """Data warehouse feature - core data entities and access"""
 
-from .models import Deal, Tranche, TrancheBal
-from .schemas import DealResponse, TrancheResponse, CycleResponse
+from .models import Deal, Tranche, TrancheBal, TrancheBalRollup, TrancheBalRollupState, TrancheBalCycle
+from .schemas import (
+    DealResponse, TrancheResponse, CycleResponse, RollupRefreshRequest,
+    IngestTable, IngestFormat, IngestResponse
+)
 from .service import DataWarehouseService
 from .dao import DataWarehouseDAO
 
@@ -10,9 +13,16 @@ __all__ = [
     "Deal",
     "Tranche", 
     "TrancheBal",
+    "TrancheBalRollup",
+    "TrancheBalRollupState",
+    "TrancheBalCycle",
     "DealResponse",
     "TrancheResponse", 
     "CycleResponse",
+    "RollupRefreshRequest",
+    "IngestTable",
+    "IngestFormat",
+    "IngestResponse",
     "DataWarehouseService",
     "DataWarehouseDAO"
 ]
\ No newline at end of file
@@ -0,0 +1,93 @@
+# app/features/datawarehouse/cycles.py
+"""Cycle registry and incremental per-cycle refresh.
+
+Loading a cycle only touches that cycle's ``cycle_cde`` partition: its registry
+entry is recounted, its deal rollups are rebuilt, and cached report results
+covering it are dropped. Nothing else is rebuilt, so refreshes stay cheap during
+cycle close.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.shared.result_cache import result_cache
+from .models import TrancheBal, TrancheBalCycle
+from . import rollups
+
+def get_cycle_codes(db: Session, cycle_start: Optional[int] = None, cycle_end: Optional[int] = None) -> List[int]:
+    """Get loaded cycle codes, optionally within an inclusive range.
+    
+    Reads the cycle registry; falls back to scanning tranchebal when the
+    registry has not been populated yet.
+    """
+    source = TrancheBalCycle.cycle_cde
+    if db.execute(select(TrancheBalCycle.cycle_cde).limit(1)).first() is None:
+        source = TrancheBal.cycle_cde
+    
+    query = select(source).distinct().order_by(source)
+    if cycle_start is not None:
+        query = query.where(source >= cycle_start)
+    if cycle_end is not None:
+        query = query.where(source <= cycle_end)
+    
+    return [row[0] for row in db.execute(query)]
+
+def _upsert_cycle(db: Session, cycle_code: int) -> Dict[str, Any]:
+    """Recount one cycle's partition and upsert its registry entry"""
+    row_count, deal_count = db.execute(
+        select(func.count(), func.count(TrancheBal.dl_nbr.distinct()))
+        .where(TrancheBal.cycle_cde == cycle_code)
+    ).one()
+    
+    entry = {
+        "cycle_cde": cycle_code,
+        "row_count": row_count,
+        "deal_count": deal_count,
+        "refreshed_at": datetime.now(),
+    }
+    statement = insert(TrancheBalCycle).values(**entry)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[TrancheBalCycle.cycle_cde],
+        set_={key: statement.excluded[key] for key in ("row_count", "deal_count", "refreshed_at")}
+    ))
+    return entry
+
+def refresh_cycle(
+    db: Session,
+    cycle_code: int,
+    weighted_pairs: Iterable[Tuple[str, str]] = ()
+) -> Dict[str, Any]:
+    """Register a newly loaded (or reloaded) cycle and refresh only the state derived from it"""
+    entry = _upsert_cycle(db, cycle_code)
+    db.commit()
+    
+    rollup_rows = None
+    if rollups.DW_ROLLUPS_ENABLED:
+        rollup_rows = rollups.refresh_rollups(db, [cycle_code], weighted_pairs)["rollup_rows"]
+    
+    # Cached results for this cycle were computed from the previous partition
+    invalidated = result_cache.invalidate_cycle(cycle_code)
+    
+    return {
+        **entry,
+        "rollup_rows": rollup_rows,
+        "invalidated_results": invalidated,
+    }
+
+def sync_cycle_registry(db: Session) -> List[int]:
+    """Register warehouse cycles missing from the registry (one-off scan, e.g. at startup)"""
+    registered = select(TrancheBalCycle.cycle_cde)
+    missing = [row[0] for row in db.execute(
+        select(TrancheBal.cycle_cde)
+        .where(TrancheBal.cycle_cde.not_in(registered))
+        .distinct()
+        .order_by(TrancheBal.cycle_cde)
+    )]
+    
+    for cycle_code in missing:
+        _upsert_cycle(db, cycle_code)
+    db.commit()
+    
+    return missing
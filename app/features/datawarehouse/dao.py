@@ -4,6 +4,7 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from .models import Deal, Tranche, TrancheBal
+from .cycles import get_cycle_codes
 
 class DataWarehouseDAO:
     """Repository for data warehouse data access"""
@@ -24,5 +25,4 @@ class DataWarehouseDAO:
     
     def get_available_cycles(self) -> List[int]:
         """Get distinct cycle codes"""
-        result = self.db.query(TrancheBal.cycle_cde).distinct().order_by(TrancheBal.cycle_cde).all()
-        return [row[0] for row in result]
\ No newline at end of file
+        return get_cycle_codes(self.db)
\ No newline at end of file
@@ -0,0 +1,163 @@
+# app/features/datawarehouse/generator.py
+"""Synthetic data warehouse generator for scale testing.
+
+Produces deals, tranches and per-cycle balances with the same shape and value
+model as ``seed_sample_data`` (rating-based balances/rates, 2% monthly
+amortization, randomized variance), but generates each cycle as NumPy arrays
+and writes them with raw ``executemany`` inserts. A fixed seed reproduces the
+same warehouse.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+from app.core.exceptions import ConfigurationError
+from .models import Deal, Tranche, TrancheBal, TrancheBalCycle, TrancheBalRollup, TrancheBalRollupState
+from .ingest import INGEST_BATCH_SIZE
+
+ISSUERS = ["FNMA", "FHLMC", "GNMA", "PRIVATE", "AGENCY", "JUMBO", "PRIME", "SUBPRIME"]
+
+DEFAULT_TRANCHE_STRUCTURES = [
+    ['A1', 'A2', 'B', 'C'],           # Standard 4-tranche
+    ['A', 'B', 'C'],                  # Simple 3-tranche
+    ['A1', 'A2', 'A3', 'B', 'C'],     # Complex 5-tranche
+    ['A', 'B'],                       # Simple 2-tranche
+    ['A1', 'A2', 'B1', 'B2', 'C'],   # Complex mixed
+    ['SR', 'A', 'B'],                 # Senior/Sub structure
+]
+
+# Rating-based multipliers, shared with the sample seed data
+RATING_MULTIPLIERS = {
+    'A1': {'balance': 1.5, 'rate': 0.02},
+    'A2': {'balance': 1.3, 'rate': 0.025},
+    'A3': {'balance': 1.1, 'rate': 0.03},
+    'A': {'balance': 1.2, 'rate': 0.025},
+    'B1': {'balance': 0.8, 'rate': 0.035},
+    'B2': {'balance': 0.6, 'rate': 0.04},
+    'B': {'balance': 0.7, 'rate': 0.035},
+    'C': {'balance': 0.4, 'rate': 0.05},
+    'SR': {'balance': 2.0, 'rate': 0.015},
+}
+DEFAULT_MULTIPLIER = {'balance': 1.0, 'rate': 0.03}
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ConfigurationError("The warehouse generator requires numpy; install it with 'pip install numpy'")
+    return numpy
+
+def cycle_range(start_cycle: int, count: int) -> List[int]:
+    """Get ``count`` consecutive monthly YYYYMM cycle codes starting at ``start_cycle``"""
+    year, month = divmod(start_cycle, 100)
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid cycle code {start_cycle}; expected YYYYMM")
+
+    cycles = []
+    for _ in range(count):
+        cycles.append(year * 100 + month)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return cycles
+
+def clear_warehouse(db: Session):
+    """Delete all warehouse rows and state derived from them"""
+    for model in (TrancheBalRollup, TrancheBalRollupState, TrancheBalCycle, TrancheBal, Tranche, Deal):
+        db.execute(delete(model))
+    db.commit()
+
+def _insert_rows(db: Session, model, columns: Sequence[Sequence[Any]], batch_size: int) -> int:
+    """executemany positional rows (one sequence per table column, in column order)"""
+    table = model.__table__
+    sql = str(insert(table).compile(dialect=db.bind.dialect))
+    rows = list(zip(*columns))
+    connection = db.connection()
+    for start in range(0, len(rows), batch_size):
+        connection.exec_driver_sql(sql, rows[start:start + batch_size])
+    return len(rows)
+
+def generate_warehouse(
+    db: Session,
+    deal_count: int,
+    cycle_count: int,
+    start_cycle: int = 202301,
+    first_deal: int = 101,
+    structures: Optional[Sequence[Sequence[str]]] = None,
+    seed: Optional[int] = None,
+    batch_size: int = INGEST_BATCH_SIZE,
+    progress: Optional[Callable[[int, int, int], None]] = None
+) -> Dict[str, Any]:
+    """Generate and bulk insert a synthetic warehouse.
+
+    ``progress(cycle_code, cycle_index, rows_so_far)`` is called after each
+    cycle is committed. Returns counts, the generated cycle codes and timing.
+    """
+    np = _require_numpy()
+    rng = np.random.default_rng(seed)
+    structures = [list(structure) for structure in (structures or DEFAULT_TRANCHE_STRUCTURES)]
+    cycles = cycle_range(start_cycle, cycle_count)
+    started = time.perf_counter()
+
+    # Deals
+    deal_numbers = np.arange(first_deal, first_deal + deal_count)
+    issuers = [ISSUERS[i] for i in rng.integers(len(ISSUERS), size=deal_count)]
+    issuer_codes = [f"{issuer[:7]}{i % 100000:05d}" for i, issuer in enumerate(issuers, start=1)]
+    deal_list = deal_numbers.tolist()
+    _insert_rows(db, Deal, [
+        deal_list,
+        issuer_codes,
+        [f"CDI_{issuer}_{deal}" for issuer, deal in zip(issuers, deal_list)],
+        [f"CDB_{issuer}_{deal}" for issuer, deal in zip(issuers, deal_list)],
+    ], batch_size)
+
+    # Tranches: each deal takes a random structure
+    structure_index = rng.integers(len(structures), size=deal_count)
+    tranche_deals, tranche_ids, tranche_cusips = [], [], []
+    for deal, issuer_code, index in zip(deal_list, issuer_codes, structure_index.tolist()):
+        for tr_id in structures[index]:
+            tranche_deals.append(deal)
+            tranche_ids.append(tr_id)
+            tranche_cusips.append(f"{issuer_code[:4]}{deal}{tr_id}")
+    _insert_rows(db, Tranche, [tranche_deals, tranche_ids, tranche_cusips], batch_size)
+    db.commit()
+
+    tranche_count = len(tranche_ids)
+    base_balance = 1000000.0 * np.array([RATING_MULTIPLIERS.get(t, DEFAULT_MULTIPLIER)['balance'] for t in tranche_ids])
+    base_rate = np.array([RATING_MULTIPLIERS.get(t, DEFAULT_MULTIPLIER)['rate'] for t in tranche_ids])
+
+    # Balances: one vectorized batch per cycle, committed per cycle
+    balance_rows = 0
+    for i, cycle in enumerate(cycles):
+        amortization_factor = max(0.1, 1.0 - (i * 0.02))
+
+        balance = base_balance * amortization_factor * rng.uniform(0.9, 1.1, tranche_count)
+        rate = base_rate * rng.uniform(0.95, 1.05, tranche_count)
+        principal_release = balance * rng.uniform(0.01, 0.05, tranche_count)
+        interest_dist = balance * rate / 12
+        principal_dist = balance * rng.uniform(0.02, 0.08, tranche_count)
+
+        balance_rows += _insert_rows(db, TrancheBal, [
+            tranche_deals,
+            tranche_ids,
+            [cycle] * tranche_count,
+            np.round(balance, 2).tolist(),
+            np.round(principal_release, 2).tolist(),
+            np.round(rate, 6).tolist(),
+            rng.integers(28, 32, tranche_count).tolist(),
+            np.round(interest_dist, 2).tolist(),
+            np.round(principal_dist, 2).tolist(),
+            np.round(interest_dist * 1.05, 2).tolist(),
+            np.round(interest_dist * 0.02, 2).tolist(),
+        ], batch_size)
+        db.commit()
+
+        if progress:
+            progress(cycle, i, balance_rows)
+
+    return {
+        "deals": deal_count,
+        "tranches": tranche_count,
+        "balance_rows": balance_rows,
+        "cycles": cycles,
+        "elapsed_seconds": time.perf_counter() - started,
+    }
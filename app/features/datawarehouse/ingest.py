@@ -0,0 +1,196 @@
+# app/features/datawarehouse/ingest.py
+"""Bulk ingestion of Deal, Tranche and TrancheBal rows.
+
+Input is read as a stream (CSV, NDJSON or Parquet record batches) and written
+with Core ``executemany`` inserts in large transactions, bypassing the ORM
+identity map. Rows upsert on the primary key by default so restated cycles can
+be reloaded in place. An upsert only overwrites the columns a record supplies,
+so a file without an optional column leaves its stored values intact (SQLite
+still checks NOT NULL columns before resolving the conflict, so those must be
+supplied).
+"""
+
+import codecs
+import csv
+import json
+import os
+from itertools import groupby, islice
+from typing import Any, BinaryIO, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+from sqlalchemy import Float, Integer, Numeric
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError, StatementError
+from sqlalchemy.orm import Session
+from app.core.exceptions import ConfigurationError, DataWarehouseError
+from .models import Deal, Tranche, TrancheBal
+from .schemas import IngestFormat, IngestTable
+
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "10000"))
+INGEST_COMMIT_ROWS = int(os.getenv("INGEST_COMMIT_ROWS", "500000"))
+
+INGEST_MODELS = {
+    IngestTable.deal: Deal,
+    IngestTable.tranche: Tranche,
+    IngestTable.tranchebal: TrancheBal,
+}
+
+def infer_format(filename: str) -> IngestFormat:
+    """Infer the input format from a file extension"""
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    aliases = {"jsonl": IngestFormat.ndjson, "pq": IngestFormat.parquet}
+    try:
+        return aliases.get(extension) or IngestFormat(extension)
+    except ValueError:
+        raise DataWarehouseError(f"Cannot infer ingest format from '{filename}'")
+
+def iter_records(source: BinaryIO, input_format: IngestFormat) -> Iterator[Dict[str, Any]]:
+    """Stream records from a binary file object"""
+    if input_format == IngestFormat.parquet:
+        yield from _iter_parquet(source)
+        return
+
+    text = codecs.getreader("utf-8-sig")(source)
+    if input_format == IngestFormat.csv:
+        yield from csv.DictReader(text)
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise DataWarehouseError(f"Invalid JSON on line {line_number}: {e}")
+
+def _iter_parquet(source: BinaryIO) -> Iterator[Dict[str, Any]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ConfigurationError("Parquet ingestion requires pyarrow; install it with 'pip install pyarrow'")
+
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=INGEST_BATCH_SIZE):
+        yield from batch.to_pylist()
+
+def _build_coercer(model) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build a function mapping a raw record onto the table's columns and Python types.
+
+    Only columns present in the record are mapped; an empty value is an explicit NULL.
+    """
+    converters = {}
+    for column in model.__table__.columns:
+        if isinstance(column.type, Integer):
+            converters[column.name] = int
+        elif isinstance(column.type, (Float, Numeric)):
+            converters[column.name] = float
+        else:
+            converters[column.name] = str
+
+    def coerce(record: Dict[str, Any]) -> Dict[str, Any]:
+        row = {}
+        for name, convert in converters.items():
+            if name not in record:
+                continue
+            value = record[name]
+            if value is None or value == "":
+                row[name] = None
+                continue
+            try:
+                row[name] = convert(value)
+            except (TypeError, ValueError):
+                raise DataWarehouseError(f"Invalid value for {model.__tablename__}.{name}: {value!r}")
+        return row
+
+    return coerce
+
+def _build_insert(model, upsert: bool, columns: FrozenSet[str]):
+    """Build the insert for rows supplying ``columns``; an upsert updates only those columns"""
+    table = model.__table__
+    statement = insert(table)
+    if not upsert:
+        return statement
+
+    primary_key = [column.name for column in table.primary_key.columns]
+    updates = {
+        column.name: statement.excluded[column.name]
+        for column in table.columns if column.name in columns and column.name not in primary_key
+    }
+    if not updates:
+        return statement.on_conflict_do_nothing(index_elements=primary_key)
+    return statement.on_conflict_do_update(index_elements=primary_key, set_=updates)
+
+def _batched(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def ingest_records(
+    db: Session,
+    table: IngestTable,
+    records: Iterable[Dict[str, Any]],
+    upsert: bool = True,
+    batch_size: Optional[int] = None,
+    commit_rows: Optional[int] = None,
+    committed_cycles: Optional[Set[int]] = None
+) -> Dict[str, Any]:
+    """Bulk insert records into a warehouse table.
+
+    Records are coerced and written in ``batch_size`` executemany batches, with a
+    commit every ``commit_rows`` rows. Returns row counts and, for TrancheBal, the
+    cycle codes touched so derived state can be refreshed for just those cycles.
+
+    ``committed_cycles`` is updated with TrancheBal cycle codes as their rows
+    commit, so callers can refresh them even when a later batch fails.
+    """
+    model = INGEST_MODELS[table]
+    batch_size = batch_size or INGEST_BATCH_SIZE
+    commit_rows = commit_rows or INGEST_COMMIT_ROWS
+    coerce = _build_coercer(model)
+    statements: Dict[FrozenSet[str], Any] = {}
+
+    if committed_cycles is None:
+        committed_cycles = set()
+
+    rows = 0
+    committed_rows = 0
+    cycle_codes: Set[int] = set()
+    uncommitted_cycles: Set[int] = set()
+
+    def commit():
+        nonlocal committed_rows
+        db.commit()
+        committed_rows = rows
+        committed_cycles.update(uncommitted_cycles)
+        uncommitted_cycles.clear()
+
+    try:
+        for batch in _batched((coerce(record) for record in records), batch_size):
+            # executemany needs one column set per statement; consecutive rows almost always share it
+            for columns, group in groupby(batch, key=frozenset):
+                statement = statements.get(columns)
+                if statement is None:
+                    statement = statements[columns] = _build_insert(model, upsert, columns)
+                db.execute(statement, list(group))
+            rows += len(batch)
+
+            if table == IngestTable.tranchebal:
+                batch_cycles = {row["cycle_cde"] for row in batch}
+                cycle_codes.update(batch_cycles)
+                uncommitted_cycles.update(batch_cycles)
+
+            if rows - committed_rows >= commit_rows:
+                commit()
+
+        commit()
+    except (IntegrityError, StatementError) as e:
+        db.rollback()
+        raise DataWarehouseError(f"Ingestion into {model.__tablename__} failed after {committed_rows} committed rows: {e.orig or e}")
+    except DataWarehouseError as e:
+        db.rollback()
+        raise DataWarehouseError(f"Ingestion into {model.__tablename__} failed after {committed_rows} committed rows: {e}")
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "table": model.__tablename__,
+        "rows": rows,
+        "upsert": upsert,
+        "cycle_codes": sorted(cycle_codes),
+    }
@@ -1,13 +1,30 @@
 # app/features/datawarehouse/models.py
 """Database models for the datawarehouse feature (data warehouse database)."""
 
+import os
 from sqlalchemy import (
-    Column, Integer, String, Float, SmallInteger, ForeignKey, CHAR, and_, Numeric
+    Column, Integer, String, Float, SmallInteger, ForeignKey, CHAR, Index, and_, Numeric, DateTime
 )
 from sqlalchemy.orm import relationship, Mapped, mapped_column, foreign
 from sqlalchemy.dialects.mssql import MONEY
 from app.core.database import DWBase as Base
 
+# Also declare a covering index carrying the common money columns (larger file, no table lookups)
+DW_COVERING_INDEXES = os.getenv("DW_COVERING_INDEXES", "false").lower() in ("1", "true", "yes")
+
+def _tranchebal_indexes():
+    """Secondary indexes for report queries, which filter one or more cycles then deal/tranche IN-lists"""
+    indexes = [
+        Index("ix_tranchebal_cycle_deal_tranche", "cycle_cde", "dl_nbr", "tr_id"),
+    ]
+    if DW_COVERING_INDEXES:
+        indexes.append(Index(
+            "ix_tranchebal_cycle_deal_tranche_amounts",
+            "cycle_cde", "dl_nbr", "tr_id",
+            "tr_end_bal_amt", "tr_prin_dstrb_amt", "tr_int_dstrb_amt", "tr_pass_thru_rte"
+        ))
+    return tuple(indexes)
+
 class Deal(Base):
     """Deal model for securities stored in data warehouse."""
     __tablename__ = "deal"
@@ -43,6 +60,7 @@ class Tranche(Base):
 class TrancheBal(Base):
     """Tranche balance/historical data."""
     __tablename__ = "tranchebal"
+    __table_args__ = _tranchebal_indexes()
     
     dl_nbr: Mapped[int] = mapped_column(ForeignKey("tranche.dl_nbr"), primary_key=True)
     tr_id: Mapped[str] = mapped_column(String(15), ForeignKey("tranche.tr_id"), primary_key=True)
@@ -67,4 +85,40 @@ class TrancheBal(Base):
         ),
         foreign_keys=lambda: [TrancheBal.dl_nbr, TrancheBal.tr_id],
         overlaps="deal,tranches",
-    )
\ No newline at end of file
+    )
+
+class TrancheBalRollup(Base):
+    """Per-(deal, cycle) partial aggregates of TrancheBal measures.
+    
+    Long format: one row per deal, cycle and measure. A measure is either a
+    TrancheBal field name or ``"<field>*<weight>"`` for the weighted-average
+    numerator; the matching denominator is the weight field's own sum.
+    """
+    __tablename__ = "tranchebal_deal_rollup"
+    
+    cycle_cde: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    dl_nbr: Mapped[int] = mapped_column(Integer, primary_key=True)
+    measure: Mapped[str] = mapped_column(String(64), primary_key=True)
+    
+    sum_value: Mapped[float] = mapped_column(Float(53), nullable=True)
+    count_value: Mapped[int] = mapped_column(Integer, nullable=False)
+    min_value: Mapped[float] = mapped_column(Float(53), nullable=True)
+    max_value: Mapped[float] = mapped_column(Float(53), nullable=True)
+
+class TrancheBalRollupState(Base):
+    """Which measures have been rolled up for which cycles"""
+    __tablename__ = "tranchebal_rollup_state"
+    
+    cycle_cde: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    measure: Mapped[str] = mapped_column(String(64), primary_key=True)
+    source_row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    built_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+
+class TrancheBalCycle(Base):
+    """Registry of loaded cycles, maintained incrementally as cycles are loaded"""
+    __tablename__ = "tranchebal_cycle"
+    
+    cycle_cde: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    deal_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    refreshed_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
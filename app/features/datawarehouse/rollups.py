@@ -0,0 +1,223 @@
+# app/features/datawarehouse/rollups.py
+"""Pre-aggregated per-(deal, cycle) rollups of TrancheBal measures.
+
+Deal-level SUM/COUNT/MIN/MAX/AVG/WEIGHTED_AVG calculations over TrancheBal are
+decomposable: they can be answered from per-deal partial aggregates instead of
+re-scanning every balance row. Rollups are built per cycle, from the same
+Deal -> Tranche -> TrancheBal join the report queries use, so values match the
+raw path exactly.
+
+There are deal-grain rollups only, so tranche-level reports always take the
+grouped or per-calculation plan. A (deal, tranche, cycle) rollup would hold one
+row per TrancheBal row (that is the table's primary key) and save no scanning.
+"""
+
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import Float, Integer, and_, case, cast, delete, func, insert, select, type_coerce
+from sqlalchemy.orm import Session
+from app.features.calculations.models import AggregationFunction, Calculation, SourceModel
+from .models import Deal, Tranche, TrancheBal, TrancheBalRollup, TrancheBalRollupState
+
+DW_ROLLUPS_ENABLED = os.getenv("DW_ROLLUPS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Every non-key TrancheBal column is rolled up
+ROLLUP_FIELDS = tuple(column.name for column in TrancheBal.__table__.columns if not column.primary_key)
+
+def weighted_measure(field: str, weight: str) -> str:
+    """Get the measure name holding SUM(field * weight)"""
+    return f"{field}*{weight}"
+
+def get_weighted_pairs(calculations: Iterable[Calculation]) -> List[Tuple[str, str]]:
+    """Get the (field, weight) pairs of rollup-eligible weighted average calculations"""
+    pairs = {
+        (calc.source_field, calc.weight_field)
+        for calc in calculations
+        if calc.aggregation_function == AggregationFunction.WEIGHTED_AVG and is_rollup_eligible(calc)
+    }
+    return sorted(pairs)
+
+def is_rollup_eligible(calc: Calculation) -> bool:
+    """Check whether a calculation can be answered from deal rollups"""
+    if calc.source_model != SourceModel.TRANCHE_BAL or calc.source_field not in ROLLUP_FIELDS:
+        return False
+    if calc.aggregation_function == AggregationFunction.WEIGHTED_AVG:
+        return calc.weight_field in ROLLUP_FIELDS
+    return True
+
+def get_calculation_measures(calc: Calculation) -> List[str]:
+    """Get the rollup measures a calculation reads"""
+    if calc.aggregation_function == AggregationFunction.WEIGHTED_AVG:
+        return [weighted_measure(calc.source_field, calc.weight_field), calc.weight_field]
+    return [calc.source_field]
+
+def build_rollup_expression(calc: Calculation):
+    """Get the aggregate expression answering a calculation from rollup rows grouped by deal and cycle"""
+    def pick(column, measure: str):
+        return func.max(case((TrancheBalRollup.measure == measure, column)))
+
+    field = calc.source_field
+    function = calc.aggregation_function
+
+    if function == AggregationFunction.SUM:
+        expression = pick(TrancheBalRollup.sum_value, field)
+    elif function == AggregationFunction.COUNT:
+        expression = pick(TrancheBalRollup.count_value, field)
+    elif function == AggregationFunction.MIN:
+        expression = pick(TrancheBalRollup.min_value, field)
+    elif function == AggregationFunction.MAX:
+        expression = pick(TrancheBalRollup.max_value, field)
+    elif function == AggregationFunction.AVG:
+        expression = pick(TrancheBalRollup.sum_value, field) / func.nullif(pick(TrancheBalRollup.count_value, field), 0)
+    elif function == AggregationFunction.WEIGHTED_AVG:
+        expression = pick(TrancheBalRollup.sum_value, weighted_measure(field, calc.weight_field)) / \
+            func.nullif(pick(TrancheBalRollup.sum_value, calc.weight_field), 0)
+    else:
+        raise ValueError(f"Unsupported aggregation function: {function}")
+
+    # Rollup values are stored as REAL; integer fields keep integer SUM/MIN/MAX results
+    if function in (AggregationFunction.SUM, AggregationFunction.MIN, AggregationFunction.MAX) \
+            and isinstance(calc.get_source_column().type, Integer):
+        expression = cast(expression, Integer)
+
+    # Match the raw aggregate's result type so values are processed identically
+    return type_coerce(expression, calc.get_sqlalchemy_function().type)
+
+def has_rollups(db: Session, cycle_codes: Sequence[int], measures: Sequence[str]) -> bool:
+    """Check whether every (cycle, measure) combination has been rolled up"""
+    cycle_codes, measures = set(cycle_codes), set(measures)
+    if not cycle_codes or not measures:
+        return False
+
+    built = db.execute(
+        select(func.count())
+        .select_from(TrancheBalRollupState)
+        .where(TrancheBalRollupState.cycle_cde.in_(cycle_codes))
+        .where(TrancheBalRollupState.measure.in_(measures))
+    ).scalar()
+    return built == len(cycle_codes) * len(measures)
+
+def _get_measure_columns(weighted_pairs: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+    columns = {field: TrancheBal.__table__.c[field] for field in ROLLUP_FIELDS}
+    for field, weight in weighted_pairs:
+        columns[weighted_measure(field, weight)] = TrancheBal.__table__.c[field] * TrancheBal.__table__.c[weight]
+    return columns
+
+def refresh_rollups(
+    db: Session,
+    cycle_codes: Optional[Sequence[int]] = None,
+    weighted_pairs: Iterable[Tuple[str, str]] = ()
+) -> Dict[str, Any]:
+    """Rebuild rollups for the given cycles (all warehouse cycles by default).
+
+    Each cycle is rebuilt from a single aggregate scan of its balance rows and
+    committed on its own, so other cycles stay readable throughout.
+    """
+    if cycle_codes is None:
+        cycle_codes = [row[0] for row in db.execute(
+            select(TrancheBal.cycle_cde).distinct().order_by(TrancheBal.cycle_cde)
+        )]
+
+    measures = _get_measure_columns(weighted_pairs)
+    aggregates = []
+    for column in measures.values():
+        aggregates.extend([
+            type_coerce(func.sum(column), Float(53)),
+            func.count(column),
+            type_coerce(func.min(column), Float(53)),
+            type_coerce(func.max(column), Float(53)),
+        ])
+
+    rollup_rows = 0
+    for cycle_code in cycle_codes:
+        rows = db.execute(
+            select(Deal.dl_nbr, func.count(), *aggregates)
+            .select_from(Deal)
+            .join(Tranche, Deal.dl_nbr == Tranche.dl_nbr)
+            .join(TrancheBal, and_(
+                Tranche.dl_nbr == TrancheBal.dl_nbr,
+                Tranche.tr_id == TrancheBal.tr_id
+            ))
+            .where(TrancheBal.cycle_cde == cycle_code)
+            .group_by(Deal.dl_nbr)
+        ).all()
+
+        records = []
+        for row in rows:
+            for index, measure in enumerate(measures):
+                sum_value, count_value, min_value, max_value = row[2 + index * 4: 6 + index * 4]
+                records.append({
+                    "cycle_cde": cycle_code,
+                    "dl_nbr": row[0],
+                    "measure": measure,
+                    "sum_value": sum_value,
+                    "count_value": count_value,
+                    "min_value": min_value,
+                    "max_value": max_value,
+                })
+
+        source_row_count = sum(row[1] for row in rows)
+        built_at = datetime.now()
+
+        db.execute(delete(TrancheBalRollup).where(TrancheBalRollup.cycle_cde == cycle_code))
+        db.execute(delete(TrancheBalRollupState).where(TrancheBalRollupState.cycle_cde == cycle_code))
+        if records:
+            db.execute(insert(TrancheBalRollup), records)
+        db.execute(insert(TrancheBalRollupState), [
+            {
+                "cycle_cde": cycle_code,
+                "measure": measure,
+                "source_row_count": source_row_count,
+                "built_at": built_at,
+            }
+            for measure in measures
+        ])
+        db.commit()
+        rollup_rows += len(records)
+
+    return {
+        "cycles": list(cycle_codes),
+        "measures": list(measures),
+        "rollup_rows": rollup_rows,
+    }
+
+def get_rollup_status(db: Session) -> List[Dict[str, Any]]:
+    """Get per-cycle rollup build state"""
+    rows = db.execute(
+        select(
+            TrancheBalRollupState.cycle_cde,
+            func.count(TrancheBalRollupState.measure),
+            func.max(TrancheBalRollupState.source_row_count),
+            func.max(TrancheBalRollupState.built_at)
+        )
+        .group_by(TrancheBalRollupState.cycle_cde)
+        .order_by(TrancheBalRollupState.cycle_cde)
+    ).all()
+
+    return [
+        {
+            "cycle_cde": row[0],
+            "measure_count": row[1],
+            "source_row_count": row[2],
+            "built_at": row[3],
+        }
+        for row in rows
+    ]
+
+def get_missing_rollup_cycles(db: Session, weighted_pairs: Iterable[Tuple[str, str]] = ()) -> List[int]:
+    """Get warehouse cycles lacking a rollup for any current measure"""
+    measures = list(_get_measure_columns(weighted_pairs))
+    built = select(TrancheBalRollupState.cycle_cde)\
+        .where(TrancheBalRollupState.measure.in_(measures))\
+        .group_by(TrancheBalRollupState.cycle_cde)\
+        .having(func.count() == len(measures))
+
+    rows = db.execute(
+        select(TrancheBal.cycle_cde)
+        .where(TrancheBal.cycle_cde.not_in(built))
+        .distinct()
+        .order_by(TrancheBal.cycle_cde)
+    ).all()
+    return [row[0] for row in rows]
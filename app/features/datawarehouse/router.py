@@ -1,11 +1,17 @@
 # app/features/datawarehouse/router.py
 """Fixed datawarehouse router using direct database session"""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import Optional
-from app.core.dependencies import get_dw_db
+import tempfile
+from app.core.dependencies import get_dw_db, get_dw_write_db, get_config_db
+from app.core.exceptions import ConfigurationError, DataWarehouseError
 from .service import DataWarehouseService
+from .schemas import RollupRefreshRequest, IngestTable, IngestFormat, IngestResponse
+
+# Request bodies above this size spool to a temporary file instead of memory
+INGEST_SPOOL_MAX_BYTES = 64 * 1024 * 1024
 
 router = APIRouter()
 
@@ -13,6 +19,13 @@ def get_datawarehouse_service(db: Session = Depends(get_dw_db)) -> DataWarehouse
     """Get data warehouse service with database session"""
     return DataWarehouseService(db)
 
+def get_datawarehouse_write_service(
+    db: Session = Depends(get_dw_write_db),
+    config_db: Session = Depends(get_config_db)
+) -> DataWarehouseService:
+    """Get data warehouse service with a writable session for derived tables"""
+    return DataWarehouseService(db, config_db)
+
 @router.get("/deals")
 async def get_available_deals(
     service: DataWarehouseService = Depends(get_datawarehouse_service)
@@ -43,4 +56,53 @@ async def get_available_cycles(
     service: DataWarehouseService = Depends(get_datawarehouse_service)
 ):
     """Get list of available cycle codes"""
-    return await service.get_available_cycles()
\ No newline at end of file
+    return await service.get_available_cycles()
+
+@router.post("/cycles/{cycle_code}/refresh")
+async def refresh_cycle(
+    cycle_code: int,
+    service: DataWarehouseService = Depends(get_datawarehouse_write_service)
+):
+    """Register a newly loaded cycle: recount it, rebuild its rollups and drop cached results for it"""
+    return await service.refresh_cycle(cycle_code)
+
+@router.get("/rollups")
+async def get_rollup_status(
+    service: DataWarehouseService = Depends(get_datawarehouse_service)
+):
+    """Get per-cycle deal rollup build state"""
+    return await service.get_rollup_status()
+
+@router.post("/rollups/refresh")
+async def refresh_rollups(
+    request: RollupRefreshRequest,
+    service: DataWarehouseService = Depends(get_datawarehouse_write_service)
+):
+    """Rebuild deal rollups for the given cycles (all cycles when none are given)"""
+    return await service.refresh_rollups(request.cycle_codes)
+
+@router.post("/ingest/{table}", response_model=IngestResponse)
+async def ingest_table(
+    table: IngestTable,
+    request: Request,
+    service: DataWarehouseService = Depends(get_datawarehouse_write_service),
+    format: IngestFormat = Query(IngestFormat.csv, description="Body format: csv, ndjson or parquet"),
+    upsert: bool = Query(True, description="Update rows whose primary key already exists (restated cycles)")
+):
+    """Bulk load the raw request body into a warehouse table.
+    
+    Send the file as the body, e.g. ``curl --data-binary @balances.csv``. Cycles
+    loaded into tranchebal are refreshed once the load commits; deal and tranche
+    loads rebuild all rollups and drop all cached results.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=INGEST_SPOOL_MAX_BYTES) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        
+        try:
+            return await service.ingest(table, body, format, upsert)
+        except ConfigurationError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        except DataWarehouseError as e:
+            raise HTTPException(status_code=400, detail=str(e))
@@ -3,6 +3,19 @@
 
 from pydantic import BaseModel
 from typing import List, Optional
+from enum import Enum
+
+class IngestTable(str, Enum):
+    """Warehouse tables accepting bulk loads"""
+    deal = "deal"
+    tranche = "tranche"
+    tranchebal = "tranchebal"
+
+class IngestFormat(str, Enum):
+    """Input formats for bulk loads"""
+    csv = "csv"          # Header row naming table columns
+    ndjson = "ndjson"    # One JSON object per line
+    parquet = "parquet"  # Read in record batches (requires pyarrow)
 
 class DealResponse(BaseModel):
     """Response model for Deal data"""
@@ -24,4 +37,16 @@ class TrancheResponse(BaseModel):
 
 class CycleResponse(BaseModel):
     """Response model for available cycle codes"""
-    cycle_cde: int
\ No newline at end of file
+    cycle_cde: int
+
+class RollupRefreshRequest(BaseModel):
+    """Request model for rebuilding deal rollups"""
+    cycle_codes: Optional[List[int]] = None  # All warehouse cycles when omitted
+
+class IngestResponse(BaseModel):
+    """Response model for a bulk load"""
+    table: str
+    rows: int
+    upsert: bool
+    cycle_codes: List[int] = []
+    refreshed_cycles: List[int] = []
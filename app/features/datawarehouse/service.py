@@ -2,18 +2,24 @@
 """Fixed datawarehouse service without circular imports"""
 
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from typing import BinaryIO, List, Dict, Any, Optional, Set
+from app.core.concurrency import db_bound
+from app.shared.result_cache import result_cache
 from .models import Deal, Tranche, TrancheBal
 from .dao import DataWarehouseDAO
+from . import cycles, ingest, rollups
+from .schemas import IngestFormat, IngestTable
 
 class DataWarehouseService:
     """Simplified data warehouse service using direct database access"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, config_db: Optional[Session] = None):
         self.db = db
+        self.config_db = config_db
         self.dao = DataWarehouseDAO(db)
     
-    async def get_available_deals(self) -> List[Dict[str, Any]]:
+    @db_bound
+    def get_available_deals(self) -> List[Dict[str, Any]]:
         """Get list of available deals"""
         deals = self.dao.get_all_deals()
         
@@ -26,7 +32,8 @@ class DataWarehouseService:
             for deal in deals
         ]
     
-    async def get_available_tranches(
+    @db_bound
+    def get_available_tranches(
         self, 
         deal_number: Optional[int] = None,
         deal_list: Optional[List[int]] = None
@@ -51,7 +58,77 @@ class DataWarehouseService:
             for tranche in tranches
         ]
     
-    async def get_available_cycles(self) -> List[Dict[str, int]]:
+    @db_bound
+    def get_available_cycles(self) -> List[Dict[str, int]]:
         """Get list of available cycle codes"""
         cycles = self.dao.get_available_cycles()
-        return [{"cycle_cde": cycle} for cycle in cycles]
\ No newline at end of file
+        return [{"cycle_cde": cycle} for cycle in cycles]
+    
+    @db_bound
+    def refresh_rollups(self, cycle_codes: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Rebuild deal rollups for the given cycles (all cycles by default)"""
+        return rollups.refresh_rollups(self.db, cycle_codes, self._get_weighted_pairs())
+    
+    @db_bound
+    def refresh_cycle(self, cycle_code: int) -> Dict[str, Any]:
+        """Register a newly loaded cycle and incrementally refresh state derived from it"""
+        return cycles.refresh_cycle(self.db, cycle_code, self._get_weighted_pairs())
+    
+    @db_bound
+    def ingest(
+        self,
+        table: IngestTable,
+        source: BinaryIO,
+        input_format: IngestFormat,
+        upsert: bool = True
+    ) -> Dict[str, Any]:
+        """Bulk load a warehouse table, then refresh state derived from what it touched.
+        
+        TrancheBal loads refresh the cycles they wrote. Deal and tranche rows feed
+        every cycle's rollups and cached results, so those loads rebuild all
+        rollups and clear the result cache. Rows committed before a failure are
+        refreshed too; a refresh error is then reported without masking the load error.
+        """
+        committed_cycles: Set[int] = set()
+        try:
+            result = ingest.ingest_records(
+                self.db, table, ingest.iter_records(source, input_format),
+                upsert=upsert, committed_cycles=committed_cycles
+            )
+        except Exception:
+            try:
+                self._refresh_ingested(table, sorted(committed_cycles))
+            except Exception as e:
+                print(f"⚠️  Refresh after failed {table.value} ingest failed: {e}")
+            raise
+        
+        refreshed_cycles = self._refresh_ingested(table, result["cycle_codes"])
+        return {**result, "refreshed_cycles": refreshed_cycles}
+    
+    def _refresh_ingested(self, table: IngestTable, cycle_codes: List[int]) -> List[int]:
+        """Refresh state derived from an ingest into ``table``; returns the refreshed cycles"""
+        weighted_pairs = self._get_weighted_pairs()
+        if table == IngestTable.tranchebal:
+            for cycle_code in cycle_codes:
+                cycles.refresh_cycle(self.db, cycle_code, weighted_pairs)
+            return cycle_codes
+        
+        refreshed_cycles = []
+        if rollups.DW_ROLLUPS_ENABLED:
+            refreshed_cycles = rollups.refresh_rollups(self.db, None, weighted_pairs)["cycles"]
+        result_cache.clear()
+        return refreshed_cycles
+    
+    def _get_weighted_pairs(self):
+        """Get weighted average (field, weight) pairs of active calculations for rollups"""
+        from app.features.calculations.dao import CalculationDAO
+        
+        if self.config_db is None:
+            raise ValueError("Config database required to resolve weighted average measures")
+        
+        return rollups.get_weighted_pairs(CalculationDAO(self.config_db).get_all_calculations())
+    
+    @db_bound
+    def get_rollup_status(self) -> List[Dict[str, Any]]:
+        """Get per-cycle deal rollup build state"""
+        return rollups.get_rollup_status(self.db)
@@ -0,0 +1,22 @@
+# app/features/jobs/__init__.py
+"""Jobs feature - asynchronous report execution"""
+
+from .models import ReportJob, JobStatus
+from .schemas import ReportJobSubmitRequest, ReportJobResponse
+from .service import ReportJobService
+from .dao import ReportJobDAO
+from .store import JobResultStore, job_result_store
+from .worker import JobRunner, job_runner
+
+__all__ = [
+    "ReportJob",
+    "JobStatus",
+    "ReportJobSubmitRequest",
+    "ReportJobResponse",
+    "ReportJobService",
+    "ReportJobDAO",
+    "JobResultStore",
+    "job_result_store",
+    "JobRunner",
+    "job_runner"
+]
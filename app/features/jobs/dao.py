@@ -0,0 +1,109 @@
+# app/features/jobs/dao.py
+"""Data Access Object for report job state"""
+
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from .models import JobStatus, ReportJob
+
+class ReportJobDAO:
+    """Data Access Object for report job data access"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, job_id: str) -> Optional[ReportJob]:
+        """Get a job by ID"""
+        return self.db.query(ReportJob).filter(ReportJob.id == job_id).first()
+
+    def get_jobs(
+        self,
+        status: Optional[JobStatus] = None,
+        report_id: Optional[int] = None,
+        limit: int = 50
+    ) -> List[ReportJob]:
+        """Get jobs, newest first, optionally filtered by status and report"""
+        query = self.db.query(ReportJob)
+
+        if status:
+            query = query.filter(ReportJob.status == status)
+        if report_id:
+            query = query.filter(ReportJob.report_id == report_id)
+
+        return query.order_by(ReportJob.created_at.desc()).limit(limit).all()
+
+    def create(self, job: ReportJob) -> ReportJob:
+        """Create a new job"""
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def claim(self, job_id: str) -> bool:
+        """Move a queued job to running; False if it was cancelled or already claimed"""
+        result = self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == JobStatus.QUEUED)
+            .values(
+                status=JobStatus.RUNNING,
+                started_at=datetime.now(),
+                attempts=ReportJob.attempts + 1
+            )
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def requeue_interrupted(self) -> List[str]:
+        """Return jobs left running by a previous process to the queue and get all queued job IDs"""
+        self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.status == JobStatus.RUNNING)
+            .values(status=JobStatus.QUEUED, started_at=None)
+        )
+        self.db.commit()
+
+        rows = self.db.query(ReportJob.id)\
+            .filter(ReportJob.status == JobStatus.QUEUED)\
+            .order_by(ReportJob.created_at)\
+            .all()
+        return [row[0] for row in rows]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job only while it is queued or running; False if it already finished"""
+        result = self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+            .values(status=JobStatus.CANCELLED, finished_at=datetime.now())
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def update_running(self, job_id: str, **values) -> bool:
+        """Update a job only while it is running; False if it was cancelled meanwhile"""
+        result = self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == JobStatus.RUNNING)
+            .values(**values)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def expire_results(self, finished_before: datetime) -> int:
+        """Clear the result paths of jobs that succeeded before a cutoff; returns the jobs updated"""
+        result = self.db.execute(
+            update(ReportJob)
+            .where(
+                ReportJob.status == JobStatus.SUCCEEDED,
+                ReportJob.result_path.is_not(None),
+                ReportJob.finished_at < finished_before
+            )
+            .values(result_path=None)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def delete(self, job: ReportJob):
+        """Delete a job"""
+        self.db.delete(job)
+        self.db.commit()
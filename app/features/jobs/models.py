@@ -0,0 +1,47 @@
+# app/features/jobs/models.py
+"""Persisted state of asynchronous report execution jobs"""
+
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, JSON, Index, Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from app.core.database import ConfigBase as Base
+import enum
+
+class JobStatus(str, enum.Enum):
+    """Lifecycle states of a report job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class ReportJob(Base):
+    """Report execution submitted to run in the background"""
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        # Supports startup requeue and status listings in submission order
+        Index("ix_report_jobs_status_created_at", "status", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)  # uuid4 hex
+    report_id: Mapped[int] = mapped_column(ForeignKey("reports.id"), nullable=False, index=True)
+    status: Mapped[JobStatus] = mapped_column(SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    request: Mapped[dict] = mapped_column(JSON, nullable=False)  # ReportExecuteRequest as submitted
+    submitted_by: Mapped[str] = mapped_column(String(100), nullable=True)
+
+    # One execution covers every cycle, so there is no partial progress to report
+    cycles_total: Mapped[int] = mapped_column(Integer, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    row_count: Mapped[int] = mapped_column(Integer, nullable=True)
+    result_path: Mapped[str] = mapped_column(String(500), nullable=True)  # cleared once the result expires
+    error_message: Mapped[str] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def has_result(self) -> bool:
+        """Whether a finished result is available in the results store"""
+        return self.status == JobStatus.SUCCEEDED and self.result_path is not None
@@ -0,0 +1,95 @@
+# app/features/jobs/router.py
+"""API router for asynchronous report jobs"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.dependencies import get_config_db
+from app.core.exceptions import JobNotFoundError, JobStateError, ReportGenerationError
+from .models import JobStatus
+from .schemas import ReportJobSubmitRequest, ReportJobResponse
+from .service import ReportJobService
+from .worker import job_runner
+
+router = APIRouter()
+
+def get_job_service(config_db: Session = Depends(get_config_db)) -> ReportJobService:
+    """Get report job service"""
+    return ReportJobService(config_db)
+
+@router.post("", response_model=ReportJobResponse, status_code=202)
+async def submit_job(
+    request: ReportJobSubmitRequest,
+    service: ReportJobService = Depends(get_job_service)
+):
+    """Submit a report execution to run in the background; poll the returned job for status"""
+    try:
+        job = await service.submit_job(request)
+    except ReportGenerationError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    job_runner.enqueue(job.id)
+    return job
+
+@router.get("", response_model=List[ReportJobResponse])
+async def get_jobs(
+    service: ReportJobService = Depends(get_job_service),
+    status: Optional[JobStatus] = Query(None, description="Filter by job status"),
+    report_id: Optional[int] = Query(None, description="Filter by report template"),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Get report jobs, newest first"""
+    return await service.get_jobs(status, report_id, limit)
+
+@router.get("/{job_id}", response_model=ReportJobResponse)
+async def get_job(
+    job_id: str,
+    service: ReportJobService = Depends(get_job_service)
+):
+    """Get a job's status"""
+    try:
+        return await service.get_job(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    service: ReportJobService = Depends(get_job_service)
+):
+    """Download the result of a succeeded job (the synchronous execute response body)"""
+    try:
+        result_path = await service.get_result_path(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return FileResponse(result_path, media_type="application/json")
+
+@router.post("/{job_id}/cancel", response_model=ReportJobResponse)
+async def cancel_job(
+    job_id: str,
+    service: ReportJobService = Depends(get_job_service)
+):
+    """Cancel a queued or running job"""
+    try:
+        return await service.cancel_job(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.delete("/{job_id}")
+async def delete_job(
+    job_id: str,
+    service: ReportJobService = Depends(get_job_service)
+):
+    """Delete a job and its stored result"""
+    try:
+        return await service.delete_job(job_id)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
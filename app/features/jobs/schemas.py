@@ -0,0 +1,31 @@
+# app/features/jobs/schemas.py
+"""Pydantic schemas for report jobs"""
+
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.features.reports.schemas import ReportExecuteRequest
+from .models import JobStatus
+
+class ReportJobSubmitRequest(ReportExecuteRequest):
+    """Request model for submitting a report execution to run in the background"""
+    report_id: int
+
+class ReportJobResponse(BaseModel):
+    """Status of a report job"""
+    id: str
+    report_id: int
+    status: JobStatus
+    request: dict
+    submitted_by: Optional[str] = None
+    cycles_total: Optional[int] = None
+    attempts: int
+    row_count: Optional[int] = None
+    error_message: Optional[str] = None
+    has_result: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,89 @@
+# app/features/jobs/service.py
+"""Service layer for submitting and tracking report jobs"""
+
+import uuid
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.concurrency import db_bound
+from app.core.exceptions import JobNotFoundError, JobStateError, ReportGenerationError
+from app.features.reports.dao import ReportDAO
+from .dao import ReportJobDAO
+from .models import JobStatus, ReportJob
+from .schemas import ReportJobSubmitRequest, ReportJobResponse
+from .store import JobResultStore, job_result_store
+
+class ReportJobService:
+    """Service for report job submission, status and results"""
+
+    def __init__(self, config_db: Session, store: JobResultStore = job_result_store):
+        self.config_db = config_db
+        self.dao = ReportJobDAO(config_db)
+        self.store = store
+
+    @db_bound
+    def submit_job(self, request: ReportJobSubmitRequest, user_id: str = "api_user") -> ReportJobResponse:
+        """Persist a queued job for a report execution"""
+        if not ReportDAO(self.config_db).get_by_id(request.report_id):
+            raise ReportGenerationError(f"Report template {request.report_id} not found")
+
+        job = self.dao.create(ReportJob(
+            id=uuid.uuid4().hex,
+            report_id=request.report_id,
+            status=JobStatus.QUEUED,
+            request=request.model_dump(mode="json", exclude={"report_id"}, exclude_none=True),
+            submitted_by=user_id,
+            attempts=0
+        ))
+        return ReportJobResponse.model_validate(job)
+
+    @db_bound
+    def get_job(self, job_id: str) -> ReportJobResponse:
+        """Get a job's status"""
+        return ReportJobResponse.model_validate(self._get_job(job_id))
+
+    @db_bound
+    def get_jobs(
+        self,
+        status: Optional[JobStatus] = None,
+        report_id: Optional[int] = None,
+        limit: int = 50
+    ) -> List[ReportJobResponse]:
+        """Get jobs, newest first"""
+        return [ReportJobResponse.model_validate(job) for job in self.dao.get_jobs(status, report_id, limit)]
+
+    @db_bound
+    def cancel_job(self, job_id: str) -> ReportJobResponse:
+        """Cancel a queued or running job; a running job finishes executing but its result is discarded"""
+        job = self._get_job(job_id)
+        cancelled = self.dao.cancel(job_id)
+        self.config_db.refresh(job)
+        if not cancelled:
+            raise JobStateError(f"Job {job_id} is already {job.status.value}")
+        return ReportJobResponse.model_validate(job)
+
+    @db_bound
+    def delete_job(self, job_id: str) -> dict:
+        """Delete a finished or queued job and its stored result"""
+        job = self._get_job(job_id)
+        if job.status == JobStatus.RUNNING:
+            raise JobStateError(f"Job {job_id} is running; cancel it before deleting")
+
+        self.store.delete(job.result_path)
+        self.dao.delete(job)
+        return {"message": f"Job {job_id} deleted successfully"}
+
+    @db_bound
+    def get_result_path(self, job_id: str) -> str:
+        """Get the stored result file of a succeeded job"""
+        job = self._get_job(job_id)
+        if job.status != JobStatus.SUCCEEDED:
+            raise JobStateError(f"Job {job_id} is {job.status.value}; results are available once it succeeds")
+        if not self.store.exists(job.result_path):
+            raise JobNotFoundError(f"Result for job {job_id} is no longer available")
+        return job.result_path
+
+    def _get_job(self, job_id: str) -> ReportJob:
+        job = self.dao.get_by_id(job_id)
+        if not job:
+            raise JobNotFoundError(f"Job {job_id} not found")
+        return job
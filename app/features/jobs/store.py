@@ -0,0 +1,62 @@
+# app/features/jobs/store.py
+"""File-backed store for finished report job results.
+
+Results are written as the JSON body the synchronous execute endpoint would
+return, one file per job, so fetching a result is a plain file read and large
+results never pass through the config database. Results older than
+``JOB_RESULT_TTL_HOURS`` are purged (0 keeps them until their job is deleted).
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+JOB_RESULTS_DIR = os.getenv("JOB_RESULTS_DIR", "./job_results")
+JOB_RESULT_TTL_HOURS = float(os.getenv("JOB_RESULT_TTL_HOURS", "168"))
+
+class JobResultStore:
+    """Stores serialized job results under a directory"""
+
+    def __init__(self, directory: str = JOB_RESULTS_DIR):
+        self.directory = Path(directory)
+
+    def path_for(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def write(self, job_id: str, content: str) -> str:
+        """Write a result atomically and return its path"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(job_id)
+        partial = path.with_suffix(".json.partial")
+        partial.write_text(content, encoding="utf-8")
+        os.replace(partial, path)
+        return str(path)
+
+    def exists(self, path: Optional[str]) -> bool:
+        return path is not None and os.path.exists(path)
+
+    def delete(self, path: Optional[str]):
+        """Remove a stored result if present"""
+        if path is not None:
+            Path(path).unlink(missing_ok=True)
+
+    def purge(self, modified_before: datetime) -> int:
+        """Remove result files (and leftover partial writes) last written before a cutoff"""
+        if not self.directory.is_dir():
+            return 0
+
+        cutoff = modified_before.timestamp()
+        removed = 0
+        for path in self.directory.glob("*.json*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                # Deleted concurrently with its job
+                continue
+        return removed
+
+# Process-wide store used by the job service and worker
+job_result_store = JobResultStore()
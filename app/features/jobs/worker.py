@@ -0,0 +1,159 @@
+# app/features/jobs/worker.py
+"""In-process worker pool running queued report jobs.
+
+A fixed number of asyncio worker tasks pull job IDs from a queue, so at most
+``JOB_WORKER_CONCURRENCY`` jobs execute at once; the executions themselves run
+on the database executor through ``ReportService``. A job is one report
+execution over its full cycle list (one consolidated multi-cycle query); a
+job cancelled while executing discards its result. Job state is persisted in
+the config database: on startup, jobs left running by a previous process are
+requeued along with everything still queued. Stored results older than
+``JOB_RESULT_TTL_HOURS`` are purged on startup and hourly afterwards.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.core.concurrency import run_in_db_executor
+from app.core.database import ConfigSessionLocal, DWSessionLocal
+from app.features.reports.schemas import ReportExecuteRequest
+from app.features.reports.service import ReportService
+from app.shared.query_engine import QueryEngine
+from .dao import ReportJobDAO
+from .models import JobStatus
+from .store import JOB_RESULT_TTL_HOURS, JobResultStore, job_result_store
+
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+RESULT_PURGE_INTERVAL_SECONDS = 3600
+
+class JobRunner:
+    """Bounded pool of worker tasks executing report jobs"""
+
+    def __init__(
+        self,
+        concurrency: int = JOB_WORKER_CONCURRENCY,
+        store: JobResultStore = job_result_store,
+        result_ttl_hours: float = JOB_RESULT_TTL_HOURS
+    ):
+        self.concurrency = concurrency
+        self.store = store
+        self.result_ttl_hours = result_ttl_hours
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def queued_count(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        """Requeue persisted jobs and start the worker tasks and the result purger"""
+        self._queue = asyncio.Queue()
+        for job_id in await run_in_db_executor(self._requeue_persisted_jobs):
+            self._queue.put_nowait(job_id)
+
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"report-job-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        if self.result_ttl_hours > 0:
+            self._workers.append(asyncio.create_task(self._purge_periodically(), name="report-job-result-purger"))
+
+    async def stop(self):
+        """Stop the worker tasks; interrupted jobs are requeued on the next start"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def enqueue(self, job_id: str):
+        """Queue a persisted job for execution"""
+        if self._queue is None:
+            raise RuntimeError("Job runner is not started")
+        self._queue.put_nowait(job_id)
+
+    def _requeue_persisted_jobs(self) -> List[str]:
+        with ConfigSessionLocal() as config_db:
+            return ReportJobDAO(config_db).requeue_interrupted()
+
+    def purge_expired_results(self) -> int:
+        """Remove stored results older than the TTL; returns the jobs whose result expired"""
+        cutoff = datetime.now() - timedelta(hours=self.result_ttl_hours)
+        with ConfigSessionLocal() as config_db:
+            expired = ReportJobDAO(config_db).expire_results(cutoff)
+        self.store.purge(cutoff)
+        return expired
+
+    async def _purge_periodically(self):
+        while True:
+            try:
+                expired = await run_in_db_executor(self.purge_expired_results)
+                if expired:
+                    print(f"ℹ️  Purged {expired} expired report job results")
+            except Exception as e:
+                print(f"⚠️  Report job result purge failed: {e}")
+            await asyncio.sleep(RESULT_PURGE_INTERVAL_SECONDS)
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                print(f"❌ Report job {job_id} could not be recorded: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def run_job(self, job_id: str):
+        """Execute one job as a single report execution, recording the stored result"""
+        config_db = ConfigSessionLocal()
+        dw_db = DWSessionLocal()
+        dao = ReportJobDAO(config_db)
+
+        try:
+            # Cancelled (or already claimed) jobs are skipped
+            if not await run_in_db_executor(dao.claim, job_id):
+                return
+            job = await run_in_db_executor(dao.get_by_id, job_id)
+
+            service = ReportService(config_db, QueryEngine(dw_db, config_db))
+            request = ReportExecuteRequest(**job.request)
+            cycle_codes = await service.resolve_cycle_codes(request)
+            if not await run_in_db_executor(dao.update_running, job_id, cycles_total=len(cycle_codes)):
+                return
+
+            response = await service.execute_report(job.report_id, request, job.submitted_by)
+            result_path = await run_in_db_executor(
+                lambda: self.store.write(job_id, response.model_dump_json())
+            )
+
+            finished = await run_in_db_executor(
+                dao.update_running, job_id,
+                status=JobStatus.SUCCEEDED,
+                row_count=response.row_count,
+                result_path=result_path,
+                finished_at=datetime.now()
+            )
+            if not finished:
+                # Cancelled while executing; the result is discarded
+                self.store.delete(result_path)
+
+        except Exception as e:
+            await run_in_db_executor(config_db.rollback)
+            await run_in_db_executor(
+                dao.update_running, job_id,
+                status=JobStatus.FAILED,
+                error_message=str(e),
+                finished_at=datetime.now()
+            )
+        finally:
+            dw_db.close()
+            config_db.close()
+
+# Process-wide runner started with the application
+job_runner = JobRunner()
@@ -4,11 +4,11 @@
 from .models import Report, ReportDeal, ReportTranche, ReportCalculation, ReportExecutionLog
 from .schemas import (
     ReportCreateRequest, ReportUpdateRequest, ReportExecuteRequest,
-    ReportResponse, ReportRow, ReportTemplateResponse, ReportTemplateDetailResponse,
-    AggregationLevel
+    ReportResponse, ReportRow, ReportTemplateResponse, ReportTemplateDetailResponse, ExecutionTimings,
+    AggregationLevel, ReportOutputFormat, ReportExportFormat
 )
 from .service import ReportService
-from .dao import ReportDAO
+from .dao import ReportDAO, ReportExecutionPlan
 
 __all__ = [
     "Report",
@@ -23,7 +23,11 @@ __all__ = [
     "ReportRow",
     "ReportTemplateResponse",
     "ReportTemplateDetailResponse",
+    "ExecutionTimings",
     "AggregationLevel",
+    "ReportOutputFormat",
+    "ReportExportFormat",
     "ReportService",
-    "ReportDAO"
+    "ReportDAO",
+    "ReportExecutionPlan"
 ]
\ No newline at end of file
@@ -0,0 +1,137 @@
+# app/features/reports/dao.py
+"""Data Access Object for report template operations"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session, selectinload
+from typing import Any, List, Optional, Tuple
+from app.features.calculations.models import Calculation
+from .models import Report, ReportDeal, ReportTranche, ReportCalculation, ReportExecutionLog
+
+@dataclass(frozen=True)
+class ReportExecutionPlan:
+    """Fully hydrated, immutable snapshot of a report template ready for execution"""
+    report_id: int
+    name: str
+    description: Optional[str]
+    aggregation_level: str
+    deal_numbers: Tuple[int, ...]
+    tranche_ids: Tuple[str, ...]
+    calculations: Tuple[Calculation, ...]  # Ordered by display_order
+    created_at: datetime
+    updated_at: datetime
+    created_by: Optional[str]
+
+    @property
+    def calculation_names(self) -> List[str]:
+        """Get calculation names in display order"""
+        return [calc.name for calc in self.calculations]
+
+class ReportDAO:
+    """Data Access Object for report template data access"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, report_id: int) -> Optional[Report]:
+        """Get active report template by ID"""
+        return self.db.query(Report).filter(
+            Report.id == report_id,
+            Report.is_active == True
+        ).first()
+
+    def get_template_summaries(self) -> List[Any]:
+        """Get all active templates with selection counts and last executed cycle.
+
+        Runs as a single statement: per-template counts come from grouped
+        aggregates and the latest execution from a ROW_NUMBER() window, so the
+        cost does not grow with one query per template.
+        """
+        deal_counts = select(
+            ReportDeal.report_id,
+            func.count(ReportDeal.id).label("deal_count")
+        ).group_by(ReportDeal.report_id).subquery()
+
+        tranche_counts = select(
+            ReportTranche.report_id,
+            func.count(ReportTranche.id).label("tranche_count")
+        ).group_by(ReportTranche.report_id).subquery()
+
+        calculation_counts = select(
+            ReportCalculation.report_id,
+            func.count(ReportCalculation.id).label("calculation_count")
+        ).group_by(ReportCalculation.report_id).subquery()
+
+        ranked_executions = select(
+            ReportExecutionLog.report_id,
+            ReportExecutionLog.cycle_code,
+            func.row_number().over(
+                partition_by=ReportExecutionLog.report_id,
+                order_by=(ReportExecutionLog.executed_at.desc(), ReportExecutionLog.id.desc())
+            ).label("recency")
+        ).subquery()
+
+        return self.db.query(
+            Report,
+            func.coalesce(deal_counts.c.deal_count, 0).label("deal_count"),
+            func.coalesce(tranche_counts.c.tranche_count, 0).label("tranche_count"),
+            func.coalesce(calculation_counts.c.calculation_count, 0).label("calculation_count"),
+            ranked_executions.c.cycle_code.label("last_executed_cycle")
+        )\
+            .outerjoin(deal_counts, deal_counts.c.report_id == Report.id)\
+            .outerjoin(tranche_counts, tranche_counts.c.report_id == Report.id)\
+            .outerjoin(calculation_counts, calculation_counts.c.report_id == Report.id)\
+            .outerjoin(ranked_executions, and_(
+                ranked_executions.c.report_id == Report.id,
+                ranked_executions.c.recency == 1
+            ))\
+            .filter(Report.is_active == True)\
+            .order_by(Report.id)\
+            .all()
+
+    def get_execution_plan(self, report_id: int) -> Optional[ReportExecutionPlan]:
+        """Load a report template with its deals, tranches and ordered calculations.
+
+        Uses a constant number of queries regardless of template size: the report
+        with its deal/tranche selections eagerly loaded, plus one joined, ordered
+        fetch of its calculations.
+        """
+        report = self.db.query(Report).options(
+            selectinload(Report.report_deals),
+            selectinload(Report.report_tranches)
+        ).filter(
+            Report.id == report_id,
+            Report.is_active == True
+        ).first()
+
+        if not report:
+            return None
+
+        calculations = self.db.query(Calculation)\
+            .join(ReportCalculation, ReportCalculation.calculation_id == Calculation.id)\
+            .filter(ReportCalculation.report_id == report_id)\
+            .order_by(ReportCalculation.display_order, ReportCalculation.id)\
+            .all()
+
+        return ReportExecutionPlan(
+            report_id=report.id,
+            name=report.name,
+            description=report.description,
+            aggregation_level=report.aggregation_level,
+            deal_numbers=tuple(rd.deal_number for rd in report.report_deals),
+            # Tranche selections are stored per deal; keep each tranche id once, in order
+            tranche_ids=tuple(dict.fromkeys(rt.tranche_id for rt in report.report_tranches)),
+            calculations=tuple(calculations),
+            created_at=report.created_at,
+            updated_at=report.updated_at,
+            created_by=report.created_by
+        )
+
+    def get_execution_logs(self, report_id: int, limit: int = 50) -> List[ReportExecutionLog]:
+        """Get most recent execution logs for a report template"""
+        return self.db.query(ReportExecutionLog)\
+            .filter(ReportExecutionLog.report_id == report_id)\
+            .order_by(ReportExecutionLog.executed_at.desc())\
+            .limit(limit)\
+            .all()
@@ -0,0 +1,131 @@
+# app/features/reports/exporters.py
+"""Serializers for report results in non-default output formats"""
+
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List
+import csv
+import io
+import json
+
+from sqlalchemy import Float, Integer, Numeric
+from app.core.exceptions import ConfigurationError
+from app.features.calculations.models import Calculation, AggregationFunction
+from app.shared.constants import DEFAULT_STREAM_CHUNK_SIZE
+from .schemas import ReportExportFormat
+
+# Precision used for SUMs of money columns, wide enough not to overflow Numeric(19, 4) totals
+SUM_DECIMAL_PRECISION = 38
+
+def iter_ndjson(records: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """Serialize report records as newline-delimited JSON, flushed in batches"""
+    buffer = []
+    for record in records:
+        # default=str keeps Decimal money values exact, matching the JSON response
+        buffer.append(json.dumps(record, default=str))
+        if len(buffer) >= batch_size:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+def iter_csv(
+    records: Iterable[Dict[str, Any]],
+    columns: List[str],
+    aggregation_level: str,
+    batch_size: int = DEFAULT_STREAM_CHUNK_SIZE
+) -> Iterator[str]:
+    """Serialize report records as CSV with one column per calculation, flushed in batches"""
+    key_columns = ["dl_nbr", "tr_id", "cycle_cde"] if aggregation_level == "tranche" else ["dl_nbr", "cycle_cde"]
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(key_columns + columns)
+    
+    pending = 0
+    for record in records:
+        values = record["values"]
+        writer.writerow([record[key] for key in key_columns] + [values.get(column) for column in columns])
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    # Always flush: an empty result still yields the header row
+    yield buffer.getvalue()
+
+def render_columnar_json(payload: Dict[str, Any]) -> str:
+    """Serialize a columnar report payload as compact JSON"""
+    return json.dumps(payload, default=str, separators=(",", ":"))
+
+def _require_pyarrow():
+    """Import pyarrow, which is an optional dependency used only by binary exports"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ConfigurationError("Arrow/Parquet export requires pyarrow (pip install pyarrow)")
+    return pyarrow
+
+def _arrow_type_for_calculation(pa, calc: Calculation):
+    """Map a calculation result to an Arrow type, keeping Numeric money columns as decimals"""
+    if calc.aggregation_function == AggregationFunction.COUNT:
+        return pa.int64()
+    if calc.aggregation_function in (AggregationFunction.AVG, AggregationFunction.WEIGHTED_AVG):
+        return pa.float64()
+    
+    source_type = calc.get_source_column().type
+    
+    # Float subclasses Numeric, so it must be checked first
+    if isinstance(source_type, Float):
+        return pa.float64()
+    if isinstance(source_type, Numeric):
+        precision = SUM_DECIMAL_PRECISION if calc.aggregation_function == AggregationFunction.SUM else source_type.precision
+        return pa.decimal128(precision, source_type.scale)
+    if isinstance(source_type, Integer):
+        return pa.int64()
+    return pa.string()
+
+def _to_decimals(values: List[Any], scale: int) -> List[Any]:
+    """Quantize values to a fixed scale so they fit the Arrow decimal type exactly"""
+    quantum = Decimal(1).scaleb(-scale)
+    return [
+        None if value is None else Decimal(str(value)).quantize(quantum)
+        for value in values
+    ]
+
+def build_arrow_table(
+    header: List[str],
+    columns: List[List[Any]],
+    calculations: List[Calculation],
+    aggregation_level: str
+):
+    """Build a typed Arrow table from columnar report results"""
+    pa = _require_pyarrow()
+    
+    key_types = {"dl_nbr": pa.int64(), "tr_id": pa.string(), "cycle_cde": pa.int32()}
+    key_count = 3 if aggregation_level == "tranche" else 2
+    types = [key_types[name] for name in header[:key_count]]
+    types += [_arrow_type_for_calculation(pa, calc) for calc in calculations]
+    
+    arrays = []
+    for values, arrow_type in zip(columns, types):
+        if pa.types.is_decimal(arrow_type):
+            values = _to_decimals(values, arrow_type.scale)
+        arrays.append(pa.array(values, type=arrow_type))
+    
+    return pa.Table.from_arrays(arrays, names=header)
+
+def render_arrow_table(table, export_format: ReportExportFormat) -> bytes:
+    """Serialize an Arrow table as an Arrow IPC stream or a Parquet file"""
+    pa = _require_pyarrow()
+    sink = pa.BufferOutputStream()
+    
+    if export_format == ReportExportFormat.parquet:
+        pa.parquet.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    
+    return sink.getvalue().to_pybytes()
@@ -1,7 +1,7 @@
 # app/features/reports/models.py
 """Updated models with cycle_code moved to execution logs"""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, SmallInteger
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, SmallInteger, Index, JSON
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.sql import func
 from app.core.database import ConfigBase as Base
@@ -65,6 +65,10 @@ class ReportCalculation(Base):
 class ReportExecutionLog(Base):
     """Log of report executions - now includes cycle_code"""
     __tablename__ = "report_execution_logs"
+    __table_args__ = (
+        # Supports "latest execution per report" lookups
+        Index("ix_report_execution_logs_report_executed_at", "report_id", "executed_at"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     report_id: Mapped[int] = mapped_column(ForeignKey("reports.id"), nullable=False)
@@ -74,6 +78,9 @@ class ReportExecutionLog(Base):
     row_count: Mapped[int] = mapped_column(nullable=True)
     success: Mapped[bool] = mapped_column(Boolean, nullable=False)
     error_message: Mapped[str] = mapped_column(Text, nullable=True)
+    phase_timings: Mapped[dict] = mapped_column(JSON, nullable=True)  # Milliseconds per execution phase
+    statement_count: Mapped[int] = mapped_column(Integer, nullable=True)  # SQL statements issued
+    sql_time_ms: Mapped[float] = mapped_column(nullable=True)  # Time spent inside those statements
     executed_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
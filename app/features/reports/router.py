@@ -2,16 +2,32 @@
 """Refactored reports router using unified query engine"""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from typing import List
+from app.core.concurrency import iterate_in_db_executor
 from app.core.dependencies import get_query_engine
-from app.core.exceptions import ReportGenerationError
+from app.core.exceptions import ConfigurationError, ReportGenerationError
 from app.shared.query_engine import QueryEngine
+from app.shared.result_cache import result_cache
+from app.shared.single_flight import report_single_flight
+from app.shared.statement_cache import statement_cache
 from .service import ReportService
+from .exporters import render_columnar_json
 from .schemas import (
-    ReportCreateRequest, ReportUpdateRequest, ReportExecuteRequest,
+    ReportCreateRequest, ReportUpdateRequest, ReportExecuteRequest, ReportOutputFormat, ReportExportFormat,
     ReportResponse, ReportTemplateResponse, ReportTemplateDetailResponse
 )
 
+STREAMING_MEDIA_TYPES = {
+    ReportOutputFormat.ndjson: "application/x-ndjson",
+    ReportOutputFormat.csv: "text/csv",
+}
+
+EXPORT_MEDIA_TYPES = {
+    ReportExportFormat.arrow: ("application/vnd.apache.arrow.stream", "arrows"),
+    ReportExportFormat.parquet: ("application/vnd.apache.parquet", "parquet"),
+}
+
 router = APIRouter()
 
 def get_report_service(query_engine: QueryEngine = Depends(get_query_engine)) -> ReportService:
@@ -51,11 +67,12 @@ async def get_report_template_detail(
 async def preview_report_sql(
     report_id: int,
     service: ReportService = Depends(get_report_service),
-    cycle_code: int = Query(202404, description="Sample cycle code for SQL preview")
+    cycle_code: int = Query(202404, description="Sample cycle code for SQL preview"),
+    explain: bool = Query(False, description="Include SQLite's EXPLAIN QUERY PLAN for the execution statement")
 ):
     """Preview SQL using unified query engine"""
     try:
-        return await service.preview_report_sql(report_id, cycle_code)
+        return await service.preview_report_sql(report_id, cycle_code, explain)
     except ReportGenerationError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -86,13 +103,50 @@ async def delete_report_template(
 async def execute_report(
     report_id: int,
     request: ReportExecuteRequest,
-    service: ReportService = Depends(get_report_service)
+    service: ReportService = Depends(get_report_service),
+    format: ReportOutputFormat = Query(ReportOutputFormat.json, description="Output format: json, columnar, or streamed ndjson/csv")
 ):
     """Execute a report template using unified query engine"""
     try:
-        return await service.execute_report(report_id, request)
+        if format == ReportOutputFormat.json:
+            return await service.execute_report(report_id, request)
+        
+        if format == ReportOutputFormat.columnar:
+            payload = await service.execute_report_columnar(report_id, request)
+            return Response(content=render_columnar_json(payload), media_type="application/json")
+        
+        chunks = await service.stream_report(report_id, request, format)
+        return StreamingResponse(
+            iterate_in_db_executor(chunks),
+            media_type=STREAMING_MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="report_{report_id}_{request.cycle_label}.{format.value}"'
+            }
+        )
+    except ReportGenerationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/templates/{report_id}/export")
+async def export_report(
+    report_id: int,
+    service: ReportService = Depends(get_report_service),
+    cycle_code: int = Query(..., gt=0, description="Cycle code to run the report for"),
+    format: ReportExportFormat = Query(ReportExportFormat.parquet, description="Export format: arrow (IPC stream) or parquet")
+):
+    """Execute a report template and download it as an Arrow IPC stream or Parquet file"""
+    try:
+        content = await service.export_report(report_id, cycle_code, format)
+    except ConfigurationError as e:
+        raise HTTPException(status_code=501, detail=str(e))
     except ReportGenerationError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type, extension = EXPORT_MEDIA_TYPES[format]
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="report_{report_id}_{cycle_code}.{extension}"'}
+    )
 
 @router.get("/templates/{report_id}/logs")
 async def get_report_execution_logs(
@@ -104,4 +158,18 @@ async def get_report_execution_logs(
     try:
         return await service.get_execution_logs(report_id, limit)
     except ReportGenerationError as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get hit/miss counters for the report query caches and execution coalescing"""
+    return {
+        "statement_cache": statement_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "single_flight": report_single_flight.stats()
+    }
+
+@router.post("/cache/clear")
+async def clear_result_cache():
+    """Drop all cached report results, e.g. after the warehouse was loaded from the command line"""
+    return {"invalidated_results": result_cache.clear()}
\ No newline at end of file
@@ -1,7 +1,7 @@
 # app/features/reports/schemas.py
 """Updated schemas without cycle_code in template creation"""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -10,6 +10,18 @@ class AggregationLevel(str, Enum):
     deal = "deal"
     tranche = "tranche"
 
+class ReportOutputFormat(str, Enum):
+    """Output formats for report execution"""
+    json = "json"        # Single ReportResponse document
+    columnar = "columnar"  # Shared header plus one array per column
+    ndjson = "ndjson"    # Streamed, one ReportRow object per line
+    csv = "csv"          # Streamed, one column per calculation
+
+class ReportExportFormat(str, Enum):
+    """Binary export formats for report results"""
+    arrow = "arrow"      # Arrow IPC stream
+    parquet = "parquet"
+
 # Request schemas for creating/updating reports
 class ReportCreateRequest(BaseModel):
     """Request model for creating a new report template (no cycle_code)"""
@@ -29,8 +41,47 @@ class ReportUpdateRequest(BaseModel):
     selected_calculations: Optional[List[str]] = Field(None, min_items=1)
 
 class ReportExecuteRequest(BaseModel):
-    """Request model for executing a report (cycle_code is required)"""
-    cycle_code: int = Field(..., gt=0, description="Cycle code to run the report for")
+    """Request model for executing a report over one cycle, a list of cycles, or a cycle range"""
+    cycle_code: Optional[int] = Field(None, gt=0, description="Cycle code to run the report for")
+    cycle_codes: Optional[List[int]] = Field(None, min_items=1, description="Cycle codes to run the report for")
+    cycle_start: Optional[int] = Field(None, gt=0, description="First cycle code of an inclusive range")
+    cycle_end: Optional[int] = Field(None, gt=0, description="Last cycle code of an inclusive range")
+    include_timings: bool = Field(False, description="Return the per-phase timing breakdown with the result")
+
+    @model_validator(mode="after")
+    def check_cycle_selection(self) -> "ReportExecuteRequest":
+        """Require exactly one of cycle_code, cycle_codes, or cycle_start/cycle_end"""
+        has_range = self.cycle_start is not None or self.cycle_end is not None
+        selections = [self.cycle_code is not None, self.cycle_codes is not None, has_range]
+        if sum(selections) != 1:
+            raise ValueError("Specify exactly one of cycle_code, cycle_codes, or cycle_start/cycle_end")
+        if has_range:
+            if self.cycle_start is None or self.cycle_end is None:
+                raise ValueError("cycle_start and cycle_end must be given together")
+            if self.cycle_start > self.cycle_end:
+                raise ValueError("cycle_start must not be after cycle_end")
+        return self
+
+    @property
+    def is_cycle_range(self) -> bool:
+        """Whether the cycles are given as a range to be resolved against the warehouse"""
+        return self.cycle_start is not None
+
+    @property
+    def explicit_cycle_codes(self) -> Optional[List[int]]:
+        """Requested cycle codes, sorted and de-duplicated, or None for a range"""
+        if self.cycle_code is not None:
+            return [self.cycle_code]
+        if self.cycle_codes is not None:
+            return sorted(set(self.cycle_codes))
+        return None
+
+    @property
+    def cycle_label(self) -> str:
+        """Compact description of the requested cycles, e.g. for file names"""
+        if self.is_cycle_range:
+            return f"{self.cycle_start}-{self.cycle_end}"
+        return "_".join(str(cycle) for cycle in self.explicit_cycle_codes)
 
 # Response schemas
 class ReportRow(BaseModel):
@@ -40,17 +91,25 @@ class ReportRow(BaseModel):
     cycle_cde: int
     values: Dict[str, Any]  # Calculation results keyed by calculation name
 
+class ExecutionTimings(BaseModel):
+    """Per-phase timing breakdown of one report execution"""
+    phases: Dict[str, float]  # Milliseconds per phase, in execution order
+    statement_count: int  # SQL statements issued across both databases
+    sql_time_ms: float  # Time spent inside those statements
+
 class ReportResponse(BaseModel):
     """Response model for generated reports"""
     report_id: int
     report_name: str
     aggregation_level: str
-    cycle_code: int  # Shows the cycle that was executed
+    cycle_code: Optional[int] = None  # Shows the cycle that was executed (single-cycle runs)
+    cycle_codes: List[int] = []  # All cycles executed; rows carry their cycle in cycle_cde
     generated_at: datetime
     row_count: int
     columns: List[str]  # List of calculation names
     data: List[ReportRow]
     execution_time_ms: Optional[float] = None
+    timings: Optional[ExecutionTimings] = None  # Only when requested with include_timings
 
 class ReportTemplateResponse(BaseModel):
     """Response model for report template metadata (no cycle_code)"""
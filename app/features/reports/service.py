@@ -2,19 +2,39 @@
 """Refactored report service using unified query engine"""
 
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from datetime import datetime
 import time
 
+from app.core.concurrency import db_bound, run_in_db_executor
 from app.core.exceptions import ReportGenerationError
+from app.core.instrumentation import ExecutionProfile, activate_profile, iter_profiled, phase, profile_execution
+from app.core.metrics import (
+    REPORT_EXECUTION_DURATION, REPORT_EXECUTION_ROWS, REPORT_EXECUTIONS_IN_FLIGHT, REPORT_EXECUTIONS_COALESCED,
+    track_in_flight
+)
 from app.features.calculations.models import Calculation
 from app.shared.query_engine import QueryEngine
+from app.shared.result_cache import estimate_result_size, result_cache
+from app.shared.single_flight import report_single_flight
 from .models import Report, ReportDeal, ReportTranche, ReportCalculation, ReportExecutionLog
 from .schemas import (
-    ReportCreateRequest, ReportUpdateRequest, ReportExecuteRequest,
-    ReportResponse, ReportTemplateResponse, ReportTemplateDetailResponse
+    ReportCreateRequest, ReportUpdateRequest, ReportExecuteRequest, ReportOutputFormat, ReportExportFormat,
+    ReportResponse, ReportTemplateResponse, ReportTemplateDetailResponse, ExecutionTimings
 )
-from .dao import ReportDAO
+from .dao import ReportDAO, ReportExecutionPlan
+from .exporters import build_arrow_table, iter_csv, iter_ndjson, render_arrow_table
+
+@dataclass(frozen=True)
+class PreparedExecution:
+    """A report execution resolved up to the result cache lookup"""
+    plan: ReportExecutionPlan
+    cycle_codes: List[int]
+    calculations: List[Calculation]
+    cache_key: tuple
+    cached_response: Optional[ReportResponse]
 
 class ReportService:
     """Streamlined report service using unified query engine"""
@@ -24,7 +44,8 @@ class ReportService:
         self.query_engine = query_engine
         self.dao = ReportDAO(config_db)
     
-    async def create_report_template(self, request: ReportCreateRequest, user_id: str = "api_user") -> ReportTemplateDetailResponse:
+    @db_bound
+    def create_report_template(self, request: ReportCreateRequest, user_id: str = "api_user") -> ReportTemplateDetailResponse:
         """Create a new report template"""
         
         # Validate calculations exist using query engine
@@ -72,66 +93,42 @@ class ReportService:
         self.config_db.commit()
         self.config_db.refresh(report)
         
-        return await self.get_report_template_detail(report.id)
+        return self._build_template_detail(report.id)
     
-    async def get_report_templates(self) -> List[ReportTemplateResponse]:
+    @db_bound
+    def get_report_templates(self) -> List[ReportTemplateResponse]:
         """Get list of all report templates with execution history"""
-        reports = self.config_db.query(Report).filter(Report.is_active == True).all()
-        
-        result = []
-        for report in reports:
-            # Get most recent execution
-            last_execution = self.config_db.query(ReportExecutionLog)\
-                .filter(ReportExecutionLog.report_id == report.id)\
-                .order_by(ReportExecutionLog.executed_at.desc())\
-                .first()
-            
-            result.append(ReportTemplateResponse(
-                id=report.id,
-                name=report.name,
-                description=report.description,
-                aggregation_level=report.aggregation_level,
-                deal_count=len(report.report_deals),
-                tranche_count=len(report.report_tranches),
-                calculation_count=len(report.report_calculations),
-                last_executed_cycle=last_execution.cycle_code if last_execution else None,
-                created_at=report.created_at,
-                updated_at=report.updated_at,
-                created_by=report.created_by
-            ))
-        
-        return result
+        return [
+            ReportTemplateResponse(
+                id=row.Report.id,
+                name=row.Report.name,
+                description=row.Report.description,
+                aggregation_level=row.Report.aggregation_level,
+                deal_count=row.deal_count,
+                tranche_count=row.tranche_count,
+                calculation_count=row.calculation_count,
+                last_executed_cycle=row.last_executed_cycle,
+                created_at=row.Report.created_at,
+                updated_at=row.Report.updated_at,
+                created_by=row.Report.created_by
+            )
+            for row in self.dao.get_template_summaries()
+        ]
     
-    async def get_report_template_detail(self, report_id: int) -> ReportTemplateDetailResponse:
+    @db_bound
+    def get_report_template_detail(self, report_id: int) -> ReportTemplateDetailResponse:
         """Get detailed report template configuration"""
-        report = self.config_db.query(Report).filter(
-            Report.id == report_id,
-            Report.is_active == True
-        ).first()
+        return self._build_template_detail(report_id)
+    
+    def _build_template_detail(self, report_id: int) -> ReportTemplateDetailResponse:
+        """Build the template detail response (runs on the calling executor thread)"""
+        plan = self.dao.get_execution_plan(report_id)
         
-        if not report:
+        if not plan:
             raise ReportGenerationError(f"Report template {report_id} not found")
         
-        # Get selected deals, tranches, and calculations
-        deal_numbers = [rd.deal_number for rd in report.report_deals]
-        tranche_ids = list(set(rt.tranche_id for rt in report.report_tranches))
-        
-        # Get calculations ordered by display_order
-        report_calculations = self.config_db.query(ReportCalculation).filter(
-            ReportCalculation.report_id == report_id
-        ).order_by(ReportCalculation.display_order).all()
-        
-        calculation_names = []
-        for rc in report_calculations:
-            calc = self.config_db.query(Calculation).filter(Calculation.id == rc.calculation_id).first()
-            if calc:
-                calculation_names.append(calc.name)
-        
         # Get recent executions
-        recent_executions = self.config_db.query(ReportExecutionLog)\
-            .filter(ReportExecutionLog.report_id == report_id)\
-            .order_by(ReportExecutionLog.executed_at.desc())\
-            .limit(5).all()
+        recent_executions = self.dao.get_execution_logs(report_id, limit=5)
         
         recent_exec_data = [
             {
@@ -145,20 +142,21 @@ class ReportService:
         ]
         
         return ReportTemplateDetailResponse(
-            id=report.id,
-            name=report.name,
-            description=report.description,
-            aggregation_level=report.aggregation_level,
-            selected_deals=deal_numbers,
-            selected_tranches=tranche_ids,
-            selected_calculations=calculation_names,
+            id=plan.report_id,
+            name=plan.name,
+            description=plan.description,
+            aggregation_level=plan.aggregation_level,
+            selected_deals=list(plan.deal_numbers),
+            selected_tranches=list(plan.tranche_ids),
+            selected_calculations=plan.calculation_names,
             recent_executions=recent_exec_data,
-            created_at=report.created_at,
-            updated_at=report.updated_at,
-            created_by=report.created_by
+            created_at=plan.created_at,
+            updated_at=plan.updated_at,
+            created_by=plan.created_by
         )
     
-    async def update_report_template(self, report_id: int, request: ReportUpdateRequest) -> ReportTemplateDetailResponse:
+    @db_bound
+    def update_report_template(self, report_id: int, request: ReportUpdateRequest) -> ReportTemplateDetailResponse:
         """Update an existing report template"""
         report = self.config_db.query(Report).filter(
             Report.id == report_id,
@@ -218,131 +216,337 @@ class ReportService:
         self.config_db.commit()
         self.config_db.refresh(report)
         
-        return await self.get_report_template_detail(report_id)
+        # Template inputs changed; drop any cached results for it
+        result_cache.invalidate_report(report_id)
+        
+        return self._build_template_detail(report_id)
     
     async def execute_report(self, report_id: int, request: ReportExecuteRequest, user_id: str = "api_user") -> ReportResponse:
-        """Execute a report template using unified query engine"""
-        start_time = time.time()
-        
-        try:
-            # Load report template
-            report = self.config_db.query(Report).filter(
-                Report.id == report_id,
-                Report.is_active == True
-            ).first()
-            
-            if not report:
-                raise ReportGenerationError(f"Report template {report_id} not found")
-            
-            # Get report configuration
-            deal_numbers = [rd.deal_number for rd in report.report_deals]
-            tranche_ids = [rt.tranche_id for rt in report.report_tranches]
-            cycle_code = request.cycle_code
-            
-            # Load calculations ordered by display_order
-            report_calculations = self.config_db.query(ReportCalculation).filter(
-                ReportCalculation.report_id == report_id
-            ).order_by(ReportCalculation.display_order).all()
-            
-            calculations = []
-            for rc in report_calculations:
-                calc = self.config_db.query(Calculation).filter(Calculation.id == rc.calculation_id).first()
-                if calc:
-                    calculations.append(calc)
+        """Execute a report template using unified query engine.
+        
+        Loading the plan, the result cache lookup and logging run on the database
+        executor; identical executions already in flight are coalesced on the
+        event loop, so only one of them occupies an executor thread.
+        """
+        with track_in_flight(), profile_execution() as profile:
+            start_time = time.time()
+            # Fallback for failure logging until a cycle range is resolved
+            cycle_codes = request.explicit_cycle_codes or [request.cycle_start]
             
-            # Execute report using unified query engine
-            results = self.query_engine.execute_report_query(
-                deal_numbers=deal_numbers,
-                tranche_ids=tranche_ids,
-                cycle_code=cycle_code,
-                calculations=calculations,
-                aggregation_level=report.aggregation_level
+            try:
+                prepared = await run_in_db_executor(self._prepare_execution, report_id, request)
+                cycle_codes = prepared.cycle_codes
+                response = prepared.cached_response
+                
+                if response is None:
+                    wait_started = time.perf_counter()
+                    response, coalesced = await report_single_flight.do(
+                        prepared.cache_key, lambda: run_in_db_executor(self._compute_report, prepared)
+                    )
+                    if coalesced:
+                        REPORT_EXECUTIONS_COALESCED.inc()
+                        profile.add_phase("coalesced_wait", (time.perf_counter() - wait_started) * 1000)
+                
+                execution_time = (time.time() - start_time) * 1000
+                timings = self._get_timings(profile, request)
+                
+                # Log successful execution
+                await run_in_db_executor(
+                    self._write_execution_log,
+                    report_id=report_id,
+                    cycle_codes=cycle_codes,
+                    executed_by=user_id,
+                    execution_time_ms=execution_time,
+                    row_counts=self._count_rows_by_cycle(row.cycle_cde for row in response.data),
+                    success=True,
+                    profile=profile
+                )
+                
+                return response.model_copy(update={"execution_time_ms": execution_time, "timings": timings})
+                
+            except Exception as e:
+                execution_time = (time.time() - start_time) * 1000
+                
+                # Log failed execution
+                await run_in_db_executor(
+                    self._write_execution_log,
+                    report_id=report_id,
+                    cycle_codes=cycle_codes,
+                    executed_by=user_id,
+                    execution_time_ms=execution_time,
+                    row_counts={},
+                    success=False,
+                    error_message=str(e),
+                    profile=profile
+                )
+                
+                raise ReportGenerationError(f"Report execution failed: {str(e)}")
+    
+    def _prepare_execution(self, report_id: int, request: ReportExecuteRequest) -> PreparedExecution:
+        """Load the plan, resolve cycles and look the execution up in the result cache"""
+        with phase("load_plan"):
+            plan = self.dao.get_execution_plan(report_id)
+        
+        if not plan:
+            raise ReportGenerationError(f"Report template {report_id} not found")
+        
+        with phase("resolve_cycles"):
+            cycle_codes = self._resolve_cycle_codes(request)
+        calculations = list(plan.calculations)
+        
+        # Serve closed-cycle results from the result cache when inputs are unchanged
+        with phase("cache_lookup"):
+            cache_key = (
+                report_id,
+                tuple(cycle_codes),
+                plan.aggregation_level,
+                tuple(calc.get_version_key() for calc in calculations),
+                plan.deal_numbers,
+                plan.tranche_ids
             )
-            
-            # Process results using query engine
+            cached_response = result_cache.get(cache_key)
+        
+        return PreparedExecution(plan, cycle_codes, calculations, cache_key, cached_response)
+    
+    def _compute_report(self, prepared: PreparedExecution) -> ReportResponse:
+        """Run the report query, build the response and store it in the result cache"""
+        plan, cycle_codes, calculations = prepared.plan, prepared.cycle_codes, prepared.calculations
+        # Execute report using unified query engine
+        results = self.query_engine.execute_report_query(
+            deal_numbers=list(plan.deal_numbers),
+            tranche_ids=list(plan.tranche_ids),
+            cycle_codes=cycle_codes,
+            calculations=calculations,
+            aggregation_level=plan.aggregation_level
+        )
+        
+        # Process results using query engine
+        with phase("process_rows"):
             data = self.query_engine.process_report_results(
                 results=results,
                 calculations=calculations,
-                aggregation_level=report.aggregation_level
+                aggregation_level=plan.aggregation_level
+            )
+        
+        with phase("build_response"):
+            response = ReportResponse(
+                report_id=plan.report_id,
+                report_name=plan.name,
+                aggregation_level=plan.aggregation_level,
+                cycle_code=cycle_codes[0] if len(cycle_codes) == 1 else None,
+                cycle_codes=cycle_codes,
+                generated_at=datetime.now(),
+                row_count=len(data),
+                columns=[calc.name for calc in calculations],
+                data=data
             )
             
+            result_cache.put(
+                prepared.cache_key,
+                response,
+                size=estimate_result_size(len(data), len(calculations)),
+                report_id=plan.report_id,
+                cycle_codes=cycle_codes,
+                calculation_ids=[calc.id for calc in calculations]
+            )
+        
+        return response
+    
+    @db_bound
+    def execute_report_columnar(
+        self,
+        report_id: int,
+        request: ReportExecuteRequest,
+        user_id: str = "api_user"
+    ) -> Dict[str, Any]:
+        """Execute a report template and return a columnar payload.
+        
+        ``header`` names every column and ``data`` holds one array per column in
+        the same order, built directly from the result cursor without per-row
+        models.
+        """
+        plan = self.dao.get_execution_plan(report_id)
+        
+        if not plan:
+            raise ReportGenerationError(f"Report template {report_id} not found")
+        
+        cycle_codes = self._resolve_cycle_codes(request)
+        header, columns, execution_time = self._execute_columns(plan, cycle_codes, user_id)
+        
+        return {
+            "report_id": report_id,
+            "report_name": plan.name,
+            "aggregation_level": plan.aggregation_level,
+            "cycle_code": cycle_codes[0] if len(cycle_codes) == 1 else None,
+            "cycle_codes": cycle_codes,
+            "generated_at": datetime.now().isoformat(),
+            "row_count": len(columns[0]) if columns else 0,
+            "columns": plan.calculation_names,
+            "header": header,
+            "data": columns,
+            "execution_time_ms": execution_time
+        }
+    
+    @db_bound
+    def export_report(
+        self,
+        report_id: int,
+        cycle_code: int,
+        export_format: ReportExportFormat,
+        user_id: str = "api_user"
+    ) -> bytes:
+        """Execute a report template and serialize it as an Arrow IPC stream or Parquet file"""
+        plan = self.dao.get_execution_plan(report_id)
+        
+        if not plan:
+            raise ReportGenerationError(f"Report template {report_id} not found")
+        
+        header, columns, _ = self._execute_columns(plan, [cycle_code], user_id)
+        
+        table = build_arrow_table(header, columns, list(plan.calculations), plan.aggregation_level)
+        return render_arrow_table(table, export_format)
+    
+    def _execute_columns(self, plan: ReportExecutionPlan, cycle_codes: List[int], user_id: str):
+        """Execute a plan into (header, column arrays, execution time ms), logging the execution"""
+        start_time = time.time()
+        
+        with track_in_flight(), profile_execution() as profile:
+            try:
+                header, columns = self.query_engine.execute_report_columns(
+                    deal_numbers=list(plan.deal_numbers),
+                    tranche_ids=list(plan.tranche_ids),
+                    cycle_codes=cycle_codes,
+                    calculations=list(plan.calculations),
+                    aggregation_level=plan.aggregation_level
+                )
+            except Exception as e:
+                self._write_execution_log(
+                    report_id=plan.report_id,
+                    cycle_codes=cycle_codes,
+                    executed_by=user_id,
+                    execution_time_ms=(time.time() - start_time) * 1000,
+                    row_counts={},
+                    success=False,
+                    error_message=str(e),
+                    profile=profile
+                )
+                raise ReportGenerationError(f"Report execution failed: {str(e)}")
+            
             execution_time = (time.time() - start_time) * 1000
             
-            # Log successful execution
-            await self._log_execution(
-                report_id=report_id,
-                cycle_code=cycle_code,
+            self._write_execution_log(
+                report_id=plan.report_id,
+                cycle_codes=cycle_codes,
                 executed_by=user_id,
                 execution_time_ms=execution_time,
-                row_count=len(data),
-                success=True
+                row_counts=self._count_rows_by_cycle(columns[header.index("cycle_cde")]),
+                success=True,
+                profile=profile
             )
+        
+        return header, columns, execution_time
+    
+    @db_bound
+    def stream_report(
+        self,
+        report_id: int,
+        request: ReportExecuteRequest,
+        output_format: ReportOutputFormat,
+        user_id: str = "api_user"
+    ) -> Iterator[str]:
+        """Execute a report template, streaming serialized rows as NDJSON or CSV.
+        
+        Rows are pulled from the data warehouse cursor in chunks and serialized as
+        they arrive, so memory stays flat regardless of result size. Streamed
+        executions bypass the result cache.
+        """
+        profile = ExecutionProfile()
+        with activate_profile(profile):
+            with phase("load_plan"):
+                plan = self.dao.get_execution_plan(report_id)
             
-            return ReportResponse(
-                report_id=report_id,
-                report_name=report.name,
-                aggregation_level=report.aggregation_level,
-                cycle_code=cycle_code,
-                generated_at=datetime.now(),
-                row_count=len(data),
-                columns=[calc.name for calc in calculations],
-                data=data,
-                execution_time_ms=execution_time
+            if not plan:
+                raise ReportGenerationError(f"Report template {report_id} not found")
+            
+            with phase("resolve_cycles"):
+                cycle_codes = self._resolve_cycle_codes(request)
+        return self._stream_report_rows(plan, cycle_codes, output_format, user_id, profile)
+    
+    def _stream_report_rows(
+        self,
+        plan: ReportExecutionPlan,
+        cycle_codes: List[int],
+        output_format: ReportOutputFormat,
+        user_id: str,
+        profile: ExecutionProfile
+    ) -> Iterator[str]:
+        """Generate serialized report chunks and log the execution, with its profile, once streaming ends"""
+        start_time = time.time()
+        row_counts = Counter()
+        error_message = None
+        
+        def counted(records):
+            for record in records:
+                row_counts[record["cycle_cde"]] += 1
+                yield record
+        
+        def chunks():
+            rows = self.query_engine.stream_report_query(
+                deal_numbers=list(plan.deal_numbers),
+                tranche_ids=list(plan.tranche_ids),
+                cycle_codes=cycle_codes,
+                calculations=list(plan.calculations),
+                aggregation_level=plan.aggregation_level
             )
+            records = counted(self.query_engine.iter_report_records(
+                rows, plan.calculations, plan.aggregation_level
+            ))
             
+            if output_format == ReportOutputFormat.csv:
+                yield from iter_csv(records, plan.calculation_names, plan.aggregation_level)
+            else:
+                yield from iter_ndjson(records)
+        
+        REPORT_EXECUTIONS_IN_FLIGHT.inc()
+        try:
+            yield from iter_profiled(chunks(), profile)
         except Exception as e:
-            execution_time = (time.time() - start_time) * 1000
-            
-            # Log failed execution
-            await self._log_execution(
-                report_id=report_id,
-                cycle_code=request.cycle_code,
+            error_message = str(e)
+            raise
+        finally:
+            REPORT_EXECUTIONS_IN_FLIGHT.dec()
+            self._write_execution_log(
+                report_id=plan.report_id,
+                cycle_codes=cycle_codes,
                 executed_by=user_id,
-                execution_time_ms=execution_time,
-                row_count=0,
-                success=False,
-                error_message=str(e)
+                execution_time_ms=(time.time() - start_time) * 1000,
+                row_counts=row_counts,
+                success=error_message is None,
+                error_message=error_message,
+                profile=profile
             )
-            
-            raise ReportGenerationError(f"Report execution failed: {str(e)}")
     
-    async def preview_report_sql(self, report_id: int, cycle_code: int) -> Dict[str, Any]:
-        """Preview SQL using unified query engine"""
-        # Load report template
-        report = self.config_db.query(Report).filter(
-            Report.id == report_id,
-            Report.is_active == True
-        ).first()
+    @db_bound
+    def preview_report_sql(self, report_id: int, cycle_code: int, explain: bool = False) -> Dict[str, Any]:
+        """Preview SQL using unified query engine, optionally with SQLite's query plan"""
+        plan = self.dao.get_execution_plan(report_id)
         
-        if not report:
+        if not plan:
             raise ReportGenerationError(f"Report template {report_id} not found")
         
-        # Get report configuration
-        deal_numbers = [rd.deal_number for rd in report.report_deals]
-        tranche_ids = list(set(rt.tranche_id for rt in report.report_tranches))
-        
-        # Load calculations ordered by display_order
-        report_calculations = self.config_db.query(ReportCalculation).filter(
-            ReportCalculation.report_id == report_id
-        ).order_by(ReportCalculation.display_order).all()
-        
-        calculations = []
-        for rc in report_calculations:
-            calc = self.config_db.query(Calculation).filter(Calculation.id == rc.calculation_id).first()
-            if calc:
-                calculations.append(calc)
-        
         # Use unified query engine for preview
         return self.query_engine.preview_report_sql(
-            report_name=report.name,
-            aggregation_level=report.aggregation_level,
-            deal_numbers=deal_numbers,
-            tranche_ids=tranche_ids,
+            report_name=plan.name,
+            aggregation_level=plan.aggregation_level,
+            deal_numbers=list(plan.deal_numbers),
+            tranche_ids=list(plan.tranche_ids),
             cycle_code=cycle_code,
-            calculations=calculations
+            calculations=list(plan.calculations),
+            explain=explain
         )
 
-    async def get_execution_logs(self, report_id: int, limit: int = 50) -> List[dict]:
+    @db_bound
+    def get_execution_logs(self, report_id: int, limit: int = 50) -> List[dict]:
         """Get execution logs for a report template"""
         report = self.config_db.query(Report).filter(
             Report.id == report_id,
@@ -363,36 +567,80 @@ class ReportService:
                 "row_count": log.row_count,
                 "success": log.success,
                 "error_message": log.error_message,
+                "phase_timings": log.phase_timings,
+                "statement_count": log.statement_count,
+                "sql_time_ms": log.sql_time_ms,
                 "executed_at": log.executed_at
             }
             for log in logs
         ]
     
-    async def _log_execution(
+    def _write_execution_log(
         self,
         report_id: int,
-        cycle_code: int,
+        cycle_codes: List[int],
         executed_by: str,
         execution_time_ms: float,
-        row_count: int,
+        row_counts: Dict[int, int],
         success: bool,
-        error_message: str = None
+        error_message: str = None,
+        profile: Optional[ExecutionProfile] = None
     ):
-        """Log report execution"""
-        log_entry = ReportExecutionLog(
-            report_id=report_id,
-            cycle_code=cycle_code,
-            executed_by=executed_by,
-            execution_time_ms=execution_time_ms,
-            row_count=row_count,
-            success=success,
-            error_message=error_message
-        )
+        """Persist report execution log entries, one per executed cycle, and record execution metrics"""
+        # Snapshot before the log writes themselves are counted
+        timings = profile.to_dict() if profile else {}
+        
+        REPORT_EXECUTION_DURATION.observe(execution_time_ms / 1000, str(report_id), str(success).lower())
+        if success:
+            REPORT_EXECUTION_ROWS.observe(sum(row_counts.values()), str(report_id))
+        
+        for cycle_code in cycle_codes:
+            self.config_db.add(ReportExecutionLog(
+                report_id=report_id,
+                cycle_code=cycle_code,
+                executed_by=executed_by,
+                execution_time_ms=execution_time_ms,
+                row_count=row_counts.get(cycle_code, 0),
+                success=success,
+                error_message=error_message,
+                phase_timings=timings.get("phases"),
+                statement_count=timings.get("statement_count"),
+                sql_time_ms=timings.get("sql_time_ms")
+            ))
         
-        self.config_db.add(log_entry)
         self.config_db.commit()
     
-    async def delete_report_template(self, report_id: int) -> dict:
+    @db_bound
+    def resolve_cycle_codes(self, request: ReportExecuteRequest) -> List[int]:
+        """Get the sorted cycle codes an execution request covers"""
+        return self._resolve_cycle_codes(request)
+    
+    def _resolve_cycle_codes(self, request: ReportExecuteRequest) -> List[int]:
+        """Get the sorted cycle codes a request covers, resolving ranges against the warehouse"""
+        if not request.is_cycle_range:
+            return request.explicit_cycle_codes
+        
+        cycle_codes = self.query_engine.get_cycles_between(request.cycle_start, request.cycle_end)
+        if not cycle_codes:
+            raise ReportGenerationError(
+                f"No cycles found between {request.cycle_start} and {request.cycle_end}"
+            )
+        return cycle_codes
+    
+    @staticmethod
+    def _get_timings(profile: ExecutionProfile, request: ReportExecuteRequest) -> Optional[ExecutionTimings]:
+        """Get the response timing breakdown when the request asked for it"""
+        if not request.include_timings:
+            return None
+        return ExecutionTimings(**profile.to_dict())
+    
+    @staticmethod
+    def _count_rows_by_cycle(cycles: Iterable[int]) -> Dict[int, int]:
+        """Count result rows per cycle code"""
+        return Counter(cycles)
+    
+    @db_bound
+    def delete_report_template(self, report_id: int) -> dict:
         """Delete a report template (soft delete)"""
         report = self.config_db.query(Report).filter(
             Report.id == report_id,
@@ -405,5 +653,6 @@ class ReportService:
         # Soft delete
         report.is_active = False
         self.config_db.commit()
+        result_cache.invalidate_report(report_id)
         
         return {"message": f"Report template '{report.name}' deleted successfully"}
\ No newline at end of file
@@ -3,12 +3,20 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 
+from app.core import metrics
+from app.core.database import DWSessionLocal, DWWriteSessionLocal, ConfigSessionLocal
+from app.shared.result_cache import result_cache
+from app.shared.statement_cache import statement_cache
+
 # Import refactored feature routers
 from app.features.reports.router import router as reports_router
 from app.features.calculations.router import router as calculations_router
 from app.features.datawarehouse.router import router as datawarehouse_router
+from app.features.jobs.router import router as jobs_router
+from app.features.jobs.worker import job_runner
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -22,7 +30,9 @@ async def lifespan(app: FastAPI):
             create_dw_tables, 
             create_config_tables, 
             seed_sample_data, 
-            seed_default_calculations
+            seed_default_calculations,
+            register_loaded_cycles,
+            build_missing_rollups
         )
         
         # Create database tables
@@ -38,6 +48,15 @@ async def lifespan(app: FastAPI):
         await seed_default_calculations()
         print("✅ Default calculations seeded")
         
+        # Register loaded cycles and build deal rollups for cycles that lack them
+        await register_loaded_cycles()
+        await build_missing_rollups()
+        print("✅ Deal rollups up to date")
+        
+        # Start report job workers, requeueing jobs interrupted by a restart
+        await job_runner.start()
+        print(f"✅ Report job workers started ({job_runner.queued_count} jobs queued)")
+        
         print("🚀 Refactored application startup complete!")
         
     except Exception as e:
@@ -47,6 +66,10 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    await job_runner.stop()
+    from app.core.concurrency import shutdown_db_executor, shutdown_parallel_executor
+    shutdown_db_executor()
+    shutdown_parallel_executor()
     print("Application shutdown")
 
 # Create FastAPI application
@@ -66,10 +89,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time every request by route template for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
+metrics.register_cache_metrics({
+    "result": result_cache.stats,
+    "statement": statement_cache.stats,
+})
+metrics.register_pool_metrics({
+    "dw": lambda: DWSessionLocal.kw["bind"].pool,
+    "dw_write": lambda: DWWriteSessionLocal.kw["bind"].pool,
+    "config": lambda: ConfigSessionLocal.kw["bind"].pool,
+})
+
 # Include refactored feature routers
 app.include_router(reports_router, prefix="/api/reports", tags=["reports"])
 app.include_router(calculations_router, prefix="/api/calculations", tags=["calculations"])
 app.include_router(datawarehouse_router, prefix="/api/datawarehouse", tags=["datawarehouse"])
+app.include_router(jobs_router, prefix="/api/jobs", tags=["jobs"])
 
 # Health check endpoint
 @app.get("/health")
@@ -77,6 +114,11 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "Refactored reporting system is running"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Metrics in the Prometheus text exposition format"""
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -85,10 +127,12 @@ async def root():
         "version": "2.0.0",
         "docs_url": "/docs",
         "health_url": "/health",
+        "metrics_url": "/metrics",
         "features": [
             "template-based reports", 
             "orm-based calculations", 
-            "datawarehouse access"
+            "datawarehouse access",
+            "background report jobs"
         ],
         "key_improvements": [
             "ORM queries instead of raw SQL",
@@ -5,6 +5,7 @@ from .utils import sanitize_identifier, validate_required_fields, format_executi
 from .constants import (
     AggregationLevel, 
     AggregationMethod, 
+    QueryPlan,
     SourceTable, 
     DEFAULT_API_USER,
     DEFAULT_DW_DATABASE_PATH,
@@ -17,6 +18,7 @@ __all__ = [
     "format_execution_time",
     "AggregationLevel",
     "AggregationMethod",
+    "QueryPlan",
     "SourceTable", 
     "DEFAULT_API_USER",
     "DEFAULT_DW_DATABASE_PATH",
@@ -17,6 +17,17 @@ class AggregationMethod(str, Enum):
     MAX = "MAX"
     WEIGHTED_AVG = "WEIGHTED_AVG"
 
+class QueryPlan(str, Enum):
+    """Query plan strategies for consolidated report queries"""
+    GROUPED = "grouped"                  # One GROUP BY per source model / group level
+    PER_CALCULATION = "per_calculation"  # One subquery per calculation (fallback)
+    ROLLUP = "rollup"                    # Answered from per-(deal, cycle) rollups
+
+class FilterStrategy(str, Enum):
+    """How a report's deal/tranche selection reaches the consolidated query"""
+    IN_LIST = "in_list"        # Values bound into IN (...) lists
+    TEMP_TABLE = "temp_table"  # Values loaded once into session temp tables
+
 class SourceTable(str, Enum):
     """Available source tables in the data warehouse"""
     DEAL = "deal d"
@@ -32,4 +43,7 @@ DEFAULT_CONFIG_DATABASE_PATH = "./config.db"
 
 # Execution logging settings
 MAX_ERROR_MESSAGE_LENGTH = 1000
-DEFAULT_EXECUTION_TIMEOUT_MS = 30000  # 30 seconds
\ No newline at end of file
+DEFAULT_EXECUTION_TIMEOUT_MS = 30000  # 30 seconds
+
+# Streaming settings
+DEFAULT_STREAM_CHUNK_SIZE = 1000  # Rows fetched per cursor round-trip and flushed per response chunk
\ No newline at end of file
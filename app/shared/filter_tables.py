@@ -0,0 +1,62 @@
+# app/shared/filter_tables.py
+"""Session temp tables holding a report's deal/tranche selection.
+
+The deal and tranche filters are repeated in the outer query and in every
+calculation subquery. For large selections they are loaded once into temp
+tables on the executing connection and the statement filters with
+``IN (SELECT ...)`` against them, which keeps the SQL small and independent of
+the selection size (and clear of SQLite's bound-variable limit).
+
+Temp tables live in the connection's temp schema (in memory with the default
+``temp_store``), so they never write to the warehouse file; ``query_only`` is
+lifted only while they are filled.
+"""
+
+import os
+from typing import List
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.orm import Session
+from app.shared.constants import FilterStrategy
+
+# Selected deals + tranches from which the selection is loaded into temp tables
+DW_TEMP_FILTER_THRESHOLD = int(os.getenv("DW_TEMP_FILTER_THRESHOLD", "1000"))
+
+_metadata = MetaData()
+
+filter_deals = Table(
+    "report_filter_deals", _metadata,
+    Column("dl_nbr", Integer, primary_key=True),
+    prefixes=["TEMPORARY"]
+)
+
+filter_tranches = Table(
+    "report_filter_tranches", _metadata,
+    Column("tr_id", String(15), primary_key=True),
+    prefixes=["TEMPORARY"]
+)
+
+def resolve_filter_strategy(deal_numbers: List[int], tranche_ids: List[str]) -> FilterStrategy:
+    """Use temp tables once the selection reaches the configured size"""
+    if len(deal_numbers) + len(tranche_ids) >= DW_TEMP_FILTER_THRESHOLD:
+        return FilterStrategy.TEMP_TABLE
+    return FilterStrategy.IN_LIST
+
+def load_filter_tables(session: Session, deal_numbers: List[int], tranche_ids: List[str]):
+    """Replace the filter temp tables' contents on the session's connection"""
+    connection = session.connection()
+    query_only = connection.exec_driver_sql("PRAGMA query_only").scalar()
+    if query_only:
+        connection.exec_driver_sql("PRAGMA query_only=OFF")
+    
+    try:
+        for table, column, values in (
+            (filter_deals, "dl_nbr", deal_numbers),
+            (filter_tranches, "tr_id", tranche_ids)
+        ):
+            table.create(connection, checkfirst=True)
+            connection.execute(table.delete())
+            if values:
+                connection.execute(table.insert(), [{column: value} for value in set(values)])
+    finally:
+        if query_only:
+            connection.exec_driver_sql("PRAGMA query_only=ON")
@@ -0,0 +1,150 @@
+# app/shared/parallel_query.py
+"""Parallel execution of consolidated report queries.
+
+SQLite evaluates one statement on one core, so a wide report (many calculation
+subqueries) runs serially however many cores the host has. Here the
+calculations of one report are split into partitions; each partition's
+consolidated statement runs on its own read-only DW connection on the parallel
+executor, and the partial rows are merged on the report grain keys (deal,
+[tranche,] cycle). Threads are enough: sqlite3 releases the GIL while a
+statement steps.
+
+Every partial statement carries the same row skeleton and filters, so every
+partition returns the same set of keys; each partition only contributes its own
+calculation columns.
+
+Very large deal selections are additionally sharded: the selected deals are cut
+into contiguous ranges of roughly equal estimated row counts, each shard runs
+the same statement with its own deal filter, and shard results are
+concatenated in deal order.
+"""
+
+import contextvars
+import math
+import os
+from typing import Any, Callable, Dict, List, Sequence, TypeVar
+from sqlalchemy.orm import Session
+from app.core.concurrency import get_parallel_executor
+from app.features.calculations.models import Calculation
+
+# Below this many calculations the repeated row skeleton costs more than it saves
+DW_PARALLEL_MIN_CALCULATIONS = int(os.getenv("DW_PARALLEL_MIN_CALCULATIONS", "8"))
+# Deal selections smaller than this are never sharded
+DW_SHARD_MIN_DEALS = int(os.getenv("DW_SHARD_MIN_DEALS", "500"))
+# Fewest estimated balance rows worth a shard of their own
+DW_SHARD_MIN_ROWS = int(os.getenv("DW_SHARD_MIN_ROWS", "50000"))
+
+T = TypeVar("T")
+
+
+class MergedRow(tuple):
+    """Result row with attribute access by column label, like a SQLAlchemy Row"""
+    __slots__ = ()
+    _index: Dict[str, int] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def make_row_type(fields: Sequence[str]) -> type:
+    """Get a MergedRow subclass for the given column labels"""
+    index = {name: position for position, name in enumerate(fields)}
+    return type("MergedRow", (MergedRow,), {"__slots__": (), "_index": index})
+
+
+def partition_calculations(
+    groups: List[List[Calculation]],
+    workers: int
+) -> List[List[Calculation]]:
+    """Balance calculation groups over at most ``workers`` partitions.
+
+    Groups are kept together where possible (they share one aggregation pass);
+    groups larger than an even share are split so a report made of one big
+    group still spreads across workers.
+    """
+    calculation_count = sum(len(group) for group in groups)
+    if workers < 2 or calculation_count < max(DW_PARALLEL_MIN_CALCULATIONS, 2):
+        return [[calc for group in groups for calc in group]]
+
+    share = math.ceil(calculation_count / workers)
+    units = [group[start:start + share] for group in groups for start in range(0, len(group), share)]
+
+    # Largest units first, each into the currently smallest partition
+    partitions: List[List[Calculation]] = [[] for _ in range(min(workers, len(units)))]
+    for unit in sorted(units, key=len, reverse=True):
+        min(partitions, key=len).extend(unit)
+    return partitions
+
+
+def shard_deals(
+    deal_numbers: List[int],
+    row_estimates: Dict[int, int],
+    workers: int
+) -> List[List[int]]:
+    """Cut the sorted deal selection into contiguous shards of similar estimated row counts.
+
+    The shard count grows with the estimated rows (one shard per
+    ``DW_SHARD_MIN_ROWS``) up to the number of workers.
+    """
+    deals = sorted(set(deal_numbers))
+    total_rows = sum(row_estimates.get(deal, 0) for deal in deals)
+    shard_count = min(workers, len(deals), total_rows // max(DW_SHARD_MIN_ROWS, 1))
+    if shard_count < 2:
+        return [deals]
+
+    target_rows = total_rows / shard_count
+    shards: List[List[int]] = [[]]
+    cumulative_rows = 0
+    for deal in deals:
+        if len(shards) < shard_count and shards[-1] and cumulative_rows >= target_rows * len(shards):
+            shards.append([])
+        shards[-1].append(deal)
+        cumulative_rows += row_estimates.get(deal, 0)
+    return shards
+
+
+def run_partitioned(dw_db: Session, tasks: List[Callable[[Session], T]]) -> List[T]:
+    """Run each task with its own DW session on the parallel executor; results in task order.
+
+    Sessions are bound to the caller's DW engine. The caller's context variables
+    are copied into each task, so statements are still counted by the active
+    execution profile.
+    """
+    bind = dw_db.get_bind()
+
+    def run(task: Callable[[Session], T]) -> T:
+        with Session(bind=bind) as session:
+            return task(session)
+
+    executor = get_parallel_executor()
+    futures = [executor.submit(contextvars.copy_context().run, run, task) for task in tasks]
+    return [future.result() for future in futures]
+
+
+def merge_partial_rows(
+    key_fields: Sequence[str],
+    partitions: List[List[Calculation]],
+    partials: List[List[Any]],
+    calculations: List[Calculation]
+) -> List[MergedRow]:
+    """Merge per-partition rows on their key columns into rows in consolidated statement order"""
+    key_count = len(key_fields)
+    row_type = make_row_type(list(key_fields) + [calc.name for calc in calculations])
+    positions = {calc.id: key_count + position for position, calc in enumerate(calculations)}
+
+    # Row order follows the first partition (dicts keep insertion order)
+    merged: Dict[tuple, List[Any]] = {}
+    for partition, rows in zip(partitions, partials):
+        slots = [positions[calc.id] for calc in partition]
+        for row in rows:
+            key = tuple(row[:key_count])
+            values = merged.get(key)
+            if values is None:
+                values = merged[key] = list(key) + [None] * len(calculations)
+            for slot, value in zip(slots, row[key_count:]):
+                values[slot] = value
+
+    return [row_type(values) for values in merged.values()]
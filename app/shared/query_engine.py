@@ -1,107 +1,376 @@
 # app/shared/query_engine.py
 """Unified query engine for calculations and reports - combines execution and preview"""
 
+import re
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, text
-from typing import List, Dict, Any, Optional, Tuple, Union
-from app.features.datawarehouse.models import Deal, Tranche, TrancheBal
-from app.features.calculations.models import Calculation
+from sqlalchemy import and_, bindparam, func, select, text
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+from app.features.datawarehouse.models import Deal, Tranche, TrancheBal, TrancheBalRollup
+from app.features.datawarehouse import rollups
+from app.features.datawarehouse.cycles import get_cycle_codes
+from app.features.calculations.models import Calculation, SourceModel, GroupLevel
+from app.core.concurrency import DW_PARALLEL_WORKERS
+from app.core.instrumentation import phase
+from app.shared.constants import FilterStrategy, QueryPlan, DEFAULT_STREAM_CHUNK_SIZE
+from app.shared.statement_cache import statement_cache
+from app.shared.filter_tables import filter_deals, filter_tranches, load_filter_tables, resolve_filter_strategy
+from app.shared.parallel_query import (
+    DW_SHARD_MIN_DEALS, merge_partial_rows, partition_calculations, run_partitioned, shard_deals
+)
+
+# EXPLAIN QUERY PLAN details worth flagging (SQLite < 3.36 prints "SCAN TABLE")
+EXPLAIN_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(tranchebal)\b")
+EXPLAIN_TEMP_BTREE = re.compile(r"^USE TEMP B-TREE FOR (.+)$")
 
 
 class QueryEngine:
     """Unified engine for all ORM query operations, execution, and SQL preview"""
     
+    default_plan = QueryPlan.GROUPED
+    parallel_workers = DW_PARALLEL_WORKERS
+    
     def __init__(self, dw_db: Session, config_db: Session):
         self.dw_db = dw_db
         self.config_db = config_db
     
     # Core Query Building
+    def build_consolidated_statement(
+        self,
+        calculations: List[Calculation],
+        aggregation_level: str,
+        plan: Optional[QueryPlan] = None,
+        filter_strategy: FilterStrategy = FilterStrategy.IN_LIST
+    ):
+        """Get the parameterized consolidated statement, served from the statement cache.
+        
+        Filters are expanding bind parameters named ``deal_numbers``, ``tranche_ids``
+        and ``cycle_codes``; see ``get_filter_params``. With the temp-table filter
+        strategy, deals and tranches are read from the filter temp tables instead
+        (see ``load_filters``) and only ``cycle_codes`` is bound.
+        """
+        plan = QueryPlan(plan or self.default_plan)
+        filter_strategy = FilterStrategy(filter_strategy)
+        cache_key = (
+            plan.value,
+            filter_strategy.value,
+            aggregation_level,
+            tuple(calc.get_version_key() for calc in calculations)
+        )
+        
+        return statement_cache.get_or_build(
+            cache_key,
+            lambda: self._build_consolidated_statement(calculations, aggregation_level, plan, filter_strategy)
+        )
+    
+    def _build_consolidated_statement(
+        self,
+        calculations: List[Calculation],
+        aggregation_level: str,
+        plan: QueryPlan,
+        filter_strategy: FilterStrategy
+    ):
+        """Build the consolidated statement with bind parameters in place of filter values"""
+        if filter_strategy == FilterStrategy.TEMP_TABLE:
+            deal_numbers = select(filter_deals.c.dl_nbr)
+            tranche_ids = select(filter_tranches.c.tr_id)
+        else:
+            deal_numbers = bindparam("deal_numbers", expanding=True)
+            tranche_ids = bindparam("tranche_ids", expanding=True)
+        cycle_codes = bindparam("cycle_codes", expanding=True)
+        
+        if plan == QueryPlan.ROLLUP:
+            return self._build_rollup_query(deal_numbers, cycle_codes, calculations)
+        
+        if plan == QueryPlan.PER_CALCULATION:
+            return self._build_per_calculation_query(
+                deal_numbers, tranche_ids, cycle_codes, calculations, aggregation_level
+            )
+        
+        return self._build_grouped_query(
+            deal_numbers, tranche_ids, cycle_codes, calculations, aggregation_level
+        )
+    
+    def resolve_plan(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        calculations: List[Calculation],
+        aggregation_level: str,
+        plan: Optional[QueryPlan] = None,
+        filter_strategy: FilterStrategy = FilterStrategy.IN_LIST
+    ) -> QueryPlan:
+        """Pick the query plan for an execution, preferring rollups when they can answer it.
+        
+        With the temp-table filter strategy the filters must already be loaded
+        into ``dw_db`` (see ``load_filters``).
+        """
+        if plan is not None:
+            return QueryPlan(plan)
+        if self._can_use_rollups(deal_numbers, tranche_ids, cycle_codes, calculations, aggregation_level, filter_strategy):
+            return QueryPlan.ROLLUP
+        return self.default_plan
+    
+    def _can_use_rollups(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        calculations: List[Calculation],
+        aggregation_level: str,
+        filter_strategy: FilterStrategy = FilterStrategy.IN_LIST
+    ) -> bool:
+        """Check whether deal rollups give the same answer as the raw balance rows.
+        
+        Requires a deal-level report of decomposable TrancheBal calculations, rollups
+        built for every requested cycle and measure, and a tranche selection covering
+        every tranche of the selected deals (rollups aggregate whole deals).
+        """
+        if not rollups.DW_ROLLUPS_ENABLED or aggregation_level != "deal" or not calculations:
+            return False
+        if not all(rollups.is_rollup_eligible(calc) for calc in calculations):
+            return False
+        
+        measures = [measure for calc in calculations for measure in rollups.get_calculation_measures(calc)]
+        if not rollups.has_rollups(self.dw_db, cycle_codes, measures):
+            return False
+        
+        deal_filter, tranche_filter = self._get_selection_filters(deal_numbers, tranche_ids, filter_strategy)
+        uncovered_tranche = self.dw_db.execute(
+            select(Tranche.dl_nbr)
+            .where(Tranche.dl_nbr.in_(deal_filter))
+            .where(Tranche.tr_id.not_in(tranche_filter))
+            .limit(1)
+        ).first()
+        return uncovered_tranche is None
+    
+    def _get_selection_filters(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        filter_strategy: FilterStrategy
+    ) -> Tuple[Any, Any]:
+        """Get the deal and tranche operands for IN filters of runtime probes"""
+        if filter_strategy == FilterStrategy.TEMP_TABLE:
+            return select(filter_deals.c.dl_nbr), select(filter_tranches.c.tr_id)
+        return deal_numbers, tranche_ids
+    
+    def get_filter_params(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        filter_strategy: FilterStrategy = FilterStrategy.IN_LIST
+    ) -> Dict[str, Any]:
+        """Get bind parameter values for a consolidated statement"""
+        if filter_strategy == FilterStrategy.TEMP_TABLE:
+            return {"cycle_codes": cycle_codes}
+        return {
+            "deal_numbers": list(deal_numbers),
+            "tranche_ids": list(tranche_ids),
+            "cycle_codes": cycle_codes
+        }
+    
     def build_consolidated_query(
         self, 
         deal_numbers: List[int], 
         tranche_ids: List[str], 
-        cycle_code: int, 
+        cycle_codes: List[int], 
         calculations: List[Calculation], 
-        aggregation_level: str
+        aggregation_level: str,
+        plan: Optional[QueryPlan] = None,
+        filter_strategy: FilterStrategy = FilterStrategy.IN_LIST
     ):
-        """Build the consolidated ORM query for both execution and preview"""
-        
-        # Start with base query structure
+        """Build the consolidated query for both execution and preview, with filter values bound"""
+        statement = self.build_consolidated_statement(calculations, aggregation_level, plan, filter_strategy)
+        return statement.params(**self.get_filter_params(deal_numbers, tranche_ids, cycle_codes, filter_strategy))
+    
+    def load_filters(
+        self,
+        session: Session,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        filter_strategy: FilterStrategy
+    ):
+        """Load the selection into the session's filter temp tables when the strategy reads them"""
+        if filter_strategy == FilterStrategy.TEMP_TABLE:
+            with phase("load_filters"):
+                load_filter_tables(session, deal_numbers, tranche_ids)
+    
+    def _build_base_query(self, aggregation_level: str):
+        """Build the Deal -> Tranche -> TrancheBal row skeleton for a report"""
         if aggregation_level == "tranche":
-            base_query = self.dw_db.query(
+            base_query = select(
                 Deal.dl_nbr.label('deal_number'),
                 Tranche.tr_id.label('tranche_id'),
                 TrancheBal.cycle_cde.label('cycle_code')
             )
         else:
-            base_query = self.dw_db.query(
+            base_query = select(
                 Deal.dl_nbr.label('deal_number'),
                 TrancheBal.cycle_cde.label('cycle_code')
             )
         
-        base_query = base_query.select_from(Deal)\
+        return base_query.select_from(Deal)\
             .join(Tranche, Deal.dl_nbr == Tranche.dl_nbr)\
             .join(TrancheBal, and_(
                 Tranche.dl_nbr == TrancheBal.dl_nbr,
                 Tranche.tr_id == TrancheBal.tr_id
             ))
+    
+    def _finalize_base_query(
+        self,
+        base_query,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        aggregation_level: str
+    ):
+        """Apply the report filters and grouping to the base query"""
+        final_query = base_query.filter(Deal.dl_nbr.in_(deal_numbers))\
+            .filter(Tranche.tr_id.in_(tranche_ids))\
+            .filter(TrancheBal.cycle_cde.in_(cycle_codes))
+        
+        if aggregation_level == "tranche":
+            final_query = final_query.group_by(Deal.dl_nbr, Tranche.tr_id, TrancheBal.cycle_cde)
+        else:
+            final_query = final_query.group_by(Deal.dl_nbr, TrancheBal.cycle_cde)
+        
+        return final_query.distinct()
+    
+    def _build_rollup_query(self, deal_numbers: List[int], cycle_codes: List[int], calculations: List[Calculation]):
+        """Build a deal-level report query answered from per-(deal, cycle) rollups"""
+        measures = sorted({
+            measure for calc in calculations for measure in rollups.get_calculation_measures(calc)
+        })
+        
+        return select(
+            TrancheBalRollup.dl_nbr.label('deal_number'),
+            TrancheBalRollup.cycle_cde.label('cycle_code'),
+            *[rollups.build_rollup_expression(calc).label(calc.name) for calc in calculations]
+        )\
+            .where(TrancheBalRollup.dl_nbr.in_(deal_numbers))\
+            .where(TrancheBalRollup.cycle_cde.in_(cycle_codes))\
+            .where(TrancheBalRollup.measure.in_(measures))\
+            .group_by(TrancheBalRollup.dl_nbr, TrancheBalRollup.cycle_cde)
+    
+    def _join_calculation_subquery(self, base_query, calc_subquery, aggregation_level: str):
+        """LEFT JOIN a calculation subquery onto the base query at the report grain"""
+        if aggregation_level == "tranche":
+            return base_query.outerjoin(
+                calc_subquery, 
+                and_(
+                    Deal.dl_nbr == calc_subquery.c.calc_deal_nbr,
+                    Tranche.tr_id == calc_subquery.c.calc_tranche_id,
+                    TrancheBal.cycle_cde == calc_subquery.c.calc_cycle_cde
+                )
+            )
+        return base_query.outerjoin(
+            calc_subquery, 
+            and_(
+                Deal.dl_nbr == calc_subquery.c.calc_deal_nbr,
+                TrancheBal.cycle_cde == calc_subquery.c.calc_cycle_cde
+            )
+        )
+    
+    def _build_grouped_query(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        calculations: List[Calculation],
+        aggregation_level: str
+    ):
+        """Build the consolidated query with one aggregation pass per calculation group.
+        
+        Calculations sharing a source model and group level are evaluated side by
+        side in a single GROUP BY. TrancheBal-sourced groups scan exactly the same
+        rows as the base query, so they are aggregated in the base query itself;
+        every other group becomes one LEFT JOINed subquery.
+        """
+        base_query = self._build_base_query(aggregation_level)
+        columns = {}
+        
+        for (source_model, _), group in self._group_calculations(calculations).items():
+            if source_model == SourceModel.TRANCHE_BAL:
+                for calc in group:
+                    columns[calc.id] = calc.get_sqlalchemy_function().label(calc.name)
+                continue
+            
+            group_subquery = self._build_calculation_group_subquery(
+                group, deal_numbers, tranche_ids, cycle_codes, aggregation_level
+            )
+            base_query = self._join_calculation_subquery(base_query, group_subquery, aggregation_level)
+            
+            for index, calc in enumerate(group):
+                columns[calc.id] = group_subquery.c[f"calc_{index}"].label(calc.name)
+        
+        # Keep calculation columns in display order regardless of grouping
+        base_query = base_query.add_columns(*[columns[calc.id] for calc in calculations])
+        
+        return self._finalize_base_query(
+            base_query, deal_numbers, tranche_ids, cycle_codes, aggregation_level
+        )
+    
+    def _build_per_calculation_query(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        calculations: List[Calculation],
+        aggregation_level: str
+    ):
+        """Build the consolidated query with one LEFT JOINed subquery per calculation"""
+        base_query = self._build_base_query(aggregation_level)
         
         # Add each calculation as a column using subquery approach
         for calc in calculations:
             calc_subquery = self._build_calculation_subquery(
-                calc, deal_numbers, tranche_ids, cycle_code, aggregation_level
+                calc, deal_numbers, tranche_ids, cycle_codes, aggregation_level
             )
             
             # LEFT JOIN this calculation to the base query
-            if aggregation_level == "tranche":
-                base_query = base_query.outerjoin(
-                    calc_subquery, 
-                    and_(
-                        Deal.dl_nbr == calc_subquery.c.calc_deal_nbr,
-                        Tranche.tr_id == calc_subquery.c.calc_tranche_id
-                    )
-                )
-            else:
-                base_query = base_query.outerjoin(
-                    calc_subquery, 
-                    Deal.dl_nbr == calc_subquery.c.calc_deal_nbr
-                )
+            base_query = self._join_calculation_subquery(base_query, calc_subquery, aggregation_level)
             
             # Add the calculation column
             column_name = self._get_calc_column_name(calc)
             base_query = base_query.add_columns(calc_subquery.c[column_name].label(calc.name))
         
-        # Apply filters and grouping
-        final_query = base_query.filter(Deal.dl_nbr.in_(deal_numbers))\
-            .filter(Tranche.tr_id.in_(tranche_ids))\
-            .filter(TrancheBal.cycle_cde == cycle_code)
-        
-        if aggregation_level == "tranche":
-            final_query = final_query.group_by(Deal.dl_nbr, Tranche.tr_id, TrancheBal.cycle_cde)
-        else:
-            final_query = final_query.group_by(Deal.dl_nbr, TrancheBal.cycle_cde)
-        
-        return final_query.distinct()
+        return self._finalize_base_query(
+            base_query, deal_numbers, tranche_ids, cycle_codes, aggregation_level
+        )
+    
+    def _group_calculations(
+        self, 
+        calculations: List[Calculation]
+    ) -> Dict[Tuple[SourceModel, GroupLevel], List[Calculation]]:
+        """Group calculations by (source model, group level), preserving first-seen order"""
+        groups: Dict[Tuple[SourceModel, GroupLevel], List[Calculation]] = {}
+        for calc in calculations:
+            groups.setdefault((calc.source_model, calc.group_level), []).append(calc)
+        return groups
     
     def _build_calculation_subquery(
         self, 
         calc: Calculation, 
         deal_numbers: List[int], 
         tranche_ids: List[str], 
-        cycle_code: int, 
+        cycle_codes: List[int], 
         aggregation_level: str
     ):
         """Build subquery for a single calculation"""
         
         if aggregation_level == "tranche":
-            calc_subquery = self.dw_db.query(
+            calc_subquery = select(
                 Deal.dl_nbr.label('calc_deal_nbr'),
                 Tranche.tr_id.label('calc_tranche_id'),
+                TrancheBal.cycle_cde.label('calc_cycle_cde'),
                 calc.get_sqlalchemy_function().label(self._get_calc_column_name(calc))
             )
         else:
-            calc_subquery = self.dw_db.query(
+            calc_subquery = select(
                 Deal.dl_nbr.label('calc_deal_nbr'),
+                TrancheBal.cycle_cde.label('calc_cycle_cde'),
                 calc.get_sqlalchemy_function().label(self._get_calc_column_name(calc))
             )
         
@@ -122,15 +391,68 @@ class QueryEngine:
         # Apply filters and group by
         calc_subquery = calc_subquery.filter(Deal.dl_nbr.in_(deal_numbers))\
             .filter(Tranche.tr_id.in_(tranche_ids))\
-            .filter(TrancheBal.cycle_cde == cycle_code)
+            .filter(TrancheBal.cycle_cde.in_(cycle_codes))
         
         if aggregation_level == "tranche":
-            calc_subquery = calc_subquery.group_by(Deal.dl_nbr, Tranche.tr_id)
+            calc_subquery = calc_subquery.group_by(Deal.dl_nbr, Tranche.tr_id, TrancheBal.cycle_cde)
         else:
-            calc_subquery = calc_subquery.group_by(Deal.dl_nbr)
+            calc_subquery = calc_subquery.group_by(Deal.dl_nbr, TrancheBal.cycle_cde)
         
         return calc_subquery.subquery()
     
+    def _build_calculation_group_subquery(
+        self, 
+        calculations: List[Calculation], 
+        deal_numbers: List[int], 
+        tranche_ids: List[str], 
+        cycle_codes: List[int], 
+        aggregation_level: str
+    ):
+        """Build one subquery evaluating a group of same-source calculations side by side"""
+        aggregates = [
+            calc.get_sqlalchemy_function().label(f"calc_{index}")
+            for index, calc in enumerate(calculations)
+        ]
+        
+        if aggregation_level == "tranche":
+            group_subquery = select(
+                Deal.dl_nbr.label('calc_deal_nbr'),
+                Tranche.tr_id.label('calc_tranche_id'),
+                TrancheBal.cycle_cde.label('calc_cycle_cde'),
+                *aggregates
+            )
+        else:
+            group_subquery = select(
+                Deal.dl_nbr.label('calc_deal_nbr'),
+                TrancheBal.cycle_cde.label('calc_cycle_cde'),
+                *aggregates
+            )
+        
+        group_subquery = group_subquery.select_from(Deal)
+        
+        # All calculations in a group share a source model, hence the same joins
+        required_models = calculations[0].get_required_models()
+        
+        if Tranche in required_models:
+            group_subquery = group_subquery.join(Tranche, Deal.dl_nbr == Tranche.dl_nbr)
+        
+        if TrancheBal in required_models:
+            group_subquery = group_subquery.join(TrancheBal, and_(
+                Tranche.dl_nbr == TrancheBal.dl_nbr,
+                Tranche.tr_id == TrancheBal.tr_id
+            ))
+        
+        group_subquery = group_subquery.filter(Deal.dl_nbr.in_(deal_numbers))\
+            .filter(Tranche.tr_id.in_(tranche_ids))\
+            .filter(TrancheBal.cycle_cde.in_(cycle_codes))
+        
+        if aggregation_level == "tranche":
+            group_subquery = group_subquery.group_by(Deal.dl_nbr, Tranche.tr_id, TrancheBal.cycle_cde)
+        else:
+            group_subquery = group_subquery.group_by(Deal.dl_nbr, TrancheBal.cycle_cde)
+        
+        return group_subquery.subquery()
+    
     def _get_calc_column_name(self, calc: Calculation) -> str:
         """Get normalized column name for calculation"""
         return calc.name.lower().replace(" ", "_").replace("-", "_")
@@ -147,14 +469,14 @@ class QueryEngine:
         
         # Build base query with calculation
         if aggregation_level == "tranche":
-            query = self.dw_db.query(
+            query = select(
                 Deal.dl_nbr.label('deal_number'),
                 Tranche.tr_id.label('tranche_id'),
                 TrancheBal.cycle_cde.label('cycle_code'),
                 calculation.get_sqlalchemy_function().label(calculation.name)
             )
         else:
-            query = self.dw_db.query(
+            query = select(
                 Deal.dl_nbr.label('deal_number'),
                 TrancheBal.cycle_cde.label('cycle_code'),
                 calculation.get_sqlalchemy_function().label(calculation.name)
@@ -191,27 +513,210 @@ class QueryEngine:
         self,
         deal_numbers: List[int],
         tranche_ids: List[str], 
-        cycle_code: int,
+        cycle_codes: List[int],
         calculations: List[Calculation],
-        aggregation_level: str
+        aggregation_level: str,
+        plan: Optional[QueryPlan] = None
     ) -> List[Any]:
         """Execute consolidated report query and return results"""
-        query = self.build_consolidated_query(
-            deal_numbers, tranche_ids, cycle_code, calculations, aggregation_level
+        filter_strategy = resolve_filter_strategy(deal_numbers, tranche_ids)
+        self.load_filters(self.dw_db, deal_numbers, tranche_ids, filter_strategy)
+        with phase("plan"):
+            plan = self.resolve_plan(
+                deal_numbers, tranche_ids, cycle_codes, calculations, aggregation_level, plan, filter_strategy
+            )
+        return self._fetch_report_rows(
+            deal_numbers, tranche_ids, cycle_codes, calculations, aggregation_level, plan, filter_strategy
         )
-        return query.all()
+    
+    def execute_report_columns(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str], 
+        cycle_codes: List[int],
+        calculations: List[Calculation],
+        aggregation_level: str,
+        plan: Optional[QueryPlan] = None
+    ) -> Tuple[List[str], List[List[Any]]]:
+        """Execute consolidated report query and return (header, one array per column).
+        
+        Rows are transposed straight from the cursor without building per-row objects.
+        """
+        filter_strategy = resolve_filter_strategy(deal_numbers, tranche_ids)
+        self.load_filters(self.dw_db, deal_numbers, tranche_ids, filter_strategy)
+        with phase("plan"):
+            plan = self.resolve_plan(
+                deal_numbers, tranche_ids, cycle_codes, calculations, aggregation_level, plan, filter_strategy
+            )
+        rows = self._fetch_report_rows(
+            deal_numbers, tranche_ids, cycle_codes, calculations, aggregation_level, plan, filter_strategy
+        )
+        
+        header = self.get_result_header(calculations, aggregation_level)
+        if not rows:
+            return header, [[] for _ in header]
+        with phase("process_rows"):
+            return header, [list(column) for column in zip(*rows)]
+    
+    def _fetch_report_rows(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        calculations: List[Calculation],
+        aggregation_level: str,
+        plan: QueryPlan,
+        filter_strategy: FilterStrategy
+    ) -> List[Any]:
+        """Run the consolidated statement, split into parallel partial queries when configured.
+        
+        Partial queries are one per (deal shard, calculation partition); each shard's
+        partitions are merged on the report keys and shards concatenated in deal order.
+        Filters for ``dw_db`` itself must already be loaded.
+        """
+        shards = self.get_deal_shards(deal_numbers, tranche_ids, cycle_codes, plan, filter_strategy)
+        partitions = self.get_calculation_partitions(calculations, plan)
+        
+        if len(shards) == 1 and len(partitions) == 1:
+            with phase("build_query"):
+                statement = self.build_consolidated_statement(calculations, aggregation_level, plan, filter_strategy)
+            with phase("execute_sql"):
+                return self.dw_db.execute(
+                    statement, self.get_filter_params(deal_numbers, tranche_ids, cycle_codes, filter_strategy)
+                ).all()
+        
+        with phase("build_query"):
+            statements = [
+                self.build_consolidated_statement(partition, aggregation_level, plan, filter_strategy)
+                for partition in partitions
+            ]
+        
+        def execute_partial(session: Session, statement, shard: List[int]) -> List[Any]:
+            # Temp tables are per connection, so each partial query loads its own
+            self.load_filters(session, shard, tranche_ids, filter_strategy)
+            return session.execute(
+                statement, self.get_filter_params(shard, tranche_ids, cycle_codes, filter_strategy)
+            ).all()
+        
+        with phase("execute_sql"):
+            partials = run_partitioned(self.dw_db, [
+                lambda session, statement=statement, shard=shard: execute_partial(session, statement, shard)
+                for shard in shards
+                for statement in statements
+            ])
+        
+        if len(partitions) == 1:
+            return [row for rows in partials for row in rows]
+        
+        with phase("merge_partials"):
+            key_fields = ["deal_number", "tranche_id", "cycle_code"] if aggregation_level == "tranche" else ["deal_number", "cycle_code"]
+            rows = []
+            for start in range(0, len(partials), len(partitions)):
+                rows.extend(merge_partial_rows(
+                    key_fields, partitions, partials[start:start + len(partitions)], calculations
+                ))
+            return rows
+    
+    def get_deal_shards(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        plan: QueryPlan,
+        filter_strategy: FilterStrategy = FilterStrategy.IN_LIST
+    ) -> List[List[int]]:
+        """Split a large deal selection into shards executed as parallel partial queries"""
+        if plan == QueryPlan.ROLLUP or self.parallel_workers < 2 or len(deal_numbers) < DW_SHARD_MIN_DEALS:
+            return [list(deal_numbers)]
+        with phase("estimate_rows"):
+            row_estimates = self.estimate_deal_rows(deal_numbers, tranche_ids, cycle_codes, filter_strategy)
+        return shard_deals(deal_numbers, row_estimates, self.parallel_workers)
+    
+    def estimate_deal_rows(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str],
+        cycle_codes: List[int],
+        filter_strategy: FilterStrategy = FilterStrategy.IN_LIST
+    ) -> Dict[int, int]:
+        """Count the balance rows each selected deal contributes (answered from the cycle index)"""
+        deal_filter, tranche_filter = self._get_selection_filters(deal_numbers, tranche_ids, filter_strategy)
+        return dict(self.dw_db.execute(
+            select(TrancheBal.dl_nbr, func.count())
+            .where(TrancheBal.cycle_cde.in_(cycle_codes))
+            .where(TrancheBal.dl_nbr.in_(deal_filter))
+            .where(TrancheBal.tr_id.in_(tranche_filter))
+            .group_by(TrancheBal.dl_nbr)
+        ).all())
+    
+    def get_calculation_partitions(
+        self,
+        calculations: List[Calculation],
+        plan: QueryPlan
+    ) -> List[List[Calculation]]:
+        """Split calculations into the partitions executed as parallel partial queries.
+        
+        Rollup queries are cheap single scans and are never split. Grouped plans split
+        along calculation groups; per-calculation plans along single calculations.
+        """
+        if plan == QueryPlan.ROLLUP or self.parallel_workers < 2:
+            return [calculations]
+        if plan == QueryPlan.GROUPED:
+            groups = list(self._group_calculations(calculations).values())
+        else:
+            groups = [[calc] for calc in calculations]
+        partitions = partition_calculations(groups, self.parallel_workers)
+        # An unsplit report keeps its calculations in display order
+        return partitions if len(partitions) > 1 else [calculations]
+    
+    def get_result_header(self, calculations: List[Calculation], aggregation_level: str) -> List[str]:
+        """Get report column names in consolidated statement order"""
+        key_columns = ["dl_nbr", "tr_id", "cycle_cde"] if aggregation_level == "tranche" else ["dl_nbr", "cycle_cde"]
+        return key_columns + [calc.name for calc in calculations]
+    
+    def stream_report_query(
+        self,
+        deal_numbers: List[int],
+        tranche_ids: List[str], 
+        cycle_codes: List[int],
+        calculations: List[Calculation],
+        aggregation_level: str,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        plan: Optional[QueryPlan] = None
+    ) -> Iterator[Any]:
+        """Execute consolidated report query, yielding rows from a server-side cursor in chunks"""
+        filter_strategy = resolve_filter_strategy(deal_numbers, tranche_ids)
+        self.load_filters(self.dw_db, deal_numbers, tranche_ids, filter_strategy)
+        with phase("plan"):
+            plan = self.resolve_plan(
+                deal_numbers, tranche_ids, cycle_codes, calculations, aggregation_level, plan, filter_strategy
+            )
+        with phase("build_query"):
+            statement = self.build_consolidated_statement(calculations, aggregation_level, plan, filter_strategy)
+        with phase("execute_sql"):
+            result = self.dw_db.execute(
+                statement,
+                self.get_filter_params(deal_numbers, tranche_ids, cycle_codes, filter_strategy),
+                execution_options={"yield_per": chunk_size, "stream_results": True}
+            )
+        
+        try:
+            for partition in result.partitions():
+                yield from partition
+        finally:
+            result.close()
     
     def execute_calculation_query(
         self,
         calculation: Calculation,
         deal_numbers: List[int],
         tranche_ids: List[str],
-        cycle_code: int,
+        cycle_codes: List[int],
         aggregation_level: str
     ) -> List[Any]:
         """Execute single calculation query and return results"""
         return self.execute_report_query(
-            deal_numbers, tranche_ids, cycle_code, [calculation], aggregation_level
+            deal_numbers, tranche_ids, cycle_codes, [calculation], aggregation_level
         )
     
     # Preview Methods - Simplified to show raw execution SQL only
@@ -221,7 +726,8 @@ class QueryEngine:
         aggregation_level: str = "deal",
         sample_deals: List[int] = None,
         sample_tranches: List[str] = None,
-        sample_cycle: int = None
+        sample_cycle: int = None,
+        explain: bool = False
     ) -> Dict[str, Any]:
         """Generate raw SQL preview for a single calculation using simplified query"""
         
@@ -235,7 +741,7 @@ class QueryEngine:
             calculation, sample_deals, sample_tranches, sample_cycle, aggregation_level
         )
         
-        return {
+        preview = {
             "calculation_name": calculation.name,
             "aggregation_level": aggregation_level,
             "generated_sql": self._compile_query_to_sql(query),
@@ -245,6 +751,9 @@ class QueryEngine:
                 "cycle": sample_cycle
             }
         }
+        if explain:
+            preview["explain"] = self.explain_statement(query)
+        return preview
     
     def preview_report_sql(
         self,
@@ -253,35 +762,107 @@ class QueryEngine:
         deal_numbers: List[int],
         tranche_ids: List[str],
         cycle_code: int,
-        calculations: List[Calculation]
+        calculations: List[Calculation],
+        plan: Optional[QueryPlan] = None,
+        explain: bool = False
     ) -> Dict[str, Any]:
-        """Generate raw SQL preview for a full report"""
+        """Generate raw SQL preview for a full report.
+        
+        The preview shows the statement execution would run, using the plan
+        execution would pick. With ``explain``, it also carries SQLite's query
+        plan for that statement.
+        """
+        filter_strategy = resolve_filter_strategy(deal_numbers, tranche_ids)
+        self.load_filters(self.dw_db, deal_numbers, tranche_ids, filter_strategy)
+        plan = self.resolve_plan(
+            deal_numbers, tranche_ids, [cycle_code], calculations, aggregation_level, plan, filter_strategy
+        )
         
         # Build and compile query (identical to execution)
         query = self.build_consolidated_query(
-            deal_numbers, tranche_ids, cycle_code, calculations, aggregation_level
+            deal_numbers, tranche_ids, [cycle_code], calculations, aggregation_level, plan, filter_strategy
         )
         
-        return {
+        preview = {
             "template_name": report_name,
             "aggregation_level": aggregation_level,
             "sql_query": self._compile_query_to_sql(query),
+            "plan": plan.value,
+            "filter_strategy": filter_strategy.value,
             "parameters": {
                 "cycle_code": cycle_code,
                 "deal_numbers": deal_numbers,
                 "tranche_ids": tranche_ids
             }
         }
+        if explain:
+            preview["explain"] = {"plan": plan.value, **self.explain_statement(query)}
+        return preview
+    
+    def explain_statement(self, statement) -> Dict[str, Any]:
+        """Run EXPLAIN QUERY PLAN on a statement with its bound values.
+        
+        Returns the plan as a tree of ``{id, detail, children}`` nodes plus
+        warnings for full scans of the balance table and temp B-trees built
+        for GROUP BY / DISTINCT / ORDER BY.
+        """
+        statement = getattr(statement, "statement", statement)
+        compiled = statement.compile(
+            dialect=self.dw_db.bind.dialect,
+            compile_kwargs={"render_postcompile": True}
+        )
+        parameters = tuple(compiled.params[name] for name in compiled.positiontup or ())
+        rows = self.dw_db.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", parameters
+        ).all()
+        
+        nodes = {0: {"children": []}}
+        warnings = []
+        for node_id, parent_id, _, detail in rows:
+            node = {"id": node_id, "detail": detail, "children": []}
+            nodes[node_id] = node
+            nodes.get(parent_id, nodes[0])["children"].append(node)
+            
+            warning = self._get_plan_warning(detail)
+            if warning:
+                warnings.append({"id": node_id, "detail": detail, **warning})
+        
+        return {
+            "query_plan": nodes[0]["children"],
+            "warnings": warnings
+        }
+    
+    @staticmethod
+    def _get_plan_warning(detail: str) -> Optional[Dict[str, str]]:
+        """Flag query plan steps that scale badly with warehouse size"""
+        scan = EXPLAIN_FULL_SCAN.match(detail)
+        if scan:
+            return {
+                "issue": "full_scan",
+                "message": f"Full scan of {scan.group(1)}; filters are not using an index"
+            }
+        temp_btree = EXPLAIN_TEMP_BTREE.match(detail)
+        if temp_btree:
+            return {
+                "issue": "temp_btree",
+                "message": f"Temporary B-tree built for {temp_btree.group(1)}; rows are sorted after they are read"
+            }
+        return None
     
     # Utility Methods
     def _compile_query_to_sql(self, query) -> str:
-        """Compile SQLAlchemy query to raw SQL string"""
-        return str(query.statement.compile(
+        """Compile SQLAlchemy query or statement to raw SQL string"""
+        statement = getattr(query, "statement", query)
+        return str(statement.compile(
             dialect=self.dw_db.bind.dialect, 
             compile_kwargs={"literal_binds": True}
         ))
     
     # Data Warehouse Access Methods
+    def get_cycles_between(self, cycle_start: int, cycle_end: int) -> List[int]:
+        """Get distinct cycle codes present in the data warehouse within an inclusive range"""
+        return get_cycle_codes(self.dw_db, cycle_start, cycle_end)
+    
     def get_calculations_by_names(self, names: List[str]) -> List[Calculation]:
         """Get calculations by names from config database"""
         return self.config_db.query(Calculation).filter(
@@ -306,7 +887,18 @@ class QueryEngine:
         """Process raw query results into structured report data"""
         from app.features.reports.schemas import ReportRow
         
-        data = []
+        return [
+            ReportRow(**row_data)
+            for row_data in self.iter_report_records(results, calculations, aggregation_level)
+        ]
+    
+    def iter_report_records(
+        self,
+        results,
+        calculations: List[Calculation],
+        aggregation_level: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Convert raw query results into report row dicts, one row at a time"""
         for result in results:
             # Extract base fields
             deal_nbr = result.deal_number
@@ -328,6 +920,4 @@ class QueryEngine:
             if aggregation_level == "tranche":
                 row_data["tr_id"] = result.tranche_id
             
-            data.append(ReportRow(**row_data))
-        
-        return data
\ No newline at end of file
+            yield row_data
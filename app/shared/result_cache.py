@@ -0,0 +1,142 @@
+# app/shared/result_cache.py
+"""LRU report result cache bounded by entry count and estimated total result size"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Hashable, Optional
+import os
+
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "128"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Approximate memory held by one cached report row (model and key fields) and by each calculation value in it
+RESULT_ROW_BYTES = 700
+RESULT_VALUE_BYTES = 100
+
+
+def estimate_result_size(row_count: int, column_count: int) -> int:
+    """Estimate the memory held by a cached report result, without serializing it"""
+    return row_count * (RESULT_ROW_BYTES + column_count * RESULT_VALUE_BYTES)
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    size: int
+    report_id: int
+    cycle_codes: FrozenSet[int] = field(default_factory=frozenset)
+    calculation_ids: FrozenSet[int] = field(default_factory=frozenset)
+
+
+class ResultCache:
+    """Thread-safe LRU cache of executed report results.
+    
+    Entries are evicted least-recently-used first whenever either the entry
+    count or the summed payload size exceeds its limit. Each entry is tagged
+    with its report, cycles and calculations so it can be invalidated when
+    any of those inputs change.
+    """
+    
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._lock = Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached result, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+    
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        size: int,
+        report_id: int,
+        cycle_codes=(),
+        calculation_ids=()
+    ) -> bool:
+        """Store a result; returns False if it is too large to cache at all"""
+        if size > self.max_bytes:
+            return False
+        
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _CacheEntry(
+                value=value,
+                size=size,
+                report_id=report_id,
+                cycle_codes=frozenset(cycle_codes),
+                calculation_ids=frozenset(calculation_ids)
+            )
+            self.total_bytes += size
+            
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+        
+        return True
+    
+    def invalidate_report(self, report_id: int) -> int:
+        """Drop all cached results for a report template"""
+        return self._invalidate_where(lambda entry: entry.report_id == report_id)
+    
+    def invalidate_calculation(self, calculation_id: int) -> int:
+        """Drop all cached results that include a calculation"""
+        return self._invalidate_where(lambda entry: calculation_id in entry.calculation_ids)
+    
+    def invalidate_cycle(self, cycle_code: int) -> int:
+        """Drop all cached results computed over a cycle"""
+        return self._invalidate_where(lambda entry: cycle_code in entry.cycle_codes)
+    
+    def clear(self) -> int:
+        """Drop all cached results (counters are kept)"""
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self.total_bytes = 0
+            return dropped
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache occupancy and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+    
+    def _invalidate_where(self, predicate) -> int:
+        with self._lock:
+            stale_keys = [key for key, entry in self._entries.items() if predicate(entry)]
+            for key in stale_keys:
+                self._remove(key)
+            return len(stale_keys)
+    
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+
+# Process-wide cache shared by all ReportService instances
+result_cache = ResultCache()
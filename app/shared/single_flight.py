@@ -0,0 +1,62 @@
+# app/shared/single_flight.py
+"""Coalescing of concurrent identical computations.
+
+The first caller for a key starts the computation; callers arriving with the
+same key while it is in flight await it and receive the same result (or the
+same exception) instead of running it again. Nothing is kept once the
+computation finishes — completed results are the result cache's job.
+
+Coalescing happens on the event loop, before any work is dispatched to the
+database executor: only the leader occupies an executor thread, followers just
+await the shared task, so a burst of identical requests cannot fill the
+bounded pool with idle waiters.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import os
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+class SingleFlight:
+    """Single-flight group keyed by hashable execution keys (event loop only, not thread-safe)"""
+
+    def __init__(self, enabled: bool = SINGLE_FLIGHT_ENABLED):
+        self.enabled = enabled
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await ``compute()`` once per in-flight key; returns (result, whether it was shared)"""
+        if not self.enabled:
+            return await compute(), False
+
+        task = self._calls.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(compute())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        # Shielded: a cancelled caller must not cancel the computation others await
+        return await asyncio.shield(task), coalesced
+
+    def stats(self) -> Dict[str, Any]:
+        """Get in-flight and coalescing counters"""
+        requests = self.executions + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / requests if requests else 0.0
+        }
+
+
+# Process-wide group shared by all ReportService instances
+report_single_flight = SingleFlight()
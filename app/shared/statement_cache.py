@@ -0,0 +1,67 @@
+# app/shared/statement_cache.py
+"""LRU cache of pre-built report statements with hit/miss accounting"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable
+import os
+
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", "256"))
+
+
+class StatementCache:
+    """Thread-safe LRU cache of parameterized SQLAlchemy statements.
+    
+    Cached statements use bind parameters for every per-execution value, so
+    SQLAlchemy's compiled cache is hit on repeat executions and only the bound
+    values change.
+    """
+    
+    def __init__(self, max_size: int = STATEMENT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """Return the cached statement for key, building and storing it on a miss"""
+        with self._lock:
+            statement = self._entries.get(key)
+            if statement is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return statement
+            self.misses += 1
+        
+        # Build outside the lock; a concurrent duplicate build is harmless
+        statement = builder()
+        
+        with self._lock:
+            self._entries[key] = statement
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        
+        return statement
+    
+    def clear(self) -> None:
+        """Drop all cached statements (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Process-wide cache shared by all QueryEngine instances
+statement_cache = StatementCache()
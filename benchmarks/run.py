@@ -0,0 +1,325 @@
+"""
+Benchmark suite for QueryEngine and report execution.
+
+Generates synthetic warehouses of several sizes (requires numpy), then sweeps
+aggregation level, number of calculations and deal/tranche selection size over
+the real code paths:
+
+    build      QueryEngine.build_consolidated_query (statement cache cleared: cold build)
+    execute    QueryEngine.execute_report_query
+    service    ReportService.execute_report (result cache cleared each iteration)
+
+Each scenario records latency percentiles, SQL statements per iteration, peak
+RSS and the query plan chosen, written to a JSON file.
+
+    python benchmarks/run.py --sizes 200x12,2000x24 --output baseline.json
+    python benchmarks/run.py compare baseline.json candidate.json --threshold 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Config database for templates and calculations lives with the generated warehouses
+WORK_DIR = os.environ.get("BENCHMARK_WORK_DIR") or tempfile.mkdtemp(prefix="report_bench_")
+os.makedirs(WORK_DIR, exist_ok=True)
+os.environ["CONFIG_DATABASE_PATH"] = os.path.join(WORK_DIR, "config.db")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sqlalchemy
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.features.calculations.models import Calculation
+from app.features.datawarehouse.cycles import refresh_cycle
+from app.features.datawarehouse.generator import generate_warehouse
+from app.features.datawarehouse.models import Tranche
+from app.features.datawarehouse.rollups import get_weighted_pairs
+from app.features.reports.schemas import ReportCreateRequest, ReportExecuteRequest
+from app.features.reports.service import ReportService
+from app.shared.query_engine import QueryEngine
+from app.shared.result_cache import result_cache
+from app.shared.statement_cache import statement_cache
+
+PATHS = ("build", "execute", "service")
+
+class StatementCounter:
+    """Count SQL statements sent through a set of engines"""
+
+    def __init__(self, *engines):
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._increment)
+
+    def _increment(self, *args):
+        self.count += 1
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+def parse_sizes(value):
+    sizes = []
+    for item in value.split(","):
+        deals, cycles = item.lower().split("x")
+        sizes.append((int(deals), int(cycles)))
+    return sizes
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent.parent
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+def prepare_warehouse(deals, cycles, seed, build_rollups, config_db):
+    """Generate (or reuse) a warehouse file for one size and return its engine"""
+    path = os.path.join(WORK_DIR, f"dw_{deals}x{cycles}_s{seed}.db")
+    fresh = not os.path.exists(path)
+
+    engine = create_engine(f"sqlite:///{path}", echo=False)
+    database.apply_sqlite_pragmas(engine, database.get_sqlite_pragmas())
+    database.DWBase.metadata.create_all(bind=engine)
+    database.ensure_indexes(database.DWBase.metadata, engine)
+
+    if fresh:
+        with sessionmaker(bind=engine)() as db:
+            print(f"Generating {deals} deals x {cycles} cycles ...")
+            result = generate_warehouse(db, deal_count=deals, cycle_count=cycles, seed=seed)
+            weighted_pairs = get_weighted_pairs(config_db.query(Calculation).filter(Calculation.is_active == True).all())
+            for cycle_code in result["cycles"]:
+                if build_rollups:
+                    refresh_cycle(db, cycle_code, weighted_pairs)
+            print(f"  {result['balance_rows']:,} balance rows in {result['elapsed_seconds']:.1f}s")
+
+    return engine
+
+def build_scenarios(deal_count, calculations, tranche_ids, args):
+    selections = sorted({min(size, deal_count) for size in args.deal_selections} | ({deal_count} if args.include_all_deals else set()))
+    calc_counts = sorted({min(count, len(calculations)) for count in args.calc_counts})
+    tranche_sets = {"all": tranche_ids, "half": tranche_ids[:max(1, len(tranche_ids) // 2)]}
+
+    for level in args.levels:
+        for calc_count in calc_counts:
+            for deal_selection in selections:
+                for tranche_label, tranches in tranche_sets.items():
+                    yield {
+                        "aggregation_level": level,
+                        "calculations": calculations[:calc_count],
+                        "deal_count": deal_selection,
+                        "tranche_label": tranche_label,
+                        "tranche_ids": tranches,
+                    }
+
+def run_size(deals, cycles, args, config_engine, ConfigSession, loop):
+    results = []
+    with ConfigSession() as config_db:
+        dw_engine = prepare_warehouse(deals, cycles, args.seed, not args.no_rollups, config_db)
+    counter = StatementCounter(dw_engine, config_engine)
+    DWSession = sessionmaker(autocommit=False, autoflush=False, bind=dw_engine)
+
+    dw_db, config_db = DWSession(), ConfigSession()
+    try:
+        engine = QueryEngine(dw_db, config_db)
+        service = ReportService(config_db, engine)
+
+        # Decomposable TrancheBal calculations first, then the rest, in a stable order
+        calculations = sorted(
+            config_db.query(Calculation).filter(Calculation.is_active == True).all(),
+            key=lambda calc: (calc.source_model.value != "TrancheBal", calc.id)
+        )
+        tranche_ids = sorted({row[0] for row in dw_db.execute(select(Tranche.tr_id).distinct())})
+        cycle_codes = engine.get_cycles_between(0, 999999)[-args.cycles_per_run:]
+        first_deal = 101
+
+        for scenario in build_scenarios(deals, calculations, tranche_ids, args):
+            deal_numbers = list(range(first_deal, first_deal + scenario["deal_count"]))
+            calcs = scenario["calculations"]
+            level = scenario["aggregation_level"]
+            scenario_id = (
+                f"{deals}x{cycles}/{level}/calcs={len(calcs)}/deals={scenario['deal_count']}"
+                f"/tranches={scenario['tranche_label']}"
+            )
+
+            template = loop.run_until_complete(service.create_report_template(ReportCreateRequest(
+                name=f"bench {scenario_id} {time.time_ns()}",
+                aggregation_level=level,
+                selected_deals=deal_numbers,
+                selected_tranches=scenario["tranche_ids"],
+                selected_calculations=[calc.name for calc in calcs]
+            )))
+            plan = engine.resolve_plan(deal_numbers, scenario["tranche_ids"], cycle_codes, calcs, level)
+
+            runners = {
+                "build": lambda: (statement_cache.clear(), engine.build_consolidated_query(
+                    deal_numbers, scenario["tranche_ids"], cycle_codes, calcs, level
+                )),
+                "execute": lambda: engine.execute_report_query(
+                    deal_numbers, scenario["tranche_ids"], cycle_codes, calcs, level
+                ),
+                "service": lambda: (result_cache.clear(), loop.run_until_complete(service.execute_report(
+                    template.id, ReportExecuteRequest(cycle_codes=cycle_codes)
+                ))),
+            }
+
+            for path in args.paths:
+                run = runners[path]
+                for _ in range(args.warmup):
+                    run()
+
+                statements_before = counter.count
+                timings = []
+                for _ in range(args.iterations):
+                    started = time.perf_counter()
+                    output = run()
+                    timings.append((time.perf_counter() - started) * 1000)
+                statements = (counter.count - statements_before) / args.iterations
+
+                if path == "execute":
+                    rows = len(output)
+                elif path == "service":
+                    rows = output[1].row_count
+                else:
+                    rows = None
+
+                timings.sort()
+                result = {
+                    "id": f"{scenario_id}/{path}",
+                    "warehouse": {"deals": deals, "cycles": cycles},
+                    "path": path,
+                    "aggregation_level": level,
+                    "calculations": len(calcs),
+                    "deals": scenario["deal_count"],
+                    "tranches": len(scenario["tranche_ids"]),
+                    "cycles_per_run": len(cycle_codes),
+                    "plan": plan.value,
+                    "iterations": args.iterations,
+                    "rows": rows,
+                    "mean_ms": statistics.fmean(timings),
+                    "min_ms": timings[0],
+                    "p50_ms": percentile(timings, 0.50),
+                    "p95_ms": percentile(timings, 0.95),
+                    "p99_ms": percentile(timings, 0.99),
+                    "statements_per_iteration": statements,
+                    "peak_rss_mb": peak_rss_mb(),
+                }
+                results.append(result)
+                print(f"{result['id']:<72} {result['p50_ms']:>9.2f} ms p50 {result['p95_ms']:>9.2f} ms p95 "
+                      f"{statements:>5.1f} stmts  [{plan.value}]")
+    finally:
+        dw_db.close()
+        config_db.close()
+        dw_engine.dispose()
+
+    return results
+
+def run(args):
+    asyncio.run(database.create_config_tables())
+    asyncio.run(database.seed_default_calculations())
+
+    config_engine = database.ConfigSessionLocal.kw["bind"]
+    ConfigSession = database.ConfigSessionLocal
+    loop = asyncio.new_event_loop()
+
+    results = []
+    try:
+        for deals, cycles in parse_sizes(args.sizes):
+            results.extend(run_size(deals, cycles, args, config_engine, ConfigSession, loop))
+    finally:
+        loop.close()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": __import__("sqlite3").sqlite_version,
+            "platform": platform.platform(),
+            "work_dir": WORK_DIR,
+            "args": {key: value for key, value in vars(args).items() if key != "func"},
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = {result["id"]: result for result in json.load(f)["results"]}
+    with open(args.candidate) as f:
+        candidate = {result["id"]: result for result in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"{'scenario':<72}{'p50 base':>10}{'p50 new':>10}{'delta':>9}{'p95 delta':>11}{'stmts':>9}")
+    for scenario_id in sorted(baseline.keys() & candidate.keys()):
+        base, new = baseline[scenario_id], candidate[scenario_id]
+        p50_delta = (new["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100 if base["p50_ms"] else 0.0
+        p95_delta = (new["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100 if base["p95_ms"] else 0.0
+        statements = f"{base['statements_per_iteration']:.0f}->{new['statements_per_iteration']:.0f}"
+
+        regressed = p50_delta > args.threshold and new["p50_ms"] - base["p50_ms"] > args.min_ms
+        regressions += regressed
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{scenario_id:<72}{base['p50_ms']:>10.2f}{new['p50_ms']:>10.2f}{p50_delta:>8.1f}%"
+              f"{p95_delta:>10.1f}%{statements:>9}{marker}")
+
+    for label, missing in (("baseline only", baseline.keys() - candidate.keys()), ("candidate only", candidate.keys() - baseline.keys())):
+        if missing:
+            print(f"\n{len(missing)} scenarios in {label}")
+
+    print(f"\n{regressions} regression(s) above {args.threshold:.0f}% p50")
+    return 1 if regressions else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command")
+
+    runner = subparsers.add_parser("run", help="Run the benchmark suite (default)")
+    runner.add_argument("--sizes", default="200x12,2000x24", help="Warehouse sizes as DEALSxCYCLES, comma-separated")
+    runner.add_argument("--levels", nargs="+", default=["deal", "tranche"], choices=["deal", "tranche"])
+    runner.add_argument("--calc-counts", nargs="+", type=int, default=[1, 3, 7], help="Calculations per report")
+    runner.add_argument("--deal-selections", nargs="+", type=int, default=[10, 100], help="Deals per report")
+    runner.add_argument("--include-all-deals", action="store_true", help="Also select every deal in the warehouse")
+    runner.add_argument("--cycles-per-run", type=int, default=1, help="Most recent cycles per execution")
+    runner.add_argument("--paths", nargs="+", default=list(PATHS), choices=PATHS)
+    runner.add_argument("--iterations", type=int, default=10)
+    runner.add_argument("--warmup", type=int, default=2)
+    runner.add_argument("--seed", type=int, default=42)
+    runner.add_argument("--no-rollups", action="store_true", help="Benchmark without deal rollups")
+    runner.add_argument("--output", default="benchmark_results.json")
+    runner.set_defaults(func=run)
+
+    comparer = subparsers.add_parser("compare", help="Compare two result files")
+    comparer.add_argument("baseline")
+    comparer.add_argument("candidate")
+    comparer.add_argument("--threshold", type=float, default=10.0, help="Percent p50 slowdown counted as a regression")
+    comparer.add_argument("--min-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this many ms")
+    comparer.set_defaults(func=compare)
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in ("run", "compare", "-h", "--help"):
+        argv.insert(0, "run")
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
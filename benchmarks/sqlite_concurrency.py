@@ -0,0 +1,177 @@
+"""
+Benchmark SQLite read concurrency under simultaneous report executions and log writes.
+
+Seeds throwaway copies of the data warehouse and config databases, then for each
+connection profile runs N reader threads (load calculations from config, execute
+a tranche-level report against the DW) alongside a writer thread that commits
+ReportExecutionLog rows the way report executions do.
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --duration 10
+
+Expect the tuned profile to win on the write side only: log commits/s rise
+several-fold (e.g. 97.5 -> 331.5 on the sample data), because WAL commits do not
+wait for readers and NORMAL skips an fsync per commit. Report executions/s and
+latency stay within noise (e.g. 950 -> 922.5 exec/s, p95 17.0 -> 21.8 ms): the
+sample warehouse sits in the page cache and each execution is bound by CPU and
+the GIL, not by I/O or locking, and the tuned writer competes for the GIL
+with its higher commit rate.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Point the app at throwaway databases before it is imported
+WORK_DIR = tempfile.mkdtemp(prefix="sqlite_bench_")
+os.environ["DW_DATABASE_PATH"] = os.path.join(WORK_DIR, "data_warehouse.db")
+os.environ["CONFIG_DATABASE_PATH"] = os.path.join(WORK_DIR, "config.db")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.features.calculations.models import Calculation
+from app.features.datawarehouse.models import Deal
+from app.features.reports.models import ReportExecutionLog
+from app.shared.query_engine import QueryEngine
+
+# SQLite's own defaults: rollback journal, full fsync, small page cache
+BASELINE_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL", "mmap_size": "0", "temp_store": "DEFAULT"}
+
+def build_profiles():
+    """Get the connection profiles to compare as name -> (dw pragmas, config pragmas)"""
+    return {
+        "baseline": (BASELINE_PRAGMAS, BASELINE_PRAGMAS),
+        "tuned": (database.get_sqlite_pragmas(query_only=True), database.get_sqlite_pragmas()),
+    }
+
+def make_session_factory(path, pragmas):
+    engine = create_engine(f"sqlite:///{path}", echo=False, pool_size=32)
+    database.apply_sqlite_pragmas(engine, pragmas)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def seed():
+    """Create and seed the throwaway databases with the application's sample data"""
+    asyncio.run(database.create_dw_tables())
+    asyncio.run(database.create_config_tables())
+    asyncio.run(database.seed_sample_data())
+    asyncio.run(database.seed_default_calculations())
+    # Release seeding connections so each profile can switch journal mode
+    for session_factory in (database.DWSessionLocal, database.DWWriteSessionLocal, database.ConfigSessionLocal):
+        session_factory.kw["bind"].dispose()
+
+def run_profile(name, dw_pragmas, config_pragmas, readers, duration, cycle_code):
+    dw_engine, DWSession = make_session_factory(database.DW_DATABASE_PATH, dw_pragmas)
+    config_engine, ConfigSession = make_session_factory(database.CONFIG_DATABASE_PATH, config_pragmas)
+
+    with DWSession() as dw:
+        deal_numbers = [deal.dl_nbr for deal in dw.query(Deal).all()]
+
+    stop = threading.Event()
+    latencies = []
+    errors = {"read": 0, "write": 0}
+    writes = [0]
+    lock = threading.Lock()
+
+    def reader():
+        dw, config = DWSession(), ConfigSession()
+        engine = QueryEngine(dw, config)
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    calculations = config.query(Calculation).filter(Calculation.is_active == True).all()
+                    engine.execute_report_query(
+                        deal_numbers=deal_numbers,
+                        tranche_ids=[],
+                        cycle_codes=[cycle_code],
+                        calculations=calculations,
+                        aggregation_level="tranche"
+                    )
+                    config.rollback()
+                except OperationalError:
+                    config.rollback()
+                    with lock:
+                        errors["read"] += 1
+                    continue
+                with lock:
+                    latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            dw.close()
+            config.close()
+
+    def writer():
+        config = ConfigSession()
+        try:
+            while not stop.is_set():
+                try:
+                    config.add(ReportExecutionLog(
+                        report_id=1, cycle_code=cycle_code, executed_by="benchmark",
+                        execution_time_ms=0.0, row_count=0, success=True
+                    ))
+                    config.commit()
+                    writes[0] += 1
+                except OperationalError:
+                    config.rollback()
+                    errors["write"] += 1
+        finally:
+            config.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    with dw_engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+    dw_engine.dispose()
+    config_engine.dispose()
+
+    latencies.sort()
+    return {
+        "profile": name,
+        "journal_mode": journal_mode,
+        "executions": len(latencies),
+        "executions_per_sec": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) if latencies else None,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] if latencies else None,
+        "log_commits_per_sec": writes[0] / duration,
+        "read_errors": errors["read"],
+        "write_errors": errors["write"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent report executions")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run each profile")
+    parser.add_argument("--cycle", type=int, default=202412, help="Cycle code to execute")
+    args = parser.parse_args()
+
+    print(f"Seeding benchmark databases in {WORK_DIR}")
+    seed()
+
+    results = [
+        run_profile(name, dw_pragmas, config_pragmas, args.readers, args.duration, args.cycle)
+        for name, (dw_pragmas, config_pragmas) in build_profiles().items()
+    ]
+
+    print(f"\n{args.readers} readers + 1 log writer, {args.duration:.0f}s per profile")
+    print(f"{'profile':<18}{'exec/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'commits/s':>12}{'rd err':>8}{'wr err':>8}")
+    for r in results:
+        print(
+            f"{r['profile'] + ' (' + r['journal_mode'] + ')':<18}{r['executions_per_sec']:>10.1f}{r['p50_ms'] or 0:>10.1f}{r['p95_ms'] or 0:>10.1f}"
+            f"{r['log_commits_per_sec']:>12.1f}{r['read_errors']:>8}{r['write_errors']:>8}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for the reporting system databases
+
+    python manage.py create-indexes [--database dw|config|all]
+    python manage.py build-rollups [--cycle 202401 ...]
+    python manage.py refresh-cycle --cycle 202501 [--cycle ...]
+    python manage.py ingest tranchebal balances_202501.csv [more files ...]
+    python manage.py generate --deals 10000 --cycles 120 --seed 42 --replace
+"""
+import argparse
+import asyncio
+import sys
+
+def create_indexes(args):
+    """Create declared indexes missing from existing database files"""
+    from app.core.database import (
+        DWBase, ConfigBase, create_dw_engine, create_config_engine, ensure_indexes
+    )
+    # Register models with their bases
+    from app.features.datawarehouse.models import Deal, Tranche, TrancheBal
+    from app.features.calculations.models import Calculation
+    from app.features.reports.models import Report, ReportExecutionLog
+    
+    targets = {
+        "dw": (DWBase.metadata, lambda: create_dw_engine(query_only=False)),
+        "config": (ConfigBase.metadata, create_config_engine),
+    }
+    selected = targets if args.database == "all" else {args.database: targets[args.database]}
+    
+    for name, (metadata, engine_factory) in selected.items():
+        engine = engine_factory()
+        try:
+            created = ensure_indexes(metadata, engine)
+        finally:
+            engine.dispose()
+        
+        if created:
+            print(f"✅ {name}: created {', '.join(created)}")
+        else:
+            print(f"✅ {name}: all declared indexes present")
+
+def build_rollups(args):
+    """Rebuild deal rollups for the given cycles (all cycles by default)"""
+    from app.core.database import DWWriteSessionLocal, ConfigSessionLocal
+    from app.features.calculations.dao import CalculationDAO
+    from app.features.datawarehouse.rollups import get_weighted_pairs, refresh_rollups
+    
+    db = DWWriteSessionLocal()
+    config_db = ConfigSessionLocal()
+    try:
+        weighted_pairs = get_weighted_pairs(CalculationDAO(config_db).get_all_calculations())
+        result = refresh_rollups(db, args.cycle or None, weighted_pairs)
+    finally:
+        db.close()
+        config_db.close()
+    
+    print(f"✅ Built {result['rollup_rows']} rollup rows for {len(result['cycles'])} cycles "
+          f"({len(result['measures'])} measures)")
+
+def refresh_cycle(args):
+    """Register newly loaded cycles and refresh only the state derived from them"""
+    from app.core.database import DWWriteSessionLocal, ConfigSessionLocal
+    from app.features.calculations.dao import CalculationDAO
+    from app.features.datawarehouse.cycles import refresh_cycle as refresh_loaded_cycle
+    from app.features.datawarehouse.rollups import get_weighted_pairs
+    
+    db = DWWriteSessionLocal()
+    config_db = ConfigSessionLocal()
+    try:
+        weighted_pairs = get_weighted_pairs(CalculationDAO(config_db).get_all_calculations())
+        for cycle_code in args.cycle:
+            result = refresh_loaded_cycle(db, cycle_code, weighted_pairs)
+            print(f"✅ {cycle_code}: {result['row_count']} rows, {result['deal_count']} deals, "
+                  f"{result['rollup_rows']} rollup rows")
+    finally:
+        db.close()
+        config_db.close()
+    
+    # Cached report results live in the API process; use the refresh endpoint to drop them too
+    print("ℹ️  Running API servers keep cached results; prefer POST /api/datawarehouse/cycles/{cycle}/refresh")
+
+def ingest(args):
+    """Bulk load CSV/NDJSON/Parquet files into a warehouse table"""
+    from app.core.database import DWWriteSessionLocal, ConfigSessionLocal
+    from app.features.calculations.dao import CalculationDAO
+    from app.features.datawarehouse.cycles import refresh_cycle as refresh_loaded_cycle
+    from app.features.datawarehouse.ingest import infer_format, ingest_records, iter_records
+    from app.features.datawarehouse.rollups import get_weighted_pairs, refresh_rollups
+    from app.features.datawarehouse.schemas import IngestFormat, IngestTable
+    
+    table = IngestTable(args.table)
+    db = DWWriteSessionLocal()
+    config_db = ConfigSessionLocal()
+    
+    def refresh(cycle_codes):
+        weighted_pairs = get_weighted_pairs(CalculationDAO(config_db).get_all_calculations())
+        if table == IngestTable.tranchebal:
+            for cycle_code in cycle_codes:
+                refresh_loaded_cycle(db, cycle_code, weighted_pairs)
+            print(f"✅ Refreshed cycles: {', '.join(str(code) for code in cycle_codes)}")
+        else:
+            # Deal and tranche rows feed the rollups of every cycle
+            result = refresh_rollups(db, None, weighted_pairs)
+            print(f"✅ Rebuilt rollups for {len(result['cycles'])} cycles")
+    
+    # Rows committed so far are refreshed even if a later file fails
+    committed_cycles = set()
+    try:
+        try:
+            for path in args.files:
+                input_format = IngestFormat(args.format) if args.format else infer_format(path)
+                with open(path, "rb") as source:
+                    result = ingest_records(
+                        db, table, iter_records(source, input_format),
+                        upsert=not args.no_upsert, batch_size=args.batch_size,
+                        committed_cycles=committed_cycles
+                    )
+                print(f"✅ {path}: {result['rows']} rows into {result['table']}")
+        except Exception:
+            if (committed_cycles or table != IngestTable.tranchebal) and not args.skip_refresh:
+                try:
+                    refresh(sorted(committed_cycles))
+                except Exception as e:
+                    print(f"⚠️  Refresh after failed ingest failed: {e}")
+            raise
+        
+        if (committed_cycles or table != IngestTable.tranchebal) and not args.skip_refresh:
+            refresh(sorted(committed_cycles))
+        # Cached report results live in the API process, which cannot see this load
+        print("ℹ️  Running API servers keep cached results; POST /api/reports/cache/clear (or restart them) to drop them")
+    finally:
+        db.close()
+        config_db.close()
+
+def generate(args):
+    """Generate a synthetic warehouse for scale testing (requires numpy)"""
+    from app.core.database import (
+        DWWriteSessionLocal, ConfigSessionLocal, create_dw_tables, create_config_tables, seed_default_calculations
+    )
+    from app.features.calculations.dao import CalculationDAO
+    from app.features.datawarehouse.cycles import refresh_cycle as refresh_loaded_cycle
+    from app.features.datawarehouse.generator import clear_warehouse, generate_warehouse
+    from app.features.datawarehouse.rollups import get_weighted_pairs
+    
+    # Fresh files get the full schema and default calculations, ready for the API
+    asyncio.run(create_dw_tables())
+    asyncio.run(create_config_tables())
+    asyncio.run(seed_default_calculations())
+    
+    structures = [s.split(",") for s in args.structures.split(";")] if args.structures else None
+    
+    if args.skip_refresh:
+        # Without registry entries and rollups, reports silently fall back to scanning tranchebal
+        print("⚠️  --skip-refresh: generated cycles get no registry entries or rollups, so deal reports scan "
+              "tranchebal; run 'python manage.py refresh-cycle --cycle <code> ...' (or restart the API) to build them")
+    
+    db = DWWriteSessionLocal()
+    config_db = ConfigSessionLocal()
+    try:
+        if args.replace:
+            clear_warehouse(db)
+        
+        def progress(cycle_code, index, rows):
+            if (index + 1) % 12 == 0 or index + 1 == args.cycles:
+                print(f"  {cycle_code}: {rows:,} balance rows")
+        
+        result = generate_warehouse(
+            db,
+            deal_count=args.deals,
+            cycle_count=args.cycles,
+            start_cycle=args.start_cycle,
+            first_deal=args.first_deal,
+            structures=structures,
+            seed=args.seed,
+            progress=progress
+        )
+        print(f"✅ Generated {result['deals']:,} deals, {result['tranches']:,} tranches and "
+              f"{result['balance_rows']:,} balance rows in {result['elapsed_seconds']:.1f}s")
+        
+        if not args.skip_refresh:
+            weighted_pairs = get_weighted_pairs(CalculationDAO(config_db).get_all_calculations())
+            for cycle_code in result["cycles"]:
+                refresh_loaded_cycle(db, cycle_code, weighted_pairs)
+            print(f"✅ Registered {len(result['cycles'])} cycles and built their rollups")
+        
+        # Cached report results live in the API process and still reflect the previous warehouse
+        print("ℹ️  Restart running API servers or POST /api/reports/cache/clear to drop their cached results")
+    finally:
+        db.close()
+        config_db.close()
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Reporting system maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    indexes = subparsers.add_parser("create-indexes", help=create_indexes.__doc__)
+    indexes.add_argument("--database", choices=["dw", "config", "all"], default="all")
+    indexes.set_defaults(func=create_indexes)
+    
+    rollups = subparsers.add_parser("build-rollups", help=build_rollups.__doc__)
+    rollups.add_argument("--cycle", type=int, action="append", help="Cycle code to rebuild (repeatable)")
+    rollups.set_defaults(func=build_rollups)
+    
+    cycle = subparsers.add_parser("refresh-cycle", help=refresh_cycle.__doc__)
+    cycle.add_argument("--cycle", type=int, action="append", required=True, help="Loaded cycle code (repeatable)")
+    cycle.set_defaults(func=refresh_cycle)
+    
+    load = subparsers.add_parser("ingest", help=ingest.__doc__)
+    load.add_argument("table", choices=["deal", "tranche", "tranchebal"])
+    load.add_argument("files", nargs="+", help="Input files (format inferred from extension)")
+    load.add_argument("--format", choices=["csv", "ndjson", "parquet"], help="Override the input format")
+    load.add_argument("--no-upsert", action="store_true", help="Fail on existing primary keys instead of updating")
+    load.add_argument("--batch-size", type=int, help="Rows per executemany batch")
+    load.add_argument("--skip-refresh", action="store_true", help="Do not refresh derived state for loaded cycles")
+    load.set_defaults(func=ingest)
+    
+    synth = subparsers.add_parser("generate", help=generate.__doc__)
+    synth.add_argument("--deals", type=int, default=1000, help="Number of deals")
+    synth.add_argument("--cycles", type=int, default=24, help="Number of monthly cycles")
+    synth.add_argument("--start-cycle", type=int, default=202301, help="First cycle code (YYYYMM)")
+    synth.add_argument("--first-deal", type=int, default=101, help="First deal number")
+    synth.add_argument("--structures", help="Tranche structures, e.g. 'A1,A2,B,C;A,B' (defaults to the seed structures)")
+    synth.add_argument("--seed", type=int, help="RNG seed for a reproducible warehouse")
+    synth.add_argument("--replace", action="store_true", help="Delete existing warehouse rows first")
+    synth.add_argument("--skip-refresh", action="store_true", help="Do not register cycles or build rollups (reports scan raw rows until refreshed)")
+    synth.set_defaults(func=generate)
+    
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
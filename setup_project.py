@@ -66,6 +66,40 @@ python-dotenv==1.0.0
 DW_DATABASE_PATH=./data_warehouse.db
 CONFIG_DATABASE_PATH=./config.db
 
+# SQLite connection profile (applied on connect to both databases)
+# The gain is on the write side: WAL lets execution-log commits proceed without
+# blocking readers. Read throughput of report queries is essentially unchanged.
+SQLITE_JOURNAL_MODE=WAL
+SQLITE_SYNCHRONOUS=NORMAL
+SQLITE_CACHE_SIZE=-65536
+SQLITE_MMAP_SIZE=268435456
+SQLITE_TEMP_STORE=MEMORY
+SQLITE_BUSY_TIMEOUT_MS=5000
+DW_QUERY_ONLY=true
+DW_COVERING_INDEXES=false
+DW_ENSURE_INDEXES_ON_STARTUP=true
+
+# Request and execution metrics served at /metrics
+METRICS_ENABLED=true
+
+# Share one computation between concurrent identical report executions
+SINGLE_FLIGHT_ENABLED=true
+
+# Split wide reports and large deal selections into partial queries run in parallel (1 = disabled)
+DW_PARALLEL_WORKERS=1
+DW_PARALLEL_MIN_CALCULATIONS=8
+DW_SHARD_MIN_DEALS=500
+DW_SHARD_MIN_ROWS=50000
+
+# Selected deals + tranches from which filters are loaded into session temp tables
+DW_TEMP_FILTER_THRESHOLD=1000
+
+# Background report jobs
+JOB_WORKER_CONCURRENCY=2
+JOB_RESULTS_DIR=./job_results
+# Hours a finished job's result is kept before it is purged (0 = until the job is deleted)
+JOB_RESULT_TTL_HOURS=168
+
 # API Configuration
 API_HOST=0.0.0.0
 API_PORT=8000
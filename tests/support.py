@@ -0,0 +1,68 @@
+# tests/support.py
+"""Shared test setup: one throwaway warehouse, config database and job results
+directory per test run.
+
+Import this module before any ``app`` module so the engines are created
+against the temporary paths.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+WORK_DIR = tempfile.mkdtemp(prefix="report_builder_tests_")
+os.environ["DW_DATABASE_PATH"] = os.path.join(WORK_DIR, "dw.db")
+os.environ["CONFIG_DATABASE_PATH"] = os.path.join(WORK_DIR, "config.db")
+os.environ["JOB_RESULTS_DIR"] = os.path.join(WORK_DIR, "job_results")
+
+# Sample data covers deals 101-150 over cycles 202301-202412
+SAMPLE_DEALS = list(range(101, 111))
+SAMPLE_CYCLE = 202410
+
+_client = None
+
+
+def start_app():
+    """Start the application (tables, sample data, job workers); call from ``setUpModule``"""
+    global _client
+    if _client is None:
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        client = TestClient(app)
+        with contextlib.redirect_stdout(io.StringIO()):
+            client.__enter__()
+        _client = client
+    return _client
+
+
+def stop_app():
+    """Stop the application started by ``start_app``; call from ``tearDownModule``"""
+    global _client
+    if _client is not None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _client.__exit__(None, None, None)
+        _client = None
+
+
+def get_client():
+    """Get the test client of the running application"""
+    assert _client is not None, "call support.start_app() from setUpModule first"
+    return _client
+
+
+def create_template(name: str, aggregation_level: str = "tranche", calculations=None) -> int:
+    """Create a report template over the sample deals; returns its id"""
+    client = get_client()
+    if calculations is None:
+        calculations = [calc["name"] for calc in client.get("/api/calculations").json()]
+    response = client.post("/api/reports/templates", json={
+        "name": name,
+        "aggregation_level": aggregation_level,
+        "selected_deals": SAMPLE_DEALS,
+        "selected_tranches": ["A", "B"],
+        "selected_calculations": calculations
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
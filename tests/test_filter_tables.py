@@ -0,0 +1,91 @@
+# tests/test_filter_tables.py
+"""Temp-table filters must keep selections past SQLite's variable limit executable.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import sqlite3
+import unittest
+
+import support
+from app.core.database import DWSessionLocal, DWWriteSessionLocal
+from app.features.calculations.models import AggregationFunction, Calculation, GroupLevel, SourceModel
+from app.features.datawarehouse.cycles import refresh_cycle
+from app.features.datawarehouse.models import Deal, Tranche, TrancheBal
+from app.shared.constants import QueryPlan
+from app.shared.query_engine import QueryEngine
+
+# Outside the sample data's deals and cycles
+CYCLE = 209901
+DEALS = [9101, 9102]
+
+
+def setUpModule():
+    support.start_app()
+
+
+def tearDownModule():
+    support.stop_app()
+
+
+def get_variable_limit() -> int:
+    connection = sqlite3.connect(":memory:")
+    try:
+        return connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    finally:
+        connection.close()
+
+
+class TempTableFilterTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with DWWriteSessionLocal() as db:
+            for deal in DEALS:
+                db.add(Deal(dl_nbr=deal, issr_cde="ISSUER", cdi_file_nme="FILE"))
+                for tranche, balance in (("A", 1000), ("B", 500)):
+                    db.add(Tranche(dl_nbr=deal, tr_id=tranche, tr_cusip_id=f"{deal}{tranche}"))
+                    db.add(TrancheBal(
+                        dl_nbr=deal, tr_id=tranche, cycle_cde=CYCLE,
+                        tr_end_bal_amt=balance * deal, tr_prin_rel_ls_amt=0, tr_pass_thru_rte=0.05,
+                        tr_accrl_days=30, tr_int_dstrb_amt=0, tr_prin_dstrb_amt=0,
+                        tr_int_accrl_amt=0, tr_int_shtfl_amt=0
+                    ))
+            db.commit()
+            refresh_cycle(db, CYCLE)
+
+        cls.calculation = Calculation(
+            id=1_000, name="Total Ending Balance", aggregation_function=AggregationFunction.SUM,
+            source_model=SourceModel.TRANCHE_BAL, source_field="tr_end_bal_amt", group_level=GroupLevel.DEAL
+        )
+
+    def setUp(self):
+        self.dw_db = DWSessionLocal()
+        self.engine = QueryEngine(self.dw_db, None)
+        # Real deals plus enough unknown ones to exceed the bound-variable limit
+        self.deal_numbers = DEALS + list(range(1_000_000, 1_000_000 + get_variable_limit() + 1))
+
+    def tearDown(self):
+        self.dw_db.close()
+
+    def test_rollup_plan_over_variable_limit(self):
+        plan = QueryPlan.GROUPED
+        self.assertTrue(self.engine._can_use_rollups(DEALS, ["A", "B"], [CYCLE], [self.calculation], "deal"))
+
+        rows = self.engine.execute_report_query(
+            self.deal_numbers, ["A", "B"], [CYCLE], [self.calculation], "deal"
+        )
+        expected = self.engine.execute_report_query(
+            DEALS, ["A", "B"], [CYCLE], [self.calculation], "deal", plan
+        )
+        self.assertEqual(sorted(tuple(row) for row in rows), sorted(tuple(row) for row in expected))
+
+    def test_explain_preview_over_variable_limit(self):
+        preview = self.engine.preview_report_sql(
+            "large", "deal", self.deal_numbers, ["A", "B"], CYCLE, [self.calculation], explain=True
+        )
+        self.assertEqual(preview["filter_strategy"], "temp_table")
+        self.assertEqual(preview["explain"]["plan"], QueryPlan.ROLLUP.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
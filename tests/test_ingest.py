@@ -0,0 +1,169 @@
+# tests/test_ingest.py
+"""Bulk ingestion: record coercion, upsert semantics and post-load refresh.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import io
+import unittest
+
+import support
+from app.core.database import ConfigSessionLocal, DWWriteSessionLocal
+from app.core.exceptions import DataWarehouseError
+from app.features.datawarehouse.ingest import _build_coercer, ingest_records, iter_records
+from app.features.datawarehouse.models import Deal, TrancheBal
+from app.features.datawarehouse.schemas import IngestFormat, IngestTable
+from app.features.datawarehouse.service import DataWarehouseService
+from app.shared.result_cache import result_cache
+
+# Outside the sample data's deals and cycles
+DEAL = 9201
+CYCLE = 209902
+
+BALANCE_HEADER = (
+    "dl_nbr,tr_id,cycle_cde,tr_end_bal_amt,tr_prin_rel_ls_amt,tr_pass_thru_rte,tr_accrl_days,"
+    "tr_int_dstrb_amt,tr_prin_dstrb_amt,tr_int_accrl_amt,tr_int_shtfl_amt\n"
+)
+
+
+def setUpModule():
+    support.start_app()
+    with DWWriteSessionLocal() as db:
+        ingest_records(db, IngestTable.deal, csv_source(
+            f"dl_nbr,issr_cde,cdi_file_nme,CDB_cdi_file_nme\n{DEAL},ISSUER,FILE,CDBFILE\n"
+        ))
+        ingest_records(db, IngestTable.tranche, csv_source(
+            f"dl_nbr,tr_id,tr_cusip_id\n{DEAL},A,{DEAL}A\n{DEAL},B,{DEAL}B\n"
+        ))
+
+
+def tearDownModule():
+    support.stop_app()
+
+
+def csv_source(text: str):
+    return iter_records(io.BytesIO(text.encode("utf-8")), IngestFormat.csv)
+
+
+def balance_line(tranche: str, balance="1000", rate="0.05") -> str:
+    return f"{DEAL},{tranche},{CYCLE},{balance},0,{rate},30,0,0,0,0\n"
+
+
+class CoercionTest(unittest.TestCase):
+    def setUp(self):
+        self.coerce = _build_coercer(TrancheBal)
+
+    def test_converts_to_column_types(self):
+        row = self.coerce({"dl_nbr": "1", "tr_id": "A", "cycle_cde": "202401", "tr_end_bal_amt": "12.5"})
+        self.assertEqual(row, {"dl_nbr": 1, "tr_id": "A", "cycle_cde": 202401, "tr_end_bal_amt": 12.5})
+
+    def test_empty_value_is_null_and_missing_column_is_omitted(self):
+        row = self.coerce({"dl_nbr": 1, "tr_pass_thru_rte": "", "unknown": "x"})
+        self.assertEqual(row, {"dl_nbr": 1, "tr_pass_thru_rte": None})
+
+    def test_invalid_value_raises(self):
+        with self.assertRaises(DataWarehouseError):
+            self.coerce({"dl_nbr": "one"})
+
+
+class IngestTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DWWriteSessionLocal()
+        self.addCleanup(self.db.close)
+        self.db.query(TrancheBal).filter(TrancheBal.dl_nbr == DEAL).delete()
+        self.db.commit()
+
+    def load_balances(self, lines: str, **kwargs):
+        return ingest_records(self.db, IngestTable.tranchebal, csv_source(BALANCE_HEADER + lines), **kwargs)
+
+    def get_balance(self, tranche: str) -> TrancheBal:
+        self.db.expire_all()
+        return self.db.get(TrancheBal, (DEAL, tranche, CYCLE))
+
+    def test_insert_reports_rows_and_cycles(self):
+        committed_cycles = set()
+        result = self.load_balances(
+            balance_line("A") + balance_line("B", balance="500"),
+            batch_size=1, commit_rows=1, committed_cycles=committed_cycles
+        )
+        self.assertEqual((result["rows"], result["cycle_codes"]), (2, [CYCLE]))
+        self.assertEqual(committed_cycles, {CYCLE})
+        self.assertEqual(self.get_balance("B").tr_end_bal_amt, 500)
+
+    def test_upsert_replaces_restated_rows(self):
+        self.load_balances(balance_line("A"))
+        self.load_balances(balance_line("A", balance="900", rate="0.07"))
+
+        balance = self.get_balance("A")
+        self.assertEqual((balance.tr_end_bal_amt, balance.tr_pass_thru_rte), (900, 0.07))
+
+    def test_upsert_keeps_columns_the_record_omits(self):
+        ingest_records(self.db, IngestTable.deal, csv_source(f"dl_nbr,issr_cde,cdi_file_nme\n{DEAL},RESTATED,FILE\n"))
+
+        self.db.expire_all()
+        deal = self.db.get(Deal, DEAL)
+        self.assertEqual(deal.issr_cde.strip(), "RESTATED")
+        self.assertEqual(deal.CDB_cdi_file_nme.strip(), "CDBFILE")
+
+    def test_mixed_column_sets_in_one_batch(self):
+        records = [
+            {"dl_nbr": DEAL + 1, "issr_cde": "ISSUER", "cdi_file_nme": "FILE"},
+            {"dl_nbr": DEAL + 2, "issr_cde": "ISSUER", "cdi_file_nme": "FILE", "CDB_cdi_file_nme": "CDB"},
+        ]
+        result = ingest_records(self.db, IngestTable.deal, records)
+
+        self.assertEqual(result["rows"], 2)
+        self.assertIsNone(self.db.get(Deal, DEAL + 1).CDB_cdi_file_nme)
+        self.assertEqual(self.db.get(Deal, DEAL + 2).CDB_cdi_file_nme.strip(), "CDB")
+
+    def test_insert_without_upsert_rejects_existing_rows(self):
+        self.load_balances(balance_line("A"))
+        with self.assertRaises(DataWarehouseError):
+            self.load_balances(balance_line("A"), upsert=False)
+
+    def test_failure_keeps_committed_cycles(self):
+        committed_cycles = set()
+        with self.assertRaises(DataWarehouseError):
+            self.load_balances(
+                balance_line("A") + balance_line("B", balance="not-a-number"),
+                batch_size=1, commit_rows=1, committed_cycles=committed_cycles
+            )
+        self.assertEqual(committed_cycles, {CYCLE})
+        self.assertIsNotNone(self.get_balance("A"))
+
+
+class IngestRefreshTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DWWriteSessionLocal()
+        self.config_db = ConfigSessionLocal()
+        self.addCleanup(self.db.close)
+        self.addCleanup(self.config_db.close)
+        self.service = DataWarehouseService(self.db, self.config_db)
+
+    def ingest(self, table: IngestTable, text: str):
+        return DataWarehouseService.ingest.__wrapped__(
+            self.service, table, io.BytesIO(text.encode("utf-8")), IngestFormat.csv
+        )
+
+    def test_deal_load_clears_result_cache(self):
+        result_cache.put(("report", 1), object(), size=1, report_id=1, cycle_codes=[CYCLE], calculation_ids=[1])
+
+        self.ingest(IngestTable.deal, f"dl_nbr,issr_cde,cdi_file_nme\n{DEAL},ISSUER,FILE\n")
+
+        self.assertEqual(result_cache.stats()["size"], 0)
+
+    def test_tranchebal_load_refreshes_its_cycles(self):
+        result_cache.put(("report", 2), object(), size=1, report_id=2, cycle_codes=[CYCLE], calculation_ids=[1])
+
+        result = self.ingest(IngestTable.tranchebal, BALANCE_HEADER + balance_line("A"))
+
+        self.assertEqual(result["refreshed_cycles"], [CYCLE])
+        self.assertIsNone(result_cache.get(("report", 2)))
+
+    def test_failed_load_raises_load_error(self):
+        with self.assertRaisesRegex(DataWarehouseError, "tranchebal"):
+            self.ingest(IngestTable.tranchebal, BALANCE_HEADER + balance_line("A", balance="bad"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+# tests/test_jobs.py
+"""Background report jobs: submit, poll, fetch, cancel, delete and result retention.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import os
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import create_engine, inspect
+
+import support
+from app.core.database import ConfigSessionLocal, drop_removed_columns
+from app.features.jobs.models import JobStatus, ReportJob
+from app.features.jobs.store import job_result_store
+from app.features.jobs.worker import JobRunner, job_runner
+from app.features.reports.service import ReportService
+from app.shared.result_cache import result_cache
+
+
+def setUpModule():
+    support.start_app()
+
+
+def tearDownModule():
+    support.stop_app()
+
+
+def submit_job(report_id: int) -> str:
+    response = support.get_client().post("/api/jobs", json={"report_id": report_id, "cycle_code": support.SAMPLE_CYCLE})
+    assert response.status_code == 202, response.text
+    return response.json()["id"]
+
+
+def wait_for_job(job_id: str, *statuses: JobStatus) -> dict:
+    """Poll a job until it reaches one of the statuses (any finished status by default)"""
+    statuses = statuses or (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+    deadline = time.monotonic() + 10
+    while True:
+        job = support.get_client().get(f"/api/jobs/{job_id}").json()
+        if job["status"] in statuses or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+class JobLifecycleTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = support.get_client()
+        cls.report_id = support.create_template("background job")
+
+    def run_to_completion(self) -> dict:
+        return wait_for_job(submit_job(self.report_id))
+
+    def test_submitted_job_succeeds_with_result(self):
+        job = self.run_to_completion()
+
+        self.assertEqual(job["status"], JobStatus.SUCCEEDED)
+        self.assertTrue(job["has_result"])
+        self.assertEqual((job["cycles_total"], job["attempts"]), (1, 1))
+
+        result = self.client.get(f"/api/jobs/{job['id']}/result")
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.json()["row_count"], job["row_count"])
+
+    def test_unknown_report_is_rejected(self):
+        response = self.client.post("/api/jobs", json={"report_id": 999_999, "cycle_code": support.SAMPLE_CYCLE})
+        self.assertEqual(response.status_code, 404)
+
+    def test_finished_job_cannot_be_cancelled(self):
+        job = self.run_to_completion()
+        self.assertEqual(self.client.post(f"/api/jobs/{job['id']}/cancel").status_code, 409)
+
+    def test_cancelled_running_job_discards_result(self):
+        result_cache.clear()
+        started = threading.Event()
+        release = threading.Event()
+        discarded = threading.Event()
+        original = ReportService._compute_report
+
+        def blocking_compute(service, prepared):
+            started.set()
+            release.wait(10)
+            return original(service, prepared)
+
+        def delete(path):
+            os.remove(path)
+            discarded.set()
+
+        with mock.patch.object(ReportService, "_compute_report", autospec=True, side_effect=blocking_compute), \
+                mock.patch.object(job_runner.store, "delete", side_effect=delete):
+            job_id = submit_job(self.report_id)
+            self.assertTrue(started.wait(10))
+            cancelled = self.client.post(f"/api/jobs/{job_id}/cancel")
+            release.set()
+            # The worker finishes executing before it notices the cancellation
+            self.assertTrue(discarded.wait(10))
+
+        self.assertEqual(cancelled.json()["status"], JobStatus.CANCELLED)
+        self.assertFalse(os.path.exists(job_result_store.path_for(job_id)))
+        self.assertEqual(self.client.get(f"/api/jobs/{job_id}/result").status_code, 409)
+
+    def test_delete_removes_job_and_result(self):
+        job = self.run_to_completion()
+        with ConfigSessionLocal() as config_db:
+            result_path = config_db.get(ReportJob, job["id"]).result_path
+
+        self.assertEqual(self.client.delete(f"/api/jobs/{job['id']}").status_code, 200)
+        self.assertFalse(os.path.exists(result_path))
+        self.assertEqual(self.client.get(f"/api/jobs/{job['id']}").status_code, 404)
+
+
+class ResultRetentionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = support.get_client()
+        cls.report_id = support.create_template("retained job")
+
+    def run_job(self) -> str:
+        job = wait_for_job(submit_job(self.report_id))
+        self.assertEqual(job["status"], JobStatus.SUCCEEDED)
+        return job["id"]
+
+    def age(self, job_id: str, hours: float) -> str:
+        """Backdate a finished job and its result file; returns the result path"""
+        finished_at = datetime.now() - timedelta(hours=hours)
+        with ConfigSessionLocal() as config_db:
+            job = config_db.get(ReportJob, job_id)
+            job.finished_at = finished_at
+            config_db.commit()
+            result_path = job.result_path
+        os.utime(result_path, (finished_at.timestamp(), finished_at.timestamp()))
+        return result_path
+
+    def test_expired_results_are_purged(self):
+        expired_id, fresh_id = self.run_job(), self.run_job()
+        expired_path = self.age(expired_id, hours=3)
+        fresh_path = self.age(fresh_id, hours=1)
+
+        expired = JobRunner(result_ttl_hours=2).purge_expired_results()
+
+        self.assertEqual(expired, 1)
+        self.assertFalse(os.path.exists(expired_path))
+        self.assertTrue(os.path.exists(fresh_path))
+        self.assertFalse(self.client.get(f"/api/jobs/{expired_id}").json()["has_result"])
+        self.assertEqual(self.client.get(f"/api/jobs/{expired_id}/result").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/jobs/{fresh_id}/result").status_code, 200)
+
+    def test_orphaned_result_files_are_purged(self):
+        orphan = job_result_store.path_for("orphan").with_suffix(".json.partial")
+        orphan.parent.mkdir(parents=True, exist_ok=True)
+        with open(orphan, "w") as file:
+            file.write("{}")
+        stale = (datetime.now() - timedelta(hours=3)).timestamp()
+        os.utime(orphan, (stale, stale))
+
+        JobRunner(result_ttl_hours=2).purge_expired_results()
+
+        self.assertFalse(os.path.exists(orphan))
+
+
+class RemovedColumnsTest(unittest.TestCase):
+    def test_legacy_job_columns_are_dropped(self):
+        engine = create_engine(f"sqlite:///{os.path.join(support.WORK_DIR, 'legacy_config.db')}")
+        self.addCleanup(engine.dispose)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE TABLE report_jobs (id VARCHAR(32) PRIMARY KEY, "
+                "cycles_completed INTEGER NOT NULL, progress FLOAT NOT NULL)"
+            )
+
+        removed = {"report_jobs": ("cycles_completed", "progress"), "missing_table": ("column",)}
+        dropped = drop_removed_columns(engine, removed)
+
+        self.assertEqual(dropped, ["report_jobs.cycles_completed", "report_jobs.progress"])
+        self.assertEqual([column["name"] for column in inspect(engine).get_columns("report_jobs")], ["id"])
+        self.assertEqual(drop_removed_columns(engine, removed), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# tests/test_metrics.py
+"""Prometheus text rendering of the in-process metrics registry.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import unittest
+
+import support
+from app.core.metrics import MetricsRegistry
+
+
+def setUpModule():
+    support.start_app()
+
+
+def tearDownModule():
+    support.stop_app()
+
+
+class MetricsRenderTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_with_labels(self):
+        counter = self.registry.counter("jobs_total", "Jobs run", ("status",))
+        counter.inc("done")
+        counter.inc("done", amount=2)
+        counter.inc('fai"led')
+
+        self.assertEqual(self.registry.render().splitlines(), [
+            "# HELP jobs_total Jobs run",
+            "# TYPE jobs_total counter",
+            'jobs_total{status="done"} 3',
+            'jobs_total{status="fai\\"led"} 1',
+        ])
+
+    def test_unlabelled_metrics_render_zero(self):
+        self.registry.counter("events_total", "Events")
+        self.registry.gauge("queue_depth", "Queue depth")
+
+        lines = self.registry.render().splitlines()
+        self.assertIn("events_total 0", lines)
+        self.assertIn("queue_depth 0", lines)
+
+    def test_callback_metrics_read_at_scrape_time(self):
+        totals = {("result",): 1}
+        self.registry.counter("cache_hits_total", "Cache hits", ("cache",), lambda: dict(totals))
+        totals[("result",)] = 5
+
+        self.assertIn('cache_hits_total{cache="result"} 5', self.registry.render().splitlines())
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 2.0):
+            histogram.observe(value, "/x")
+
+        lines = self.registry.render().splitlines()
+        self.assertIn("# TYPE latency_seconds histogram", lines)
+        self.assertEqual(lines[2:], [
+            'latency_seconds_bucket{route="/x",le="0.1"} 1',
+            'latency_seconds_bucket{route="/x",le="1.0"} 3',
+            'latency_seconds_bucket{route="/x",le="+Inf"} 4',
+            'latency_seconds_sum{route="/x"} 3.05',
+            'latency_seconds_count{route="/x"} 4',
+        ])
+
+    def test_rejects_wrong_labels_and_duplicate_names(self):
+        counter = self.registry.counter("requests_total", "Requests", ("route",))
+        with self.assertRaises(ValueError):
+            counter.inc()
+        with self.assertRaises(ValueError):
+            self.registry.gauge("requests_total", "Requests")
+
+
+class MetricsEndpointTest(unittest.TestCase):
+    def test_cache_totals_are_counters(self):
+        response = support.get_client().get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("# TYPE cache_hits_total counter", response.text)
+        self.assertIn("# TYPE cache_misses_total counter", response.text)
+        self.assertIn('cache_hits_total{cache="result"}', response.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# tests/test_parallel_query.py
+"""Parallel partial queries: calculation partitions, deal shards and row merging.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import support  # noqa: F401 - configures the test databases before app imports
+from app.shared import parallel_query
+from app.shared.parallel_query import merge_partial_rows, partition_calculations, shard_deals
+
+
+def make_calculations(count: int, start: int = 1):
+    return [SimpleNamespace(id=calc_id, name=f"calc_{calc_id}") for calc_id in range(start, start + count)]
+
+
+class PartitionCalculationsTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(parallel_query, "DW_PARALLEL_MIN_CALCULATIONS", 4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_small_reports_stay_in_one_partition(self):
+        groups = [make_calculations(2), make_calculations(1, start=3)]
+        self.assertEqual(partition_calculations(groups, workers=4), [groups[0] + groups[1]])
+
+    def test_single_worker_keeps_one_partition(self):
+        groups = [make_calculations(10)]
+        self.assertEqual(partition_calculations(groups, workers=1), groups)
+
+    def test_groups_are_balanced_and_kept_whole(self):
+        groups = [make_calculations(3), make_calculations(3, start=4), make_calculations(2, start=7)]
+        partitions = partition_calculations(groups, workers=2)
+
+        self.assertEqual(sorted(len(partition) for partition in partitions), [3, 5])
+        for group in groups:
+            self.assertTrue(any(all(calc in partition for calc in group) for partition in partitions))
+
+    def test_large_group_is_split_across_workers(self):
+        group = make_calculations(12)
+        partitions = partition_calculations([group], workers=3)
+
+        self.assertEqual([len(partition) for partition in partitions], [4, 4, 4])
+        self.assertEqual(sorted(calc.id for partition in partitions for calc in partition), [calc.id for calc in group])
+
+
+class ShardDealsTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(parallel_query, "DW_SHARD_MIN_ROWS", 100)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_shards_are_contiguous_and_cover_every_deal(self):
+        deals = [105, 101, 103, 102, 104, 106, 101]
+        shards = shard_deals(deals, {deal: 100 for deal in deals}, workers=3)
+
+        self.assertEqual(shards, [[101, 102], [103, 104], [105, 106]])
+
+    def test_shards_balance_estimated_rows(self):
+        estimates = {101: 300, 102: 100, 103: 100, 104: 100}
+        shards = shard_deals(list(estimates), estimates, workers=2)
+
+        self.assertEqual(shards, [[101], [102, 103, 104]])
+
+    def test_shard_count_follows_estimated_rows(self):
+        deals = list(range(101, 111))
+        self.assertEqual(len(shard_deals(deals, {deal: 25 for deal in deals}, workers=8)), 2)
+        self.assertEqual(shard_deals(deals, {deal: 5 for deal in deals}, workers=8), [deals])
+
+    def test_shard_count_is_capped_by_workers(self):
+        deals = list(range(101, 111))
+        self.assertEqual(len(shard_deals(deals, {deal: 1_000 for deal in deals}, workers=4)), 4)
+        self.assertEqual(shard_deals(deals, {deal: 1_000 for deal in deals}, workers=1), [deals])
+
+
+class MergePartialRowsTest(unittest.TestCase):
+    def test_rows_merge_on_keys_in_consolidated_order(self):
+        calculations = make_calculations(3)
+        partitions = [[calculations[2]], [calculations[0], calculations[1]]]
+        partials = [
+            [(101, "A", 30), (101, "B", 31)],
+            [(101, "B", 11, 21), (101, "A", 10, 20), (102, "A", 12, 22)],
+        ]
+
+        rows = merge_partial_rows(("dl_nbr", "tr_id"), partitions, partials, calculations)
+
+        self.assertEqual(rows, [(101, "A", 10, 20, 30), (101, "B", 11, 21, 31), (102, "A", 12, 22, None)])
+
+    def test_merged_rows_support_attribute_access(self):
+        calculations = make_calculations(1)
+        row = merge_partial_rows(("dl_nbr",), [calculations], [[(101, 5)]], calculations)[0]
+
+        self.assertEqual((row.dl_nbr, row.calc_1), (101, 5))
+        with self.assertRaises(AttributeError):
+            row.missing
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# tests/test_report_schemas.py
+"""Cycle selection rules of report execution requests.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import unittest
+
+from pydantic import ValidationError
+
+from app.features.reports.schemas import ReportExecuteRequest
+
+
+class ReportExecuteRequestTest(unittest.TestCase):
+    def test_single_cycle(self):
+        request = ReportExecuteRequest(cycle_code=202401)
+        self.assertEqual(request.explicit_cycle_codes, [202401])
+        self.assertFalse(request.is_cycle_range)
+
+    def test_cycle_list_is_sorted_and_deduplicated(self):
+        request = ReportExecuteRequest(cycle_codes=[202403, 202401, 202403])
+        self.assertEqual(request.explicit_cycle_codes, [202401, 202403])
+
+    def test_cycle_range_resolves_later(self):
+        request = ReportExecuteRequest(cycle_start=202401, cycle_end=202406)
+        self.assertTrue(request.is_cycle_range)
+        self.assertIsNone(request.explicit_cycle_codes)
+        self.assertEqual(request.cycle_label, "202401-202406")
+
+    def test_requires_exactly_one_selection(self):
+        for selection in (
+            {},
+            {"cycle_code": 202401, "cycle_codes": [202402]},
+            {"cycle_code": 202401, "cycle_start": 202401, "cycle_end": 202402},
+        ):
+            with self.subTest(selection=selection), self.assertRaises(ValidationError):
+                ReportExecuteRequest(**selection)
+
+    def test_range_needs_both_ends_in_order(self):
+        for selection in ({"cycle_start": 202401}, {"cycle_end": 202401}, {"cycle_start": 202406, "cycle_end": 202401}):
+            with self.subTest(selection=selection), self.assertRaises(ValidationError):
+                ReportExecuteRequest(**selection)
+
+    def test_rejects_empty_cycle_list(self):
+        with self.assertRaises(ValidationError):
+            ReportExecuteRequest(cycle_codes=[])
+
+
+if __name__ == "__main__":
+    unittest.main()
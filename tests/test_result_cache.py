@@ -0,0 +1,89 @@
+# tests/test_result_cache.py
+"""Result cache eviction and invalidation.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import unittest
+
+from app.shared.result_cache import ResultCache, estimate_result_size
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResultCache(max_entries=10, max_bytes=100)
+
+    def put(self, key, size=10, report_id=1, cycle_codes=(202401,), calculation_ids=(1,)):
+        return self.cache.put(
+            key, f"result {key}", size=size, report_id=report_id,
+            cycle_codes=cycle_codes, calculation_ids=calculation_ids
+        )
+
+    def test_hit_and_miss_counters(self):
+        self.put("a")
+        self.assertEqual(self.cache.get("a"), "result a")
+        self.assertIsNone(self.cache.get("b"))
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_ratio"]), (1, 1, 0.5))
+
+    def test_evicts_least_recently_used_over_byte_limit(self):
+        self.put("a", size=40)
+        self.put("b", size=40)
+        self.cache.get("a")
+        self.put("c", size=40)
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), "result a")
+        self.assertEqual(self.cache.stats()["bytes"], 80)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_evicts_over_entry_limit(self):
+        cache = ResultCache(max_entries=2, max_bytes=100)
+        for key in "abc":
+            cache.put(key, key, size=1, report_id=1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_rejects_result_larger_than_cache(self):
+        self.assertFalse(self.put("huge", size=101))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_replacing_key_keeps_byte_total(self):
+        self.put("a", size=30)
+        self.put("a", size=50)
+        self.assertEqual(self.cache.stats()["bytes"], 50)
+
+    def test_invalidate_cycle(self):
+        self.put("a", cycle_codes=(202401, 202402))
+        self.put("b", cycle_codes=(202402,))
+        self.put("c", cycle_codes=(202403,))
+
+        self.assertEqual(self.cache.invalidate_cycle(202402), 2)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("c"), "result c")
+        self.assertEqual(self.cache.stats()["bytes"], 10)
+
+    def test_invalidate_report_and_calculation(self):
+        self.put("a", report_id=1, calculation_ids=(1, 2))
+        self.put("b", report_id=2, calculation_ids=(3,))
+
+        self.assertEqual(self.cache.invalidate_calculation(2), 1)
+        self.assertEqual(self.cache.invalidate_report(2), 1)
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_clear_returns_dropped_count(self):
+        self.put("a")
+        self.put("b")
+        self.assertEqual(self.cache.clear(), 2)
+        self.assertEqual(self.cache.stats()["bytes"], 0)
+
+    def test_size_estimate_grows_with_rows_and_columns(self):
+        self.assertEqual(estimate_result_size(0, 5), 0)
+        self.assertLess(estimate_result_size(10, 1), estimate_result_size(10, 2))
+        self.assertEqual(estimate_result_size(20, 3), 2 * estimate_result_size(10, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# tests/test_rollups.py
+"""Deal rollups must answer deal-level reports exactly like the raw balance rows.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import unittest
+
+import support
+from app.core.database import ConfigSessionLocal, DWSessionLocal
+from app.features.calculations.dao import CalculationDAO
+from app.features.datawarehouse import rollups
+from app.features.datawarehouse.models import Tranche
+from app.shared.constants import QueryPlan
+from app.shared.query_engine import QueryEngine
+
+CYCLES = [202401, 202402, 202403]
+
+
+def setUpModule():
+    support.start_app()
+
+
+def tearDownModule():
+    support.stop_app()
+
+
+class RollupPlanTest(unittest.TestCase):
+    def setUp(self):
+        self.dw_db = DWSessionLocal()
+        self.config_db = ConfigSessionLocal()
+        self.addCleanup(self.dw_db.close)
+        self.addCleanup(self.config_db.close)
+        self.engine = QueryEngine(self.dw_db, self.config_db)
+
+        self.calculations = [
+            calc for calc in CalculationDAO(self.config_db).get_all_calculations()
+            if rollups.is_rollup_eligible(calc)
+        ]
+        # Rollups aggregate whole deals, so select every tranche of the sample deals
+        self.tranche_ids = sorted({
+            tranche.tr_id for tranche in
+            self.dw_db.query(Tranche).filter(Tranche.dl_nbr.in_(support.SAMPLE_DEALS))
+        })
+
+    def execute(self, plan: QueryPlan):
+        rows = self.engine.execute_report_query(
+            support.SAMPLE_DEALS, self.tranche_ids, CYCLES, self.calculations, "deal", plan
+        )
+        return sorted(tuple(row) for row in rows)
+
+    def test_rollup_matches_grouped(self):
+        self.assertTrue(self.calculations)
+        self.assertTrue(self.engine._can_use_rollups(
+            support.SAMPLE_DEALS, self.tranche_ids, CYCLES, self.calculations, "deal"
+        ))
+
+        rollup_rows = self.execute(QueryPlan.ROLLUP)
+        grouped_rows = self.execute(QueryPlan.GROUPED)
+
+        self.assertEqual(len(rollup_rows), len(grouped_rows))
+        for rollup_row, grouped_row in zip(rollup_rows, grouped_rows):
+            self.assertEqual(rollup_row[:2], grouped_row[:2])
+            for rollup_value, grouped_value in zip(rollup_row[2:], grouped_row[2:]):
+                if grouped_value is None:
+                    self.assertIsNone(rollup_value)
+                else:
+                    self.assertAlmostEqual(rollup_value, grouped_value, places=6)
+
+    def test_partial_tranche_selection_skips_rollups(self):
+        self.assertFalse(self.engine._can_use_rollups(
+            support.SAMPLE_DEALS, self.tranche_ids[:1], CYCLES, self.calculations, "deal"
+        ))
+
+    def test_preview_shows_plan_execution_picks(self):
+        deal_preview = self.engine.preview_report_sql(
+            "deal", "deal", support.SAMPLE_DEALS, self.tranche_ids, CYCLES[0], self.calculations
+        )
+        tranche_preview = self.engine.preview_report_sql(
+            "tranche", "tranche", support.SAMPLE_DEALS, self.tranche_ids, CYCLES[0], self.calculations
+        )
+
+        self.assertEqual(deal_preview["plan"], QueryPlan.ROLLUP.value)
+        self.assertIn("tranchebal_deal_rollup", deal_preview["sql_query"])
+        self.assertNotEqual(tranche_preview["plan"], QueryPlan.ROLLUP.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+# tests/test_single_flight.py
+"""Concurrent identical executions must share one computation without holding executor threads.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import support
+from app.core import concurrency
+from app.core.database import ConfigSessionLocal, DWSessionLocal
+from app.core.exceptions import ReportGenerationError
+from app.features.reports.schemas import ReportExecuteRequest
+from app.features.reports.service import ReportService
+from app.shared.query_engine import QueryEngine
+from app.shared.result_cache import result_cache
+from app.shared.single_flight import SingleFlight, report_single_flight
+
+
+def setUpModule():
+    support.start_app()
+
+
+def tearDownModule():
+    support.stop_app()
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_callers_share_result(self):
+        group = SingleFlight(enabled=True)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def main():
+            return await asyncio.gather(*(group.do("key", compute) for _ in range(5)))
+
+        outcomes = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([result for result, _ in outcomes], ["result"] * 5)
+        self.assertEqual(sorted(coalesced for _, coalesced in outcomes), [False] + [True] * 4)
+        self.assertEqual(group.stats()["in_flight"], 0)
+
+    def test_concurrent_callers_share_exception(self):
+        group = SingleFlight(enabled=True)
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            raise ValueError("failed")
+
+        async def main():
+            return await asyncio.gather(*(group.do("key", compute) for _ in range(3)), return_exceptions=True)
+
+        errors = asyncio.run(main())
+        self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+        self.assertEqual(group.executions, 1)
+
+    def test_cancelled_caller_does_not_cancel_computation(self):
+        group = SingleFlight(enabled=True)
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def main():
+            leader = asyncio.ensure_future(group.do("key", compute))
+            follower = asyncio.ensure_future(group.do("key", compute))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+
+        self.assertEqual(asyncio.run(main()), ("result", True))
+
+    def test_different_keys_run_separately(self):
+        group = SingleFlight(enabled=True)
+
+        async def compute():
+            await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(group.do("a", compute), group.do("b", compute))
+
+        asyncio.run(main())
+        self.assertEqual((group.executions, group.coalesced), (2, 0))
+
+
+class CoalescedExecutionTest(unittest.TestCase):
+    EXECUTOR_WORKERS = 2
+    CALLERS = 6
+
+    @classmethod
+    def setUpClass(cls):
+        cls.report_id = support.create_template("single flight")
+
+    def setUp(self):
+        result_cache.clear()
+        concurrency.shutdown_db_executor()
+        concurrency._executor = ThreadPoolExecutor(max_workers=self.EXECUTOR_WORKERS)
+        self.addCleanup(concurrency.shutdown_db_executor)
+
+    def execute_concurrently(self, compute):
+        """Fire identical executions; returns (results, whether the pool had a free slot mid-flight)"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_compute(service, prepared):
+            started.set()
+            release.wait(10)
+            return compute(service, prepared)
+
+        async def execute():
+            with ConfigSessionLocal() as config_db, DWSessionLocal() as dw_db:
+                service = ReportService(config_db, QueryEngine(dw_db, config_db))
+                request = ReportExecuteRequest(cycle_code=support.SAMPLE_CYCLE)
+                return await service.execute_report(self.report_id, request)
+
+        async def main():
+            callers = [asyncio.ensure_future(execute()) for _ in range(self.CALLERS)]
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            # Let every follower reach the single-flight group before probing the pool
+            await asyncio.sleep(0.2)
+            try:
+                probe = await asyncio.wait_for(concurrency.run_in_db_executor(lambda: "free"), 2)
+            except asyncio.TimeoutError:
+                probe = None
+            release.set()
+            results = await asyncio.gather(*callers, return_exceptions=True)
+            return results, probe == "free"
+
+        with mock.patch.object(ReportService, "_compute_report", autospec=True, side_effect=blocking_compute):
+            return asyncio.run(main())
+
+    def test_followers_share_leader_result(self):
+        compute_calls = []
+        original = ReportService._compute_report
+
+        def compute(service, prepared):
+            compute_calls.append(prepared.cache_key)
+            return original(service, prepared)
+
+        coalesced_before = report_single_flight.coalesced
+        results, pool_had_free_slot = self.execute_concurrently(compute)
+
+        self.assertEqual(len(compute_calls), 1)
+        self.assertTrue(pool_had_free_slot, "followers held database executor threads")
+        self.assertEqual(report_single_flight.coalesced - coalesced_before, self.CALLERS - 1)
+        self.assertEqual(len({result.model_dump_json(exclude={"execution_time_ms"}) for result in results}), 1)
+
+    def test_followers_share_leader_failure(self):
+        def compute(service, prepared):
+            raise RuntimeError("warehouse unavailable")
+
+        results, pool_had_free_slot = self.execute_concurrently(compute)
+
+        self.assertTrue(pool_had_free_slot)
+        self.assertTrue(all(isinstance(result, ReportGenerationError) for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# tests/test_statement_cache.py
+"""Statement cache keying: one statement per plan, filter strategy, level and calculation versions.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import support  # noqa: F401 - points the engines at the test databases
+from app.features.calculations.models import AggregationFunction, Calculation, GroupLevel, SourceModel
+from app.shared.constants import FilterStrategy, QueryPlan
+from app.shared.query_engine import QueryEngine
+from app.shared.statement_cache import StatementCache
+
+
+def make_calculation(calculation_id: int, updated_at: datetime = datetime(2024, 1, 1)) -> Calculation:
+    return Calculation(
+        id=calculation_id, name=f"Calculation {calculation_id}", aggregation_function=AggregationFunction.SUM,
+        source_model=SourceModel.TRANCHE_BAL, source_field="tr_end_bal_amt", group_level=GroupLevel.DEAL,
+        updated_at=updated_at
+    )
+
+
+class StatementCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = StatementCache(max_size=2)
+
+    def test_builds_once_per_key(self):
+        builds = []
+        for _ in range(3):
+            self.cache.get_or_build("key", lambda: builds.append(1) or object())
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.get_or_build("a", object)
+        self.cache.get_or_build("b", object)
+        self.cache.get_or_build("a", object)
+        self.cache.get_or_build("c", object)
+
+        self.assertEqual(self.cache.stats()["size"], 2)
+        misses = self.cache.misses
+        self.cache.get_or_build("a", object)
+        self.cache.get_or_build("b", object)
+        self.assertEqual(self.cache.misses, misses + 1)
+
+
+class ConsolidatedStatementKeyTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("app.shared.query_engine.statement_cache", StatementCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.engine = QueryEngine(None, None)
+        self.calculations = [make_calculation(1), make_calculation(2)]
+
+    def build(self, calculations=None, aggregation_level="deal", plan=QueryPlan.GROUPED,
+              filter_strategy=FilterStrategy.IN_LIST):
+        return self.engine.build_consolidated_statement(
+            calculations or self.calculations, aggregation_level, plan, filter_strategy
+        )
+
+    def test_identical_inputs_share_statement(self):
+        equal_calculations = [make_calculation(1), make_calculation(2)]
+        self.assertIs(self.build(), self.build(equal_calculations))
+
+    def test_key_covers_plan_strategy_and_level(self):
+        statement = self.build()
+        self.assertIsNot(statement, self.build(plan=QueryPlan.PER_CALCULATION))
+        self.assertIsNot(statement, self.build(filter_strategy=FilterStrategy.TEMP_TABLE))
+        self.assertIsNot(statement, self.build(aggregation_level="tranche"))
+
+    def test_key_covers_calculation_versions(self):
+        statement = self.build()
+        updated = [make_calculation(1, updated_at=datetime(2024, 6, 1)), make_calculation(2)]
+        self.assertIsNot(statement, self.build(updated))
+        self.assertIsNot(statement, self.build(list(reversed(self.calculations))))
+
+    def test_filters_are_bound_not_keyed(self):
+        parameters = set(self.build().compile().binds)
+        self.assertTrue({"deal_numbers", "tranche_ids", "cycle_codes"} <= parameters)
+
+
+if __name__ == "__main__":
+    unittest.main()